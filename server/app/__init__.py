@@ -17,8 +17,13 @@ CORS(
 		"https://mogc.onrender.com",
 	],
 	supports_credentials=True,
+	expose_headers=["Server-Timing"],
 )
 
+# count and time outbound calls per request (Server-Timing)
+from app.utils.request_metrics import init_request_metrics
+init_request_metrics(app)
+
 # register blueprints
 from app.routes.check import check_bp
 from app.routes.students import students_bp
@@ -41,9 +46,15 @@ app.register_blueprint(activity_bp)
 app.register_blueprint(calendar_bp)
 
 
+# sweep calendar sync jobs left pending or due for retry by a previous run
+from app.services.calendar_sync_queue import start_calendar_sync
+start_calendar_sync()
+
+
 @app.route("/healthcheck")
 def healthcheck():
-    return jsonify({"status": "ok"}), 200
+    from app.services.supabase_service import get_pool_stats
+    return jsonify({"status": "ok", "supabasePool": get_pool_stats()}), 200
 
 
 # pang debug lang
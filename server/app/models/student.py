@@ -1,5 +1,5 @@
 """Student data models and transformations"""
-from typing import Dict, Any, Optional, Literal
+from typing import Any, Callable, Dict, Iterable, List, Literal, NamedTuple, Optional, Sequence, Tuple
 from datetime import datetime
 
 # type aliases
@@ -34,454 +34,384 @@ def convert_boolean_to_choice(value: Optional[bool]) -> str:
     return "Yes" if value else "No"
 
 
-def transform_personal_data_a(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Personal Data Part A form data to database format"""
-    return {
-        "id_number": form_data.get("idNo"),
-        "course": form_data.get("course"),
-        "msu_sase_score": form_data.get("saseScore"),
-        "academic_year": form_data.get("academicYear"),
-        "family_name": form_data.get("familyName"),
-        "given_name": form_data.get("givenName"),
-        "middle_initial": form_data.get("middleInitial"),
-        "student_status": form_data.get("studentStatus"),
-    }
-
-def transform_personal_data_b(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Personal Data Part B form data to database format"""
-    return {
-        "nickname": form_data.get("nickname"),
-        "age": form_data.get("age"),
-        "sex": form_data.get("sex"),
-        "citizenship": form_data.get("citizenship"),
-        "date_of_birth": form_data.get("dateOfBirth"),
-        "place_of_birth": form_data.get("placeOfBirth"),
-        "civil_status": form_data.get("civilStatus"),
-        "civil_status_others": form_data.get("otherCivilStatus"),
-    }
-
-def transform_personal_data_c(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Personal Data Part C form data to database format"""
-    
-    return {
-        "religious_affiliation": form_data.get("religiousAffiliation"),
-        "number_of_children": form_data.get("noOfChildren"),
-        "address_iligan": form_data.get("addressInIligan"),
-        "contact_number": form_data.get("contactNo"),
-        "home_address": form_data.get("homeAddress"),
-        "stays_with": form_data.get("staysWith"),
-        "working_student_status": form_data.get("workingStudent"),
-        "talents_skills": form_data.get("talentsAndSkills"),
-
-    }
-
-def transform_personal_data_d(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Personal Data Part D form data to database format"""
-    serious_medical_condition = form_data.get("seriousMedicalCondition") or "None"
-    physical_disability = form_data.get("physicalDisability") or "None"
-    return {
-        "leisure_activities": form_data.get("leisureAndRecreationalActivities"),
-        "medical_condition": convert_medical_condition(serious_medical_condition),
-        "medical_condition_others": None if serious_medical_condition == "None" else form_data.get("otherSeriousMedicalCondition"),
-        "physical_disability": convert_medical_condition(physical_disability),
-        "physical_disability_others": None if physical_disability == "None" else form_data.get("otherPhysicalDisability"),
-        "gender_identity": form_data.get("genderIdentity"),
-        "attraction": form_data.get("sexualAttraction"),
-    }
-
-def transform_family_data_a(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Family Data Part A form data to database format"""
-    return {
-        "father_name": form_data.get("fathersName"),
-        "father_deceased": convert_status_to_boolean(form_data.get("fathersStatus", "Living")),
-        "father_occupation": form_data.get("fathersOccupation"),
-        "father_contact_number": form_data.get("fathersContactNo"),
-        "mother_name": form_data.get("mothersName"),
-        "mother_deceased": convert_status_to_boolean(form_data.get("mothersStatus", "Living")),
-        "mother_occupation": form_data.get("mothersOccupation"),
-        "mother_contact_number": form_data.get("mothersContactNo"),
-    }
-
-
-def transform_family_data_b(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Family Data Part B form data to database format"""
-    return {
-        "guardian_name": form_data.get("guardianName"),
-        "guardian_occupation": form_data.get("guardianOccupation"),
-        "guardian_contact_number": form_data.get("guardianContactNo"),
-        "guardian_relationship": form_data.get("relationshipWithGuardian"),
-        "ordinal_position": form_data.get("ordinalPosition"),
-        "number_of_siblings": form_data.get("noOfSiblings"),
-        "parents_marital_status": form_data.get("parentsMaritalStatus"),
-        "family_monthly_income": form_data.get("familyMonthlyIncome"),
-    }
-
-def transform_family_data_c(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Family Data Part C form data to database format"""
-    return {
-        "home_environment_description": form_data.get("describeEnvironment"),
-    }
-
-def transform_academic_data_a(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Academic Data Part A form data to database format"""
-    return {
-        "shs_gpa": form_data.get("generalPointAverage"),
-        "is_scholar": convert_choice_to_boolean(form_data.get("scholar", "No")),
-        "scholarship_type": form_data.get("scholarDetails"),
-        "previous_school_name": form_data.get("lastSchoolAttended"),
-        "previous_school_address": form_data.get("lastSchoolAddress"),
-        "shs_track": form_data.get("shsTrack"),
-        "shs_strand": form_data.get("shsStrand"),
-        "awards_honors": form_data.get("awards"),
-    }
-
-def transform_academic_data_b(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Academic Data Part B form data to database format"""
-    return {
-        "career_option_1": form_data.get("firstChoice"),
-        "career_option_2": form_data.get("secondChoice"),
-        "career_option_3": form_data.get("thirdChoice"),
-        "student_organizations": form_data.get("studentOrg"),
-        "course_choice_actor": form_data.get("courseChoiceActor"),
-        "course_choice_actor_others": form_data.get("otherCourseChoiceActor"),
-        "course_choice_reason": form_data.get("reasonForCourse"),
-        "post_college_career_goal": form_data.get("careerPursuingInFuture"),
-
-    }
-
-def transform_academic_data_c(form_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Transform Academic Data Part C form data to database format"""
-    return {
-        "reasons_for_choosing_msuiit": form_data.get("reasonsForChoosingiit"),
-        "reasons_for_choosing_msuiit_others": form_data.get("otherReasonForChoosingiit"),
-        "cocurricular_activities": form_data.get("coCurricularActivities"),
-    }
-
-def transform_distance_learning_data_a(form_data:Dict[str, Any]) -> Dict[str,Any]:
-     """Transform Distance Learning Part A form data to database format"""
-     return {
-         "technology_gadgets": form_data.get("technologyGadgets"),
-         "technology_gadgets_other": form_data.get("otherOptionTechnologyGadgets"),
-         "internet_connectivity_means": form_data.get("meansOfInternet"),
-         "internet_connectivity_other": form_data.get("otherOptionMeansOfInternet"),
-    }
-
-def transform_distance_learning_data_b(form_data:Dict[str, Any]) -> Dict[str,Any]:
-     """Transform Distance Learning Part B form data to database format"""
-     return {
-         "internet_access": form_data.get("internetAccess"),
-         "distance_learning_readiness": form_data.get("learningReadiness"),
-         "learning_space_description": form_data.get("learningSpace"),
-    }
-
-def transform_psychosocial_data_a(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Psychosocial Part A form data to database format"""
-    return {
-        "personality_characteristics": form_data.get("personalCharacteristics"),
-        "coping_mechanism_bad_day": form_data.get("copingMechanismBadDay"),
-        "had_counseling_before": convert_choice_to_boolean(form_data.get("hadCounseling")),
-        "seeking_professional_help": convert_choice_to_boolean(form_data.get("seekProfessionalHelp")),
-        "perceived_mental_health": form_data.get("perceiveMentalHealth"),
-    }
-
-def transform_psychosocial_data_b(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Psychosocial Part B form data to database format"""
-    return{
-        "problem_sharers": form_data.get("problemSharers"),
-        "problem_sharers_others": form_data.get("otherOptionProblemSharer"),
-        "needs_immediate_counseling": convert_choice_to_boolean(form_data.get("needsImmediateCounseling")),
-        "concerns_to_discuss": form_data.get("concernsToDiscuss")
-    }
-
-def transform_needs_assessment_data_a(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Needs Assessment Part A form data to database format"""
-    return{
-        "improvement_needs": form_data.get("improvementNeeds"),
-        "improvement_needs_others": form_data.get("othersOptionImprovementNeeds"),
-        "financial_assistance_needs": form_data.get("financialAssistanceNeeds"),
-        "financial_assistance_needs_others": form_data.get("othersOptionfinancialAssistanceNeeds")
-    }
-
-def transform_needs_assessment_data_b(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Needs Assessment Part B form data to database format"""
-    return{
-        "personal_social_needs": form_data.get("personalSocialNeeds"),
-        "personal_social_needs_others": form_data.get("othersOptionPersonalSocialNeeds")
-    }
-
-def transform_needs_assessment_data_c(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Needs Assessment Part C form data to database format"""
-    return{
-        "upset_responses": form_data.get("upsetResponses"),
-        "upset_responses_others": form_data.get("othersOptionUpsetResponses")
-    }
-
-def transform_needs_assessment_data_d(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Needs Assessment Part D form data to database format"""
-    return{
-        "primary_problem_sharer": form_data.get("primaryProblemSharer"),
-        "primary_problem_sharer_others": form_data.get("othersOptionPrimaryProblemSharer"),
-        "experience_counseling_willfully": form_data.get("firstQuestion"),
-        "experience_counseling_referral": form_data.get("secondQuestion"),
-        "know_guidance_center_help": form_data.get("thirdQuestion")
-    }
-
-def transform_needs_assessment_data_e(form_data:Dict[str, Any]) -> Dict[str,Any]:
-    """Transform Needs Assessment Part D form data to database format"""
-    return{
-        "afraid_of_guidance_center": form_data.get("fourthQuestion"),
-        "shy_to_ask_counselor": form_data.get("fifthQuestion")
-    }
-
-def transform_from_personal_data_a(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Personal Data Part A form format"""
-    return {
-        "idNo": db_record.get("id_number"),
-        "course": db_record.get("course"),
-        "saseScore": db_record.get("msu_sase_score"),
-        "academicYear": db_record.get("academic_year"),
-        "familyName": db_record.get("family_name"),
-        "givenName": db_record.get("given_name"),
-        "middleInitial": db_record.get("middle_initial"),
-        "studentStatus": db_record.get("student_status"),
-    }
-
-def transform_from_personal_data_b(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Personal Data Part B form format"""
-    return {
-        "nickname": db_record.get("nickname"),
-        "age": db_record.get("age"),
-        "sex": db_record.get("sex"),
-        "citizenship": db_record.get("citizenship"),
-        "dateOfBirth": db_record.get("date_of_birth"),
-        "placeOfBirth": db_record.get("place_of_birth"),
-        "civilStatus": db_record.get("civil_status"),
-        "otherCivilStatus": db_record.get("civil_status_others"),
-    }
-
-def transform_from_personal_data_c(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Personal Data Part C form format"""
-    return {
-        "religiousAffiliation": db_record.get("religious_affiliation"),
-        "noOfChildren": db_record.get("number_of_children"),
-        "addressInIligan": db_record.get("address_iligan"),
-        "contactNo": db_record.get("contact_number"),
-        "homeAddress": db_record.get("home_address"),
-        "staysWith": db_record.get("stays_with"),
-        "workingStudent": db_record.get("working_student_status"),
-        "talentsAndSkills": db_record.get("talents_skills"),
-    }
-
-def transform_from_personal_data_d(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Personal Data Part D form format"""
-    serious_medical_condition = convert_medical_condition_from_db(db_record.get("medical_condition"))
-    physical_disability = convert_medical_condition_from_db(db_record.get("physical_disability"))
-    
-    return {
-        "leisureAndRecreationalActivities": db_record.get("leisure_activities"),
-        "seriousMedicalCondition": serious_medical_condition,
-        "otherSeriousMedicalCondition": "" if serious_medical_condition == "None" else db_record.get("medical_condition_others") or "",
-        "physicalDisability": physical_disability,
-        "otherPhysicalDisability": "" if physical_disability == "None" else db_record.get("physical_disability_others") or "",
-        "genderIdentity": db_record.get("gender_identity"),
-        "sexualAttraction": db_record.get("attraction"),
-    }
-
-def transform_from_family_data_a(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Family Data Part A form format"""
-    return {
-        "fathersName": db_record.get("father_name"),
-        "fathersStatus": convert_boolean_to_status(db_record.get("father_deceased")),
-        "fathersOccupation": db_record.get("father_occupation"),
-        "fathersContactNo": db_record.get("father_contact_number"),
-        "mothersName": db_record.get("mother_name"),
-        "mothersStatus": convert_boolean_to_status(db_record.get("mother_deceased")),
-        "mothersOccupation": db_record.get("mother_occupation"),
-        "mothersContactNo": db_record.get("mother_contact_number"),
-    }
-
-
-def transform_from_family_data_b(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Family Data Part B form format"""
-    return {
-        "guardianName": db_record.get("guardian_name"),
-        "guardianOccupation": db_record.get("guardian_occupation"),
-        "guardianContactNo": db_record.get("guardian_contact_number"),
-        "relationshipWithGuardian": db_record.get("guardian_relationship"),
-        "ordinalPosition": db_record.get("ordinal_position"),
-        "noOfSiblings": db_record.get("number_of_siblings"),
-        "parentsMaritalStatus": db_record.get("parents_marital_status"),
-        "familyMonthlyIncome": db_record.get("family_monthly_income"),
-    }
-
-def transform_from_family_data_c(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Family Data Part C form format"""
-    return {
-        "describeEnvironment": db_record.get("home_environment_description"),
-    }
-
-def transform_from_academic_data_a(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Academic Data Part A form format"""
-    return {
-        "generalPointAverage": db_record.get("shs_gpa"),
-        "scholar": convert_boolean_to_choice(db_record.get("is_scholar")),
-        "scholarDetails": db_record.get("scholarship_type"),
-        "lastSchoolAttended": db_record.get("previous_school_name"),
-        "lastSchoolAddress": db_record.get("previous_school_address"),
-        "shsTrack": db_record.get("shs_track"),
-        "shsStrand": db_record.get("shs_strand"),
-        "awards": db_record.get("awards_honors"),
-    }
-
-def transform_from_academic_data_b(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Academic Data Part B form format"""
-    return {
-        "firstChoice": db_record.get("career_option_1"),
-        "secondChoice": db_record.get("career_option_2"),
-        "thirdChoice": db_record.get("career_option_3"),
-        "studentOrg": db_record.get("student_organizations"),
-        "courseChoiceActor": db_record.get("course_choice_actor"),
-        "otherCourseChoiceActor": db_record.get("course_choice_actor_others"),
-        "reasonForCourse": db_record.get("course_choice_reason"),
-        "careerPursuingInFuture": db_record.get("post_college_career_goal"),
-    }
-
-def transform_from_academic_data_c(db_record: Dict[str, Any]) -> Dict[str, Any]:
-    """Convert database record to Academic Data Part C form format"""
-    db_reason = db_record.get("reasons_for_choosing_msuiit")
-
-    if not isinstance (db_reason,list):
-        reason_for_iit=[]
-    else:
-        reason_for_iit=db_reason
-
-    return {
-        "reasonsForChoosingiit": reason_for_iit,
-        "otherReasonForChoosingiit": db_record.get("reasons_for_choosing_msuiit_others"),
-        "coCurricularActivities": db_record.get("cocurricular_activities"),
-    }
-
-def transform_from_distance_learning_data_a(db_record: Dict[str, Any]) -> Dict[str,Any]:
-    """Convert database record to Distance Learning Part A form format"""
-    db_gadget_option = db_record.get("technology_gadgets")
-    db_connectivity_option = db_record.get("internet_connectivity_means")
-
-    if not isinstance (db_gadget_option,list):
-        gadgets=[]
-    else:
-        gadgets=db_gadget_option
-
-    if not isinstance (db_connectivity_option,list):
-        connectivity=[]
-    else:
-        connectivity=db_connectivity_option
-    return{
-        "technologyGadgets": gadgets,
-        "otherOptionTechnologyGadgets": db_record.get("technology_gadgets_other"),
-        "meansOfInternet": connectivity,
-        "otherOptionMeansOfInternet": db_record.get("internet_connectivity_other"),
-    }
-
-def transform_from_distance_learning_data_b(db_record: Dict[str, Any]) -> Dict[str,Any]:
-    """Convert database record to Distance Learning Part B form format"""
-    return{
-        "internetAccess": db_record.get("internet_access"),
-        "learningReadiness": db_record.get("distance_learning_readiness"),
-        "learningSpace": db_record.get("learning_space_description"),
-    }
-
-def transform_from_psychosocial_data_a(db_record: Dict[str, Any]) -> Dict[str,Any]:
-    """Convert database record to psychosocial data Part A form format"""
-    return{
-        "personalCharacteristics": db_record.get("personality_characteristics"),
-        "copingMechanismBadDay": db_record.get("coping_mechanism_bad_day"),
-        "hadCounseling": convert_boolean_to_choice(db_record.get("had_counseling_before")),
-        "seekProfessionalHelp": convert_boolean_to_choice(db_record.get("seeking_professional_help")),
-        "perceiveMentalHealth": db_record.get("perceived_mental_health"),
-    }
-
-def transform_from_psychosocial_data_b(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to psychosocial data Part B form format"""
-        db_share_option = db_record.get("problem_sharers")
-        if not isinstance(db_share_option,list):
-            sharer = []
-        else:
-            sharer = db_share_option
-        return{
-        "problemSharers": sharer,
-        "otherOptionProblemSharer": db_record.get("problem_sharers_others"),
-        "needsImmediateCounseling": convert_boolean_to_choice(db_record.get("needs_immediate_counseling")),
-        "concernsToDiscuss": db_record.get("concerns_to_discuss")
-    }
-
-def transform_from_needs_assessment_data_a(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to needs assessment part A form format"""
-        db_needs_option = db_record.get("improvement_needs")
-        db_financial_option = db_record.get("financial_assistance_needs")
-        
-        if not isinstance(db_needs_option,list):
-            needs = []
-        else:
-            needs = db_needs_option
-        
-        if not isinstance(db_financial_option,list):
-            financial = []
-        else:
-            financial = db_financial_option
-        return{
-        "improvementNeeds": needs,
-        "othersOptionImprovementNeeds": db_record.get("improvement_needs_others"),
-        "financialAssistanceNeeds": financial,
-        "othersOptionfinancialAssistanceNeeds": db_record.get("financial_assistance_needs_others"),
-    }
-
-def transform_from_needs_assessment_data_b(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to needs assessment part C form format"""
-        db_option = db_record.get("personal_social_needs")
-        if not isinstance(db_option,list):
-            needs = []
-        else:
-            needs = db_option
-        return{
-        "personalSocialNeeds": needs,
-        "othersOptionPersonalSocialNeeds": db_record.get("personal_social_needs_others"),
-        }
-
-def transform_from_needs_assessment_data_c(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to needs assessment part C form format"""
-        db_option = db_record.get("upset_responses")
-        if not isinstance(db_option,list):
-            needs = []
-        else:
-            needs = db_option
-        return{
-        "upsetResponses": needs,
-        "othersOptionUpsetResponses": db_record.get("upset_responses_others"),
-        }
-
-def transform_from_needs_assessment_data_d(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to needs assessment part D form format"""
-        db_option = db_record.get("primary_problem_sharer")
-        if not isinstance(db_option,list):
-            needs = []
+
+def convert_to_list(value: Any) -> list:
+    """Convert a database multi-select column to a form list"""
+    return value if isinstance(value, list) else []
+
+
+def convert_null_to_empty(value: Optional[str]) -> str:
+    """Convert a nullable database text column to a form string"""
+    return value or ""
+
+
+# (to_db, from_db) value converters; None means the value passes through
+Converter = Tuple[Optional[Callable[[Any], Any]], Optional[Callable[[Any], Any]]]
+
+STATUS: Converter = (convert_status_to_boolean, convert_boolean_to_status)
+CHOICE: Converter = (convert_choice_to_boolean, convert_boolean_to_choice)
+MEDICAL: Converter = (convert_medical_condition, convert_medical_condition_from_db)
+MULTI_SELECT: Converter = (None, convert_to_list)
+OPTIONAL_TEXT: Converter = (None, convert_null_to_empty)
+
+
+class StudentField(NamedTuple):
+    """
+    One form key <-> students column pair
+
+    `requires` names the form key of another field in the same part; when that
+    field is empty or "None" this one is cleared (None in the database, "" in
+    the form), e.g. the "others" text of a medical condition.
+    """
+    form_key: str
+    column: str
+    converter: Optional[Converter] = None
+    requires: Optional[str] = None
+
+
+F = StudentField
+
+# (section, part) -> (transform name, fields)
+# transform_<name> / transform_from_<name> are generated from these tables
+STUDENT_FORM_FIELDS: Dict[Tuple[int, int], Tuple[str, Tuple[StudentField, ...]]] = {
+    # Personal Data
+    (0, 0): ("personal_data_a", (
+        F("idNo", "id_number"),
+        F("course", "course"),
+        F("saseScore", "msu_sase_score"),
+        F("academicYear", "academic_year"),
+        F("familyName", "family_name"),
+        F("givenName", "given_name"),
+        F("middleInitial", "middle_initial"),
+        F("studentStatus", "student_status"),
+    )),
+    (0, 1): ("personal_data_b", (
+        F("nickname", "nickname"),
+        F("age", "age"),
+        F("sex", "sex"),
+        F("citizenship", "citizenship"),
+        F("dateOfBirth", "date_of_birth"),
+        F("placeOfBirth", "place_of_birth"),
+        F("civilStatus", "civil_status"),
+        F("otherCivilStatus", "civil_status_others"),
+    )),
+    (0, 2): ("personal_data_c", (
+        F("religiousAffiliation", "religious_affiliation"),
+        F("noOfChildren", "number_of_children"),
+        F("addressInIligan", "address_iligan"),
+        F("contactNo", "contact_number"),
+        F("homeAddress", "home_address"),
+        F("staysWith", "stays_with"),
+        F("workingStudent", "working_student_status"),
+        F("talentsAndSkills", "talents_skills"),
+    )),
+    (0, 3): ("personal_data_d", (
+        F("leisureAndRecreationalActivities", "leisure_activities"),
+        F("seriousMedicalCondition", "medical_condition", MEDICAL),
+        F("otherSeriousMedicalCondition", "medical_condition_others", OPTIONAL_TEXT, requires="seriousMedicalCondition"),
+        F("physicalDisability", "physical_disability", MEDICAL),
+        F("otherPhysicalDisability", "physical_disability_others", OPTIONAL_TEXT, requires="physicalDisability"),
+        F("genderIdentity", "gender_identity"),
+        F("sexualAttraction", "attraction"),
+    )),
+    # Family Data
+    (1, 0): ("family_data_a", (
+        F("fathersName", "father_name"),
+        F("fathersStatus", "father_deceased", STATUS),
+        F("fathersOccupation", "father_occupation"),
+        F("fathersContactNo", "father_contact_number"),
+        F("mothersName", "mother_name"),
+        F("mothersStatus", "mother_deceased", STATUS),
+        F("mothersOccupation", "mother_occupation"),
+        F("mothersContactNo", "mother_contact_number"),
+    )),
+    (1, 1): ("family_data_b", (
+        F("guardianName", "guardian_name"),
+        F("guardianOccupation", "guardian_occupation"),
+        F("guardianContactNo", "guardian_contact_number"),
+        F("relationshipWithGuardian", "guardian_relationship"),
+        F("ordinalPosition", "ordinal_position"),
+        F("noOfSiblings", "number_of_siblings"),
+        F("parentsMaritalStatus", "parents_marital_status"),
+        F("familyMonthlyIncome", "family_monthly_income"),
+    )),
+    (1, 2): ("family_data_c", (
+        F("describeEnvironment", "home_environment_description"),
+    )),
+    # Academic Data
+    (2, 0): ("academic_data_a", (
+        F("generalPointAverage", "shs_gpa"),
+        F("scholar", "is_scholar", CHOICE),
+        F("scholarDetails", "scholarship_type"),
+        F("lastSchoolAttended", "previous_school_name"),
+        F("lastSchoolAddress", "previous_school_address"),
+        F("shsTrack", "shs_track"),
+        F("shsStrand", "shs_strand"),
+        F("awards", "awards_honors"),
+    )),
+    (2, 1): ("academic_data_b", (
+        F("firstChoice", "career_option_1"),
+        F("secondChoice", "career_option_2"),
+        F("thirdChoice", "career_option_3"),
+        F("studentOrg", "student_organizations"),
+        F("courseChoiceActor", "course_choice_actor"),
+        F("otherCourseChoiceActor", "course_choice_actor_others"),
+        F("reasonForCourse", "course_choice_reason"),
+        F("careerPursuingInFuture", "post_college_career_goal"),
+    )),
+    (2, 2): ("academic_data_c", (
+        F("reasonsForChoosingiit", "reasons_for_choosing_msuiit", MULTI_SELECT),
+        F("otherReasonForChoosingiit", "reasons_for_choosing_msuiit_others"),
+        F("coCurricularActivities", "cocurricular_activities"),
+    )),
+    # Distance Learning Data
+    (3, 0): ("distance_learning_data_a", (
+        F("technologyGadgets", "technology_gadgets", MULTI_SELECT),
+        F("otherOptionTechnologyGadgets", "technology_gadgets_other"),
+        F("meansOfInternet", "internet_connectivity_means", MULTI_SELECT),
+        F("otherOptionMeansOfInternet", "internet_connectivity_other"),
+    )),
+    (3, 1): ("distance_learning_data_b", (
+        F("internetAccess", "internet_access"),
+        F("learningReadiness", "distance_learning_readiness"),
+        F("learningSpace", "learning_space_description"),
+    )),
+    # Psychosocial Data
+    (4, 0): ("psychosocial_data_a", (
+        F("personalCharacteristics", "personality_characteristics"),
+        F("copingMechanismBadDay", "coping_mechanism_bad_day"),
+        F("hadCounseling", "had_counseling_before", CHOICE),
+        F("seekProfessionalHelp", "seeking_professional_help", CHOICE),
+        F("perceiveMentalHealth", "perceived_mental_health"),
+    )),
+    (4, 1): ("psychosocial_data_b", (
+        F("problemSharers", "problem_sharers", MULTI_SELECT),
+        F("otherOptionProblemSharer", "problem_sharers_others"),
+        F("needsImmediateCounseling", "needs_immediate_counseling", CHOICE),
+        F("concernsToDiscuss", "concerns_to_discuss"),
+    )),
+    # Needs Assessment Data
+    (5, 0): ("needs_assessment_data_a", (
+        F("improvementNeeds", "improvement_needs", MULTI_SELECT),
+        F("othersOptionImprovementNeeds", "improvement_needs_others"),
+        F("financialAssistanceNeeds", "financial_assistance_needs", MULTI_SELECT),
+        F("othersOptionfinancialAssistanceNeeds", "financial_assistance_needs_others"),
+    )),
+    (5, 1): ("needs_assessment_data_b", (
+        F("personalSocialNeeds", "personal_social_needs", MULTI_SELECT),
+        F("othersOptionPersonalSocialNeeds", "personal_social_needs_others"),
+    )),
+    (5, 2): ("needs_assessment_data_c", (
+        F("upsetResponses", "upset_responses", MULTI_SELECT),
+        F("othersOptionUpsetResponses", "upset_responses_others"),
+    )),
+    (5, 3): ("needs_assessment_data_d", (
+        F("primaryProblemSharer", "primary_problem_sharer", MULTI_SELECT),
+        F("othersOptionPrimaryProblemSharer", "primary_problem_sharer_others"),
+        F("firstQuestion", "experience_counseling_willfully"),
+        F("secondQuestion", "experience_counseling_referral"),
+        F("thirdQuestion", "know_guidance_center_help"),
+    )),
+    (5, 4): ("needs_assessment_data_e", (
+        F("fourthQuestion", "afraid_of_guidance_center"),
+        F("fifthQuestion", "shy_to_ask_counselor"),
+    )),
+}
+
+del F
+
+
+# transform compilation
+# Each mapping is rendered to Python source once at import and compiled, so a
+# conversion is a single dict literal with no per-field loop or lookups.
+
+def _converter_ref(namespace: Dict[str, Any], func: Callable[[Any], Any]) -> str:
+    """Bind a converter into the generated code's namespace and return its name"""
+    name = f"_{func.__name__}"
+    namespace[name] = func
+    return name
+
+
+def _to_db_expr(field: StudentField, namespace: Dict[str, Any]) -> str:
+    expr = f"get({field.form_key!r})"
+    if field.converter and field.converter[0]:
+        expr = f"{_converter_ref(namespace, field.converter[0])}({expr})"
+    if field.requires:
+        expr = f"None if (get({field.requires!r}) or 'None') == 'None' else {expr}"
+    return expr
+
+
+def _from_db_expr(
+    field: StudentField,
+    fields_by_key: Dict[str, StudentField],
+    namespace: Dict[str, Any],
+    ref: Callable[[str], str],
+) -> str:
+    expr = ref(field.column)
+    if field.converter and field.converter[1]:
+        expr = f"{_converter_ref(namespace, field.converter[1])}({expr})"
+    if field.requires:
+        parent = _from_db_expr(fields_by_key[field.requires], fields_by_key, namespace, ref)
+        expr = f"'' if {parent} == 'None' else {expr}"
+    return expr
+
+
+def _compile(name: str, source: str, namespace: Dict[str, Any]) -> Callable:
+    exec(compile(source, f"<student transform {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _compile_to_db(name: str, fields: Tuple[StudentField, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build form dict -> students row dict"""
+    namespace: Dict[str, Any] = {}
+    items = "".join(
+        f"        {f.column!r}: {_to_db_expr(f, namespace)},\n" for f in fields
+    )
+    source = f"def {name}(form_data):\n    get = form_data.get\n    return {{\n{items}    }}\n"
+    return _compile(name, source, namespace)
+
+
+def _compile_from_db(name: str, fields: Tuple[StudentField, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build students row dict -> form dict"""
+    by_key = {f.form_key: f for f in fields}
+    namespace: Dict[str, Any] = {}
+    items = "".join(
+        f"        {f.form_key!r}: {_from_db_expr(f, by_key, namespace, lambda c: f'get({c!r})')},\n"
+        for f in fields
+    )
+    source = f"def {name}(db_record):\n    get = db_record.get\n    return {{\n{items}    }}\n"
+    return _compile(name, source, namespace)
+
+
+def _compile_from_db_columns(name: str, fields: Tuple[StudentField, ...]) -> Callable[[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Build {column: [values]} -> [form dict] as one zip comprehension"""
+    by_key = {f.form_key: f for f in fields}
+    columns = list(dict.fromkeys(f.column for f in fields))
+    variables = {c: f"v{i}" for i, c in enumerate(columns)}
+    namespace: Dict[str, Any] = {}
+    items = ", ".join(
+        f"{f.form_key!r}: {_from_db_expr(f, by_key, namespace, variables.__getitem__)}" for f in fields
+    )
+    source = (
+        f"def {name}(block, size):\n"
+        f"    missing = [None] * size\n"
+        f"    return [\n"
+        f"        {{{items}}}\n"
+        f"        for {', '.join(variables[c] for c in columns)}, in zip(\n"
+        + "".join(f"            block.get({c!r}, missing),\n" for c in columns)
+        + "        )\n"
+        "    ]\n"
+    )
+    return _compile(name, source, namespace)
+
+
+class SectionPart(NamedTuple):
+    """Fields and compiled transforms for one (section, part) of the student form"""
+    section: int
+    part: int
+    name: str
+    fields: Tuple[StudentField, ...]
+    to_db: Callable[[Dict[str, Any]], Dict[str, Any]]
+    from_db: Callable[[Dict[str, Any]], Dict[str, Any]]
+    from_db_columns: Callable[[Dict[str, Any], int], List[Dict[str, Any]]]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """students columns read and written by this part"""
+        return tuple(f.column for f in self.fields)
+
+    @property
+    def select_clause(self) -> str:
+        """PostgREST select list for this part's columns"""
+        return ", ".join(self.columns)
+
+
+def _build_section_part(section: int, part: int, name: str, fields: Tuple[StudentField, ...]) -> SectionPart:
+    return SectionPart(
+        section,
+        part,
+        name,
+        fields,
+        _compile_to_db(f"transform_{name}", fields),
+        _compile_from_db(f"transform_from_{name}", fields),
+        _compile_from_db_columns(f"transform_columns_from_{name}", fields),
+    )
+
+
+SECTION_PARTS: Dict[Tuple[int, int], SectionPart] = {
+    key: _build_section_part(key[0], key[1], name, fields)
+    for key, (name, fields) in STUDENT_FORM_FIELDS.items()
+}
+
+# expose transform_<name> / transform_from_<name> at module level
+for _section_part in SECTION_PARTS.values():
+    globals()[_section_part.to_db.__name__] = _section_part.to_db
+    globals()[_section_part.from_db.__name__] = _section_part.from_db
+del _section_part
+
+
+def get_section_part(section_index: Any, part_index: Any) -> Optional[SectionPart]:
+    """Look up the registry entry for a (section, part), or None if unknown"""
+    return SECTION_PARTS.get((section_index, part_index))
+
+
+def _parts_key(parts: Optional[Iterable[Tuple[int, int]]]) -> Tuple[Tuple[int, int], ...]:
+    return tuple(SECTION_PARTS) if parts is None else tuple(parts)
+
+
+_combined_cache: Dict[Tuple[Any, ...], Callable] = {}
+
+
+def _combined_transform(kind: str, parts_key: Tuple[Tuple[int, int], ...]) -> Callable:
+    """Compile (once) a transform covering several parts in a single pass"""
+    cache_key = (kind, parts_key)
+    func = _combined_cache.get(cache_key)
+    if func is None:
+        fields = tuple(f for key in parts_key for f in SECTION_PARTS[key].fields)
+        if kind == "rows":
+            func = _compile_from_db("transform_from_records", fields)
         else:
-            needs = db_option
-        return{
-        "primaryProblemSharer": needs,
-        "othersOptionPrimaryProblemSharer": db_record.get("primary_problem_sharer_others"),
-        "firstQuestion": db_record.get("experience_counseling_willfully"),
-        "secondQuestion": db_record.get("experience_counseling_referral"),
-        "thirdQuestion": db_record.get("know_guidance_center_help"),
+            func = _compile_from_db_columns("transform_from_columns", fields)
+        _combined_cache[cache_key] = func
+    return func
 
-        }
 
-def transform_from_needs_assessment_data_e(db_record: Dict[str, Any]) -> Dict[str,Any]:
-        """Convert database record to needs assessment part E form format"""
-        return{
-        "fourthQuestion": db_record.get("afraid_of_guidance_center"),
-        "fifthQuestion": db_record.get("shy_to_ask_counselor"),
-        
-    }
+def records_to_form(
+    records: Iterable[Dict[str, Any]],
+    parts: Optional[Iterable[Tuple[int, int]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Convert many students rows to form format in one pass
+
+    Args:
+        records: students rows (dicts keyed by column)
+        parts: (section, part) keys to include; all parts when None
+
+    Returns one merged form dict per record.
+    """
+    transform = _combined_transform("rows", _parts_key(parts))
+    return [transform(record) for record in records]
+
+
+def columns_to_form(
+    block: Dict[str, Sequence[Any]],
+    parts: Optional[Iterable[Tuple[int, int]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Convert a columnar block ({column: [values]}) to form format in one pass
+
+    Columns absent from the block read as None. All present columns must have
+    the same length.
+    """
+    size = len(next(iter(block.values()))) if block else 0
+    return _combined_transform("columns", _parts_key(parts))(block, size)
+
+
+def forms_to_db(section_index: int, part_index: int, forms: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert many form payloads for one (section, part) to students rows"""
+    section_part = SECTION_PARTS[(section_index, part_index)]
+    transform = section_part.to_db
+    return [transform(form_data) for form_data in forms]
 
 
 def check_personal_data_complete(db_record: Dict[str, Any]) -> bool:
@@ -684,4 +614,4 @@ def check_needs_assessment_data_complete(db_record: Dict[str, Any]) -> bool:
         primary_sharer_list and len(primary_sharer_list) > 0 and
         ("Others" not in primary_sharer_list or db_record.get("primary_problem_sharer_others"))
     )
-    return part_a_complete and part_b_complete and part_c_complete and part_d_complete
\ No newline at end of file
+    return part_a_complete and part_b_complete and part_c_complete and part_d_complete
@@ -4,39 +4,270 @@ Appointments API routes for booking management
 
 from flask import Blueprint, request, jsonify
 from app.utils.auth import require_auth
-from app.services.supabase_service import get_supabase_client
-from app.services.google_calendar_service import get_calendar_service
-from datetime import datetime, date, time, timedelta, timezone
+from app.utils.request_metrics import bind_request_metrics
+from app.services.supabase_service import get_supabase_client, is_missing_rpc
+from app.services.calendar_sync_queue import (
+    ACTION_CANCEL,
+    ACTION_COMPLETE,
+    ACTION_CONFIRM,
+    ACTION_CREATE,
+    get_calendar_sync_queue,
+)
+from app.services.activity_stats import record_appointment_status
+from app.services.availability_index import get_availability_index
+from app.services.busy_dates import (
+    DEFAULT_BUSY_WINDOW_DAYS,
+    MAX_BUSY_WINDOW_DAYS,
+    get_busy_dates,
+    invalidate_busy_dates,
+)
+from app.services.slot_service import (
+    MAX_SLOT_RANGE_DAYS,
+    MINUTES_PER_DAY,
+    compute_range_slots,
+    format_minutes,
+    parse_time_string,
+    time_to_minutes,
+)
+from datetime import datetime, date, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import base64
+import json
+import uuid
 
 appointments_bp = Blueprint("appointments", __name__, url_prefix="/api/appointments")
 
+# Max IDs per in_() filter, keeps PostgREST query strings under URL limits
+IN_FILTER_BATCH_SIZE = 100
 
-def time_to_minutes(t: time) -> int:
-    """Convert time to minutes from midnight"""
-    return t.hour * 60 + t.minute
 
+def chunked(items: List[str], size: int) -> Iterable[List[str]]:
+    """Split a list into consecutive batches of at most `size` items"""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
 
-def minutes_to_time(minutes: int) -> time:
-    """Convert minutes from midnight to time"""
-    return time(hour=minutes // 60, minute=minutes % 60)
+
+def fetch_user_avatars(supabase, user_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+    """Get avatar URLs for many auth users in one call"""
+    user_ids = [uid for uid in set(user_ids) if uid]
+    if not user_ids:
+        return {}
+    
+    try:
+        # Reads auth.users metadata server-side (see get_user_avatars migration)
+        resp = supabase.rpc("get_user_avatars", {"user_ids": user_ids}).execute()
+        return {row["user_id"]: row.get("avatar_url") for row in resp.data or []}
+    except Exception as e:
+        # the per-user admin lookups are only for databases without the
+        # function; otherwise avatars are left out, as a failed lookup always was
+        if not is_missing_rpc(e):
+            print(f"Bulk avatar lookup failed: {e}")
+            return {}
+        print(f"get_user_avatars is not deployed, falling back to admin API: {e}")
+    
+    def lookup(uid: str) -> Optional[str]:
+        try:
+            auth_user = supabase.auth.admin.get_user_by_id(uid)
+            if auth_user and auth_user.user:
+                return (auth_user.user.user_metadata or {}).get("avatar_url")
+        except Exception as e:
+            print(f"Error fetching avatar for user {uid}: {e}")
+        return None
+    
+    # Fallback: issue the per-user lookups concurrently instead of serially
+    with ThreadPoolExecutor(max_workers=min(8, len(user_ids))) as pool:
+        return dict(zip(user_ids, pool.map(bind_request_metrics(lookup), user_ids)))
+
+
+def fetch_student_infos(supabase, student_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Build studentInfo dicts keyed by auth user ID with one students query"""
+    student_ids = [sid for sid in set(student_ids) if sid]
+    if not student_ids:
+        return {}
+    
+    students = {}
+    for batch in chunked(student_ids, IN_FILTER_BATCH_SIZE):
+        student_resp = supabase.table("students").select(
+            "given_name, family_name, id_number, auth_user_id"
+        ).in_("auth_user_id", batch).execute()
+        for s in student_resp.data or []:
+            students.setdefault(s["auth_user_id"], s)
+    
+    avatars = fetch_user_avatars(supabase, students.keys())
+    
+    return {
+        auth_id: {
+            "name": f"{s['given_name']} {s['family_name']}",
+            "idNumber": s["id_number"],
+            "avatarUrl": avatars.get(auth_id),
+        }
+        for auth_id, s in students.items()
+    }
+
+
+def fetch_counselor_infos(supabase, counselor_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Build counselorInfo dicts keyed by profile ID with one profiles query"""
+    counselor_ids = [cid for cid in set(counselor_ids) if cid]
+    if not counselor_ids:
+        return {}
+    
+    counselors = {}
+    for batch in chunked(counselor_ids, IN_FILTER_BATCH_SIZE):
+        counselor_resp = supabase.table("profiles").select(
+            "id, first_name"
+        ).in_("id", batch).eq("role", "counselor").execute()
+        for c in counselor_resp.data or []:
+            counselors[c["id"]] = {"name": c.get("first_name", "Counselor")}
+    
+    return counselors
 
 
-def parse_time_string(time_str: str) -> time:
-    """Parse time string (HH:MM or HH:MM:SS) to time object"""
-    if len(time_str) == 5:
-        return datetime.strptime(time_str, "%H:%M").time()
-    return datetime.strptime(time_str, "%H:%M:%S").time()
+# Response key -> appointments columns needed to build it
+APPOINTMENT_FIELD_COLUMNS = {
+    "id": ["id"],
+    "studentId": ["student_id"],
+    "counselorId": ["counselor_id"],
+    "eventTypeId": ["event_type_id"],
+    "eventType": [],
+    "scheduledDate": ["scheduled_date"],
+    "startTime": ["start_time"],
+    "endTime": ["end_time"],
+    "status": ["status"],
+    "studentNotes": ["student_notes"],
+    "counselorNotes": ["counselor_notes"],
+    "locationType": ["location_type"],
+    "locationDetails": ["location_details"],
+    "cancellationReason": ["cancellation_reason"],
+    "studentInfo": [],
+    "counselorInfo": [],
+    "createdAt": ["created_at"],
+    "confirmedAt": ["confirmed_at"],
+    "cancelledAt": ["cancelled_at"],
+    "completedAt": ["completed_at"],
+}
 
+# Columns always read: keyset ordering and student/counselor enrichment
+APPOINTMENT_BASE_COLUMNS = ["id", "scheduled_date", "start_time", "student_id", "counselor_id"]
 
-def format_time_12hr(t: time) -> str:
-    """Format time as 12-hour string"""
-    return t.strftime("%I:%M %p").lstrip("0")
+APPOINTMENT_EVENT_TYPE_EMBED = "event_types(id, name, duration, color, category)"
+
+APPOINTMENTS_DEFAULT_PAGE_SIZE = 50
+APPOINTMENTS_MAX_PAGE_SIZE = 200
+
+
+def parse_appointment_fields(fields_param: Optional[str]) -> Optional[List[str]]:
+    """Parse the `fields` query param into response keys (None = all fields)"""
+    if not fields_param:
+        return None
+    
+    fields = [f.strip() for f in fields_param.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in APPOINTMENT_FIELD_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    
+    return list(dict.fromkeys(fields))
+
+
+def appointment_select_clause(fields: Optional[List[str]]) -> str:
+    """Build the PostgREST select for the requested response keys"""
+    if fields is None:
+        return f"*, {APPOINTMENT_EVENT_TYPE_EMBED}"
+    
+    columns = list(APPOINTMENT_BASE_COLUMNS)
+    for field in fields:
+        for column in APPOINTMENT_FIELD_COLUMNS[field]:
+            if column not in columns:
+                columns.append(column)
+    
+    if "eventType" in fields:
+        columns.append(APPOINTMENT_EVENT_TYPE_EMBED)
+    
+    return ", ".join(columns)
+
+
+def encode_appointment_cursor(scheduled_date: str, start_time: str, appointment_id: str) -> str:
+    """Encode the keyset position of an appointment as an opaque cursor"""
+    raw = json.dumps([scheduled_date, start_time, appointment_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_appointment_cursor(cursor: str) -> Tuple[str, str, str]:
+    """Decode a cursor produced by encode_appointment_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        scheduled_date, start_time, appointment_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        # validate shapes so nothing unexpected reaches the filter string
+        date.fromisoformat(scheduled_date)
+        parse_time_string(start_time)
+        str(uuid.UUID(appointment_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    
+    return scheduled_date, start_time, appointment_id
+
+
+def appointment_keyset_filter(scheduled_date: str, start_time: str, appointment_id: str) -> str:
+    """PostgREST or-filter for rows after (scheduled_date, start_time, id)"""
+    d, t, i = f'"{scheduled_date}"', f'"{start_time}"', f'"{appointment_id}"'
+    return (
+        f"scheduled_date.gt.{d},"
+        f"and(scheduled_date.eq.{d},start_time.gt.{t}),"
+        f"and(scheduled_date.eq.{d},start_time.eq.{t},id.gt.{i})"
+    )
+
+
+def format_appointment(
+    apt: Dict[str, Any],
+    student_info: Optional[Dict[str, Any]],
+    counselor_info: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Convert an appointments row to the list response format"""
+    event_type = apt.get("event_types", {})
+    
+    return {
+        "id": apt["id"],
+        "studentId": apt["student_id"],
+        "counselorId": apt["counselor_id"],
+        "eventTypeId": apt.get("event_type_id"),
+        "eventType": {
+            "id": event_type.get("id"),
+            "name": event_type.get("name"),
+            "duration": event_type.get("duration"),
+            "color": event_type.get("color"),
+            "category": event_type.get("category"),
+        } if event_type else None,
+        "scheduledDate": apt["scheduled_date"],
+        "startTime": apt["start_time"],
+        "endTime": apt.get("end_time"),
+        "status": apt.get("status"),
+        "studentNotes": apt.get("student_notes"),
+        "counselorNotes": apt.get("counselor_notes"),
+        "locationType": apt.get("location_type"),
+        "locationDetails": apt.get("location_details"),
+        "cancellationReason": apt.get("cancellation_reason"),
+        "studentInfo": student_info,
+        "counselorInfo": counselor_info,
+        "createdAt": apt.get("created_at"),
+        "confirmedAt": apt.get("confirmed_at"),
+        "cancelledAt": apt.get("cancelled_at"),
+        "completedAt": apt.get("completed_at"),
+    }
 
 
 @appointments_bp.route("", methods=["GET"])
 @require_auth
 def get_appointments(user_id: str):
-    """Get appointments for the current user (student or counselor)"""
+    """
+    Get appointments for the current user (student or counselor)
+    
+    Optional keyset pagination: pass `limit` (and `cursor` from the previous
+    page's `nextCursor`) to page through rows ordered by date, start time, id.
+    Optional `fields` (comma-separated response keys) trims the payload and
+    the columns read from Postgres.
+    """
     try:
         supabase = get_supabase_client(use_service_role=True)
         
@@ -45,11 +276,21 @@ def get_appointments(user_id: str):
         status_filter = request.args.get("status")  # Optional: filter by status
         date_from = request.args.get("from")  # Optional: start date
         date_to = request.args.get("to")  # Optional: end date
+        cursor = request.args.get("cursor")  # Optional: keyset cursor
+        limit = request.args.get("limit", type=int)  # Optional: page size
+        
+        try:
+            fields = parse_appointment_fields(request.args.get("fields"))
+            after = decode_appointment_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        paginate = limit is not None or after is not None
+        if paginate:
+            limit = max(1, min(limit or APPOINTMENTS_DEFAULT_PAGE_SIZE, APPOINTMENTS_MAX_PAGE_SIZE))
         
         # Build query
-        query = supabase.table("appointments").select(
-            "*, event_types(id, name, duration, color, category)"
-        )
+        query = supabase.table("appointments").select(appointment_select_clause(fields))
         
         # Filter by role
         if role == "student":
@@ -68,83 +309,60 @@ def get_appointments(user_id: str):
         if date_to:
             query = query.lte("scheduled_date", date_to)
         
-        # Order by date and time
+        # Resume after the last row of the previous page
+        if after:
+            query = query.or_(appointment_keyset_filter(*after))
+        
+        # Order by date and time (id breaks ties so pages never overlap)
         query = query.order("scheduled_date", desc=False).order("start_time", desc=False)
         
+        if paginate:
+            # One extra row tells us whether another page exists
+            query = query.order("id", desc=False).limit(limit + 1)
+        
         response = query.execute()
         
+        rows = response.data or []
+        next_cursor = None
+        if paginate and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_appointment_cursor(
+                last["scheduled_date"], last["start_time"], last["id"]
+            )
+        
+        # Resolve student/counselor info for all rows at once
+        student_infos = {}
+        if fields is None or "studentInfo" in fields:
+            student_infos = fetch_student_infos(
+                supabase, {apt["student_id"] for apt in rows}
+            )
+        counselor_infos = {}
+        if fields is None or "counselorInfo" in fields:
+            counselor_infos = fetch_counselor_infos(
+                supabase, {apt["counselor_id"] for apt in rows if apt["counselor_id"] != user_id}
+            )
+        
         appointments = []
-        for apt in response.data or []:
-            event_type = apt.get("event_types", {})
+        for apt in rows:
+            # Always include student info (for counselor view)
+            student_info = student_infos.get(apt["student_id"])
             
-            # Get student/counselor info
-            student_info = None
+            # Include counselor info if needed (for student view)
             counselor_info = None
-            
-            # Always fetch student info (for counselor view)
-            student_resp = supabase.table("students").select(
-                "given_name, family_name, id_number, auth_user_id"
-            ).eq("auth_user_id", apt["student_id"]).execute()
-            if student_resp.data:
-                s = student_resp.data[0]
-                
-                # Fetch avatar_url from auth.users using service role
-                avatar_url = None
-                try:
-                    # Use the admin API to get user metadata
-                    auth_user = supabase.auth.admin.get_user_by_id(s["auth_user_id"])
-                    if auth_user and auth_user.user:
-                        avatar_url = auth_user.user.user_metadata.get("avatar_url")
-                except Exception as e:
-                    print(f"Error fetching avatar for user {s['auth_user_id']}: {e}")
-                
-                student_info = {
-                    "name": f"{s['given_name']} {s['family_name']}",
-                    "idNumber": s["id_number"],
-                    "avatarUrl": avatar_url
-                }
-            
-            # Fetch counselor info if needed (for student view)
             if apt["counselor_id"] != user_id:
-                counselor_resp = supabase.table("profiles").select(
-                    "first_name"
-                ).eq("id", apt["counselor_id"]).eq("role", "counselor").execute()
-                if counselor_resp.data:
-                    c = counselor_resp.data[0]
-                    counselor_info = {
-                        "name": c.get('first_name', 'Counselor')
-                    }
+                counselor_info = counselor_infos.get(apt["counselor_id"])
             
-            appointments.append({
-                "id": apt["id"],
-                "studentId": apt["student_id"],
-                "counselorId": apt["counselor_id"],
-                "eventTypeId": apt["event_type_id"],
-                "eventType": {
-                    "id": event_type.get("id"),
-                    "name": event_type.get("name"),
-                    "duration": event_type.get("duration"),
-                    "color": event_type.get("color"),
-                    "category": event_type.get("category"),
-                } if event_type else None,
-                "scheduledDate": apt["scheduled_date"],
-                "startTime": apt["start_time"],
-                "endTime": apt["end_time"],
-                "status": apt["status"],
-                "studentNotes": apt.get("student_notes"),
-                "counselorNotes": apt.get("counselor_notes"),
-                "locationType": apt["location_type"],
-                "locationDetails": apt.get("location_details"),
-                "cancellationReason": apt.get("cancellation_reason"),
-                "studentInfo": student_info,
-                "counselorInfo": counselor_info,
-                "createdAt": apt["created_at"],
-                "confirmedAt": apt.get("confirmed_at"),
-                "cancelledAt": apt.get("cancelled_at"),
-                "completedAt": apt.get("completed_at"),
-            })
+            formatted = format_appointment(apt, student_info, counselor_info)
+            if fields is not None:
+                formatted = {key: formatted[key] for key in fields}
+            appointments.append(formatted)
         
-        return jsonify({"appointments": appointments}), 200
+        result = {"appointments": appointments}
+        if paginate:
+            result["nextCursor"] = next_cursor
+        
+        return jsonify(result), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -185,7 +403,8 @@ def create_appointment(user_id: str):
         start = parse_time_string(start_time)
         duration = event_type["duration"]
         end_minutes = time_to_minutes(start) + duration
-        end = minutes_to_time(end_minutes)
+        if end_minutes > MINUTES_PER_DAY:
+            return jsonify({"error": "Appointment must end by midnight"}), 400
         
         # Determine initial status: auto-confirm if approval not required
         requires_approval = event_type.get("requires_approval", True)
@@ -198,7 +417,7 @@ def create_appointment(user_id: str):
             "event_type_id": event_type_id,
             "scheduled_date": scheduled_date,
             "start_time": start_time,
-            "end_time": end.strftime("%H:%M"),
+            "end_time": format_minutes(end_minutes),
             "status": initial_status,
             "student_notes": student_notes,
             "location_type": event_type["location_type"],
@@ -215,106 +434,16 @@ def create_appointment(user_id: str):
             return jsonify({"error": "Failed to create appointment"}), 500
         
         apt = response.data[0]
+        record_appointment_status(user_id, None, apt["status"], apt["scheduled_date"])
+        invalidate_busy_dates(counselor_id)
         
-        # Sync to Google Calendar (if users have connected)
+        # Sync to Google Calendar in the background (if users have connected)
+        calendar_sync = None
         try:
-            calendar_service = get_calendar_service()
-            
-            # Get event type name for calendar event
-            event_type_name_resp = supabase.table("event_types").select(
-                "name"
-            ).eq("id", event_type_id).execute()
-            event_type_name = event_type_name_resp.data[0]["name"] if event_type_name_resp.data else "Appointment"
-            
-            # Get student and counselor info for calendar
-            student_resp = supabase.table("students").select(
-                "given_name, family_name"
-            ).eq("auth_user_id", user_id).execute()
-            student_name = f"{student_resp.data[0]['given_name']} {student_resp.data[0]['family_name']}" if student_resp.data else "Student"
-            
-            counselor_resp = supabase.table("profiles").select(
-                "first_name"
-            ).eq("id", counselor_id).execute()
-            counselor_name = counselor_resp.data[0].get("first_name", "Counselor") if counselor_resp.data else "Counselor"
-            
-            # Build datetime strings for calendar
-            start_datetime = f"{scheduled_date}T{start_time}:00"
-            end_datetime = f"{scheduled_date}T{end.strftime('%H:%M')}:00"
-            
-            # Get user emails for attendees
-            student_email = None
-            counselor_email = None
-            try:
-                student_auth = supabase.auth.admin.get_user_by_id(user_id)
-                if student_auth and student_auth.user:
-                    student_email = student_auth.user.email
-            except:
-                pass
-            
-            try:
-                counselor_auth = supabase.auth.admin.get_user_by_id(counselor_id)
-                if counselor_auth and counselor_auth.user:
-                    counselor_email = counselor_auth.user.email
-            except:
-                pass
-            
-            attendees = []
-            if student_email:
-                attendees.append(student_email)
-            if counselor_email:
-                attendees.append(counselor_email)
-            
-            # Create calendar events
-            google_event_id_student = None
-            google_event_id_counselor = None
-            
-            # Student calendar
-            if calendar_service.user_has_calendar_connected(user_id):
-                summary = f"{event_type_name} with {counselor_name}"
-                description = student_notes or f"Appointment: {event_type_name}"
-                location = event_type.get("location_details") or ""
-                
-                google_event_id_student = calendar_service.create_calendar_event(
-                    user_id=user_id,
-                    summary=summary,
-                    description=description,
-                    start_datetime=start_datetime,
-                    end_datetime=end_datetime,
-                    attendees=attendees,
-                    location=location
-                )
-            
-            # Counselor calendar
-            if calendar_service.user_has_calendar_connected(counselor_id):
-                summary = f"{event_type_name} - {student_name}"
-                description = student_notes or f"Appointment with {student_name}"
-                location = event_type.get("location_details") or ""
-                
-                google_event_id_counselor = calendar_service.create_calendar_event(
-                    user_id=counselor_id,
-                    summary=summary,
-                    description=description,
-                    start_datetime=start_datetime,
-                    end_datetime=end_datetime,
-                    attendees=attendees,
-                    location=location
-                )
-            
-            # Update appointment with Google event IDs
-            if google_event_id_student or google_event_id_counselor:
-                update_data = {
-                    "last_calendar_sync_at": datetime.now(timezone.utc).isoformat()
-                }
-                if google_event_id_student:
-                    update_data["google_event_id_student"] = google_event_id_student
-                if google_event_id_counselor:
-                    update_data["google_event_id_counselor"] = google_event_id_counselor
-                
-                supabase.table("appointments").update(update_data).eq("id", apt["id"]).execute()
-        
+            calendar_sync = get_calendar_sync_queue().enqueue(apt["id"], ACTION_CREATE)
         except Exception as calendar_error:
             # Log error but don't fail appointment creation
-            print(f"Calendar sync error (non-fatal): {calendar_error}")
+            print(f"Calendar sync enqueue error (non-fatal): {calendar_error}")
         
         return jsonify({
             "message": "Appointment booked successfully",
@@ -324,7 +453,8 @@ def create_appointment(user_id: str):
                 "startTime": apt["start_time"],
                 "endTime": apt["end_time"],
                 "status": apt["status"],
-            }
+            },
+            "calendarSync": calendar_sync
         }), 201
         
     except Exception as e:
@@ -390,6 +520,35 @@ def get_appointment(user_id: str, appointment_id: str):
         return jsonify({"error": str(e)}), 500
 
 
+@appointments_bp.route("/<string:appointment_id>/calendar-sync", methods=["GET"])
+@require_auth
+def get_calendar_sync_status(user_id: str, appointment_id: str):
+    """Get the background Google Calendar sync status for an appointment"""
+    try:
+        supabase = get_supabase_client(use_service_role=True)
+        
+        response = supabase.table("appointments").select(
+            "student_id, counselor_id, last_calendar_sync_at"
+        ).eq("id", appointment_id).execute()
+        
+        if not response.data:
+            return jsonify({"error": "Appointment not found"}), 404
+        
+        apt = response.data[0]
+        
+        # Verify user has access
+        if apt["student_id"] != user_id and apt["counselor_id"] != user_id:
+            return jsonify({"error": "Not authorized to view this appointment"}), 403
+        
+        return jsonify({
+            "calendarSync": get_calendar_sync_queue().get_status(appointment_id),
+            "lastCalendarSyncAt": apt.get("last_calendar_sync_at")
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @appointments_bp.route("/<string:appointment_id>/status", methods=["PUT"])
 @require_auth
 def update_appointment_status(user_id: str, appointment_id: str):
@@ -408,7 +567,7 @@ def update_appointment_status(user_id: str, appointment_id: str):
         
         # Get current appointment
         current = supabase.table("appointments").select(
-            "student_id, counselor_id, status"
+            "student_id, counselor_id, status, scheduled_date"
         ).eq("id", appointment_id).execute()
         
         if not current.data:
@@ -456,122 +615,22 @@ def update_appointment_status(user_id: str, appointment_id: str):
         if not response.data:
             return jsonify({"error": "Failed to update appointment"}), 500
         
-        updated_apt = response.data[0]
-        
-        # Sync calendar events based on status change
-        try:
-            calendar_service = get_calendar_service()
-            
-            # Get full appointment details for calendar sync
-            apt_full = supabase.table("appointments").select(
-                "scheduled_date, start_time, end_time, student_id, counselor_id, google_event_id_student, google_event_id_counselor, event_type_id"
-            ).eq("id", appointment_id).execute()
-            
-            if apt_full.data:
-                apt_data = apt_full.data[0]
-                student_id = apt_data["student_id"]
-                counselor_id = apt_data["counselor_id"]
-                google_event_id_student = apt_data.get("google_event_id_student")
-                google_event_id_counselor = apt_data.get("google_event_id_counselor")
-                
-                # Build datetime strings
-                scheduled_date = apt_data["scheduled_date"]
-                start_time = apt_data["start_time"]
-                end_time = apt_data["end_time"]
-                start_datetime = f"{scheduled_date}T{start_time}:00"
-                end_datetime = f"{scheduled_date}T{end_time}:00"
-                
-                # Get event type name
-                event_type_resp = supabase.table("event_types").select("name").eq("id", apt_data.get("event_type_id")).execute()
-                event_type_name = event_type_resp.data[0]["name"] if event_type_resp.data else "Appointment"
-                
-                if new_status == "cancelled":
-                    # Delete calendar events
-                    deletion_errors = []
-                    
-                    if google_event_id_student and calendar_service.user_has_calendar_connected(student_id):
-                        success = calendar_service.delete_calendar_event(student_id, google_event_id_student)
-                        if not success:
-                            deletion_errors.append(f"Failed to delete student calendar event: {google_event_id_student}")
-                            print(f"Failed to delete student calendar event: {google_event_id_student}")
-                    
-                    if google_event_id_counselor and calendar_service.user_has_calendar_connected(counselor_id):
-                        success = calendar_service.delete_calendar_event(counselor_id, google_event_id_counselor)
-                        if not success:
-                            deletion_errors.append(f"Failed to delete counselor calendar event: {google_event_id_counselor}")
-                            print(f"Failed to delete counselor calendar event: {google_event_id_counselor}")
-                    
-                    # Clear event IDs even if deletion failed (to prevent retrying)
-                    supabase.table("appointments").update({
-                        "google_event_id_student": None,
-                        "google_event_id_counselor": None
-                    }).eq("id", appointment_id).execute()
-                    
-                    # Log any deletion errors but don't fail the request
-                    if deletion_errors:
-                        print(f"Calendar deletion errors: {', '.join(deletion_errors)}")
-                
-                elif new_status == "completed":
-                    # Delete calendar events for completed appointments (same as cancelled)
-                    deletion_errors = []
-                    
-                    if google_event_id_student and calendar_service.user_has_calendar_connected(student_id):
-                        success = calendar_service.delete_calendar_event(student_id, google_event_id_student)
-                        if not success:
-                            deletion_errors.append(f"Failed to delete student calendar event: {google_event_id_student}")
-                            print(f"Failed to delete student calendar event: {google_event_id_student}")
-                    
-                    if google_event_id_counselor and calendar_service.user_has_calendar_connected(counselor_id):
-                        success = calendar_service.delete_calendar_event(counselor_id, google_event_id_counselor)
-                        if not success:
-                            deletion_errors.append(f"Failed to delete counselor calendar event: {google_event_id_counselor}")
-                            print(f"Failed to delete counselor calendar event: {google_event_id_counselor}")
-                    
-                    # Clear event IDs even if deletion failed (to prevent retrying)
-                    supabase.table("appointments").update({
-                        "google_event_id_student": None,
-                        "google_event_id_counselor": None
-                    }).eq("id", appointment_id).execute()
-                    
-                    # Log any deletion errors but don't fail the request
-                    if deletion_errors:
-                        print(f"Calendar deletion errors: {', '.join(deletion_errors)}")
-                
-                elif new_status == "confirmed":
-                    # Update calendar events (add status to title)
-                    summary_suffix = " (Confirmed)"
-                    
-                    if google_event_id_student and calendar_service.user_has_calendar_connected(student_id):
-                        # Get current event to preserve summary
-                        calendar_service.update_calendar_event(
-                            user_id=student_id,
-                            event_id=google_event_id_student,
-                            summary=f"{event_type_name}{summary_suffix}",
-                            start_datetime=start_datetime,
-                            end_datetime=end_datetime
-                        )
-                    
-                    if google_event_id_counselor and calendar_service.user_has_calendar_connected(counselor_id):
-                        calendar_service.update_calendar_event(
-                            user_id=counselor_id,
-                            event_id=google_event_id_counselor,
-                            summary=f"{event_type_name}{summary_suffix}",
-                            start_datetime=start_datetime,
-                            end_datetime=end_datetime
-                        )
-                
-                # Update last sync time
-                supabase.table("appointments").update({
-                    "last_calendar_sync_at": datetime.now(timezone.utc).isoformat()
-                }).eq("id", appointment_id).execute()
+        record_appointment_status(apt["student_id"], current_status, new_status, apt["scheduled_date"])
+        invalidate_busy_dates(apt["counselor_id"])
         
-        except Exception as calendar_error:
-            # Log error but don't fail status update
-            print(f"Calendar sync error (non-fatal): {calendar_error}")
+        # Sync calendar events based on status change, in the background
+        calendar_sync = None
+        if new_status in (ACTION_CONFIRM, ACTION_CANCEL, ACTION_COMPLETE):
+            try:
+                calendar_sync = get_calendar_sync_queue().enqueue(appointment_id, new_status)
+            except Exception as calendar_error:
+                # Log error but don't fail status update
+                print(f"Calendar sync enqueue error (non-fatal): {calendar_error}")
         
         return jsonify({
             "message": f"Appointment {new_status}",
-            "status": new_status
+            "status": new_status,
+            "calendarSync": calendar_sync
         }), 200
         
     except Exception as e:
@@ -581,175 +640,93 @@ def update_appointment_status(user_id: str, appointment_id: str):
 @appointments_bp.route("/available-slots", methods=["GET"])
 @require_auth
 def get_available_slots(user_id: str):
-    """Get available time slots for a counselor on a specific date"""
+    """
+    Get available time slots for a counselor
+    
+    Pass `date` for a single day, or `from` and `to` (inclusive, up to
+    MAX_SLOT_RANGE_DAYS) to get every day in the range from one request.
+    """
     try:
         counselor_id = request.args.get("counselorId")
         event_type_id = request.args.get("eventTypeId")
         date_str = request.args.get("date")  # YYYY-MM-DD
+        range_from = request.args.get("from")  # YYYY-MM-DD
+        range_to = request.args.get("to")  # YYYY-MM-DD
+        
+        is_range = not date_str and range_from and range_to
         
-        if not all([counselor_id, event_type_id, date_str]):
-            return jsonify({"error": "Missing required parameters: counselorId, eventTypeId, date"}), 400
+        if not all([counselor_id, event_type_id]) or not (date_str or is_range):
+            return jsonify({"error": "Missing required parameters: counselorId, eventTypeId, date (or from and to)"}), 400
         
-        target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        day_of_week = target_date.weekday()  # 0=Monday, 6=Sunday
-        # Convert to our format (0=Sunday, 6=Saturday)
-        day_of_week = (day_of_week + 1) % 7
+        if is_range:
+            start_date = datetime.strptime(range_from, "%Y-%m-%d").date()
+            end_date = datetime.strptime(range_to, "%Y-%m-%d").date()
+            if end_date < start_date:
+                return jsonify({"error": "'to' must not be before 'from'"}), 400
+            if (end_date - start_date).days + 1 > MAX_SLOT_RANGE_DAYS:
+                return jsonify({"error": f"Range cannot exceed {MAX_SLOT_RANGE_DAYS} days"}), 400
+        else:
+            start_date = end_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         
         supabase = get_supabase_client(use_service_role=True)
         
-        # Get event type details
-        event_type_resp = supabase.table("event_types").select(
-            "duration, buffer_before, buffer_after, schedule_id, max_bookings_per_day"
-        ).eq("id", event_type_id).execute()
+        # Schedules, availability and event types come from the cached index
+        index = get_availability_index(counselor_id)
         
-        if not event_type_resp.data:
+        event_type = index.event_types.get(event_type_id)
+        if not event_type:
             return jsonify({"error": "Event type not found"}), 404
         
-        event_type = event_type_resp.data[0]
         duration = event_type["duration"]
-        buffer_before = event_type.get("buffer_before", 0)
-        buffer_after = event_type.get("buffer_after", 0)
-        max_per_day = event_type.get("max_bookings_per_day")
         
         # Get schedule for this event type (or default)
-        schedule_id = event_type.get("schedule_id")
-        
-        if schedule_id:
-            schedule_resp = supabase.table("counselor_schedules").select(
-                "name, booking_buffer"
-            ).eq("id", schedule_id).execute()
-        else:
-            # Get default schedule
-            schedule_resp = supabase.table("counselor_schedules").select(
-                "name, booking_buffer"
-            ).eq("counselor_id", counselor_id).eq("is_default", True).execute()
+        schedule = index.schedule_for_event_type(event_type)
         
-        if not schedule_resp.data:
+        if not schedule:
+            if is_range:
+                return jsonify({"days": [], "message": "No schedule configured"}), 200
             return jsonify({"availableSlots": [], "message": "No schedule configured"}), 200
         
-        schedule = schedule_resp.data[0]
-        booking_buffer_hours = schedule.get("booking_buffer", 24)
-        
-        # Check booking buffer (minimum advance notice)
-        now = datetime.now()
-        min_booking_time = now + timedelta(hours=booking_buffer_hours)
-        
-        if target_date < min_booking_time.date():
-            return jsonify({
-                "availableSlots": [],
-                "message": f"Appointments must be booked at least {booking_buffer_hours} hours in advance"
-            }), 200
-        
-        # Get weekly availability for this day
-        availability_resp = supabase.table("counselor_availability").select(
-            "start_time, end_time"
-        ).eq("counselor_id", counselor_id).eq(
-            "schedule_name", schedule["name"]
-        ).eq("type", "weekly").eq("day_of_week", day_of_week).execute()
-        
-        # Check for date override
-        override_resp = supabase.table("counselor_availability").select(
-            "start_time, end_time"
-        ).eq("counselor_id", counselor_id).eq(
-            "schedule_name", schedule["name"]
-        ).eq("type", "override").eq("specific_date", date_str).execute()
-        
-        # Determine availability windows
-        availability_windows = []
-        
-        if override_resp.data:
-            # Use override instead of weekly
-            for row in override_resp.data:
-                if row["start_time"] and row["end_time"]:
-                    availability_windows.append({
-                        "start": parse_time_string(row["start_time"]),
-                        "end": parse_time_string(row["end_time"])
-                    })
-        elif availability_resp.data:
-            # Use weekly schedule
-            for row in availability_resp.data:
-                if row["start_time"] and row["end_time"]:
-                    availability_windows.append({
-                        "start": parse_time_string(row["start_time"]),
-                        "end": parse_time_string(row["end_time"])
-                    })
-        
-        if not availability_windows:
-            return jsonify({
-                "availableSlots": [],
-                "message": "Counselor is not available on this date"
-            }), 200
-        
-        # Get existing appointments for this date
+        # Existing bookings for the whole range
         existing_resp = supabase.table("appointments").select(
-            "start_time, end_time, event_type_id"
-        ).eq("counselor_id", counselor_id).eq(
-            "scheduled_date", date_str
+            "scheduled_date, start_time, end_time, event_type_id"
+        ).eq("counselor_id", counselor_id).gte(
+            "scheduled_date", start_date.isoformat()
+        ).lte(
+            "scheduled_date", end_date.isoformat()
         ).in_("status", ["pending", "confirmed"]).execute()
         
-        booked_slots = []
-        event_type_bookings_today = 0
+        days = compute_range_slots(
+            start_date,
+            end_date,
+            weekly_windows=index.weekly_windows(schedule["id"]),
+            override_windows=index.override_windows(schedule["id"]),
+            bookings=existing_resp.data or [],
+            event_type_id=event_type_id,
+            duration=duration,
+            buffer_before=event_type.get("buffer_before", 0) or 0,
+            buffer_after=event_type.get("buffer_after", 0) or 0,
+            max_per_day=event_type.get("max_bookings_per_day"),
+            booking_buffer_hours=schedule.get("booking_buffer", 24),
+        )
         
-        for apt in existing_resp.data or []:
-            booked_slots.append({
-                "start": parse_time_string(apt["start_time"]),
-                "end": parse_time_string(apt["end_time"])
-            })
-            if apt["event_type_id"] == event_type_id:
-                event_type_bookings_today += 1
+        if is_range:
+            return jsonify({
+                "days": days,
+                "from": start_date.isoformat(),
+                "to": end_date.isoformat(),
+                "duration": duration
+            }), 200
         
-        # Check max bookings per day
-        if max_per_day and event_type_bookings_today >= max_per_day:
+        day = days[0]
+        if "message" in day:
             return jsonify({
                 "availableSlots": [],
-                "message": "Maximum bookings reached for this event type today"
+                "message": day["message"]
             }), 200
         
-        # Generate available slots
-        slot_duration = duration + buffer_before + buffer_after
-        available_slots = []
-        
-        for window in availability_windows:
-            current_time = time_to_minutes(window["start"])
-            end_time = time_to_minutes(window["end"])
-            
-            while current_time + duration <= end_time:
-                slot_start = minutes_to_time(current_time)
-                slot_end = minutes_to_time(current_time + duration)
-                
-                # Check if slot overlaps with any booked appointment (including buffers)
-                slot_start_with_buffer = current_time - buffer_before
-                slot_end_with_buffer = current_time + duration + buffer_after
-                
-                is_available = True
-                for booked in booked_slots:
-                    booked_start = time_to_minutes(booked["start"])
-                    booked_end = time_to_minutes(booked["end"])
-                    
-                    # Check for overlap
-                    if (slot_start_with_buffer < booked_end and 
-                        slot_end_with_buffer > booked_start):
-                        is_available = False
-                        break
-                
-                # Check if slot is in the past (for today)
-                if target_date == min_booking_time.date():
-                    slot_datetime = datetime.combine(target_date, slot_start)
-                    if slot_datetime <= min_booking_time:
-                        is_available = False
-                
-                if is_available:
-                    available_slots.append({
-                        "startTime": slot_start.strftime("%H:%M"),
-                        "endTime": slot_end.strftime("%H:%M"),
-                        "displayTime": format_time_12hr(slot_start)
-                    })
-                
-                # Move to next slot (30 min intervals)
-                current_time += 30
-        
         return jsonify({
-            "availableSlots": available_slots,
+            "availableSlots": day["availableSlots"],
             "date": date_str,
             "duration": duration
         }), 200
@@ -761,28 +738,33 @@ def get_available_slots(user_id: str):
 @appointments_bp.route("/counselor/<string:counselor_id>/upcoming", methods=["GET"])
 @require_auth
 def get_counselor_upcoming(user_id: str, counselor_id: str):
-    """Get upcoming appointments for a specific counselor (public for students)"""
+    """
+    Get the busy-date heatmap for a counselor (public for students)
+    
+    Optional `from` and `to` (YYYY-MM-DD, inclusive) bound the window; it
+    defaults to DEFAULT_BUSY_WINDOW_DAYS from today and may not exceed
+    MAX_BUSY_WINDOW_DAYS.
+    """
     try:
-        supabase = get_supabase_client(use_service_role=True)
-        
-        today = date.today().isoformat()
-        
-        response = supabase.table("appointments").select(
-            "scheduled_date"
-        ).eq("counselor_id", counselor_id).gte(
-            "scheduled_date", today
-        ).in_("status", ["pending", "confirmed"]).execute()
+        today = date.today()
+        range_from = request.args.get("from")
+        range_to = request.args.get("to")
+        
+        start_date = datetime.strptime(range_from, "%Y-%m-%d").date() if range_from else today
+        end_date = (
+            datetime.strptime(range_to, "%Y-%m-%d").date() if range_to
+            else start_date + timedelta(days=DEFAULT_BUSY_WINDOW_DAYS - 1)
+        )
         
-        # Count appointments per date
-        date_counts = {}
-        for apt in response.data or []:
-            d = apt["scheduled_date"]
-            date_counts[d] = date_counts.get(d, 0) + 1
+        if end_date < start_date:
+            return jsonify({"error": "'to' must not be before 'from'"}), 400
+        if (end_date - start_date).days + 1 > MAX_BUSY_WINDOW_DAYS:
+            return jsonify({"error": f"Range cannot exceed {MAX_BUSY_WINDOW_DAYS} days"}), 400
         
-        return jsonify({
-            "busyDates": date_counts
-        }), 200
+        return jsonify(get_busy_dates(counselor_id, start_date, end_date, today=today)), 200
         
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD"}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -2,6 +2,8 @@
 from flask import Blueprint, request, jsonify
 from app.utils.auth import require_auth
 from app.services.supabase_service import get_supabase_client
+from app.services.availability_index import invalidate_availability_index
+from app.services.availability_writes import build_availability_rows, save_schedule_availability
 from datetime import datetime
 
 availability_bp = Blueprint("availability", __name__, url_prefix="/api/availability")
@@ -58,57 +60,27 @@ def get_availability(user_id: str):
 @availability_bp.route("", methods=["PUT"])
 @require_auth
 def save_availability(user_id: str):
-    """Save counselor's complete availability (replaces existing)"""
+    """Save counselor's complete availability (replaces existing, writing only what changed)"""
     try:
         data = request.get_json()
         schedule_name = data.get("scheduleName", "Working hours")
         weekly_schedule = data.get("weekly", [])
         date_overrides = data.get("overrides", [])
         
-        supabase = get_supabase_client(use_service_role=True)
+        try:
+            rows = build_availability_rows(weekly_schedule, date_overrides)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Delete existing availability for this schedule
-        supabase.table("counselor_availability").delete().eq(
-            "counselor_id", user_id
-        ).eq("schedule_name", schedule_name).execute()
-        
-        # Prepare rows to insert
-        rows_to_insert = []
-        
-        # Add weekly schedule rows
-        for item in weekly_schedule:
-            rows_to_insert.append({
-                "counselor_id": user_id,
-                "schedule_name": schedule_name,
-                "type": "weekly",
-                "day_of_week": item["dayOfWeek"],
-                "specific_date": None,
-                "start_time": item.get("startTime"),
-                "end_time": item.get("endTime"),
-            })
-        
-        # Add date override rows
-        for item in date_overrides:
-            rows_to_insert.append({
-                "counselor_id": user_id,
-                "schedule_name": schedule_name,
-                "type": "override",
-                "day_of_week": None,
-                "specific_date": item["date"],
-                "start_time": item.get("startTime"),
-                "end_time": item.get("endTime"),
-            })
-        
-        # Insert all rows
-        if rows_to_insert:
-            response = supabase.table("counselor_availability").insert(rows_to_insert).execute()
-            
-            if not response.data:
-                return jsonify({"error": "Failed to save availability"}), 500
+        try:
+            counts = save_schedule_availability(user_id, schedule_name, rows)
+        finally:
+            invalidate_availability_index(user_id)
         
         return jsonify({
             "message": "Availability saved successfully",
-            "count": len(rows_to_insert)
+            "count": len(rows),
+            **counts,
         }), 200
         
     except Exception as e:
@@ -141,6 +113,8 @@ def add_weekly_slot(user_id: str):
             "end_time": end_time,
         }).execute()
         
+        invalidate_availability_index(user_id)
+        
         if not response.data:
             return jsonify({"error": "Failed to add slot"}), 500
         
@@ -186,6 +160,8 @@ def add_date_override(user_id: str):
             "end_time": end_time,
         }).execute()
         
+        invalidate_availability_index(user_id)
+        
         if not response.data:
             return jsonify({"error": "Failed to add override"}), 500
         
@@ -209,6 +185,8 @@ def delete_slot(user_id: str, slot_id: str):
             "id", slot_id
         ).eq("counselor_id", user_id).execute()
         
+        invalidate_availability_index(user_id)
+        
         return jsonify({"message": "Slot deleted"}), 200
         
     except Exception as e:
@@ -3,6 +3,7 @@ Google Calendar OAuth and sync routes
 """
 from flask import Blueprint, request, jsonify, redirect
 from app.utils.auth import require_auth
+from app.utils.request_metrics import google_target, track_call
 from app.services.google_calendar_service import get_calendar_service
 from app.services.supabase_service import get_supabase_client
 from google_auth_oauthlib.flow import Flow
@@ -103,7 +104,8 @@ def oauth_callback():
         flow.redirect_uri = Config.GOOGLE_REDIRECT_URI
         
         # Exchange authorization code for tokens
-        flow.fetch_token(code=code)
+        with track_call("google", "POST", google_target(flow.client_config["token_uri"])):
+            flow.fetch_token(code=code)
         
         credentials = flow.credentials
         
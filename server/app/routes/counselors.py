@@ -1,10 +1,42 @@
-from flask import Blueprint, request, jsonify
-from app.utils.auth import require_auth
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from typing import Optional
+from app.utils.auth import get_current_principal, require_auth, require_role
 from app.services.supabase_service import get_supabase_client
+from app.services.student_export import (
+    EXPORT_FORMATS,
+    iter_student_chunks,
+    parquet_available,
+    stream_csv,
+    stream_parquet,
+)
+from app.services.student_list_updates import (
+    MAX_BULK_CHANGES,
+    STUDENT_LIST_STATUS_VALUES,
+    apply_bulk_status_changes,
+)
+from app.services.student_ids import StudentIds, resolve_id_number
+from app.services.student_notes import (
+    clamp_page_size,
+    get_student_note,
+    list_student_notes,
+    search_counselor_notes,
+)
+from app.services.student_roster import (
+    ROSTER_DEFAULT_PAGE_SIZE,
+    ROSTER_MAX_PAGE_SIZE,
+    get_student_roster,
+    on_student_status_updated,
+    page_roster,
+)
 
 counselors_bp = Blueprint("counselors", __name__, url_prefix="/api/counselors")
 
 
+def resolve_student(counselor_id: str, id_number: str) -> Optional[StudentIds]:
+    """Resolve a student's id_number through the process-level ID map"""
+    return resolve_id_number(id_number, counselor_id, get_current_principal().courses)
+
+
 @counselors_bp.route("/assigned", methods=["GET"])
 @require_auth
 def get_assigned_counselor(user_id: str):
@@ -68,76 +100,132 @@ def get_assigned_counselor(user_id: str):
     
 @counselors_bp.route("/student-list", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def get_student_list(user_id: str):
-    """Get student list filtered by counselor's assigned courses"""
+    """
+    Get student list filtered by counselor's assigned courses
+
+    Without query parameters every student is returned. Pass `limit` (and
+    `cursor` from the previous page's `nextCursor`) to page, `sort` (name,
+    idNumber, course, yearLevel) with `order` (asc or desc) to sort, and `q`
+    to search names and ID numbers.
+    """
     try:
-        supabase = get_supabase_client(use_service_role=True)
-
-        # 1. Get counselor course filters
-        course_response = (
-            supabase.table("counselor_course_filters")
-            .select("course")
-            .eq("auth_user_id", user_id)
-            .execute()
-        )
+        # 1. Counselor course filters come from the request principal
+        assigned_courses = list(get_current_principal().courses)
 
-        if not course_response.data:
+        if not assigned_courses:
             return jsonify({"students": []}), 200
 
-        assigned_courses = [row["course"] for row in course_response.data]
+        # 2. student_list inner-joined with students on the assigned courses
+        roster = get_student_roster(user_id, assigned_courses)
+
+        cursor = request.args.get("cursor")
+        limit = request.args.get("limit", type=int)
+        sort = request.args.get("sort", "name")
+        descending = request.args.get("order", "asc").lower() == "desc"
+        search = request.args.get("q")
+
+        paginate = limit is not None or cursor is not None
+        limit = max(1, min(limit or ROSTER_DEFAULT_PAGE_SIZE, ROSTER_MAX_PAGE_SIZE)) if paginate else len(roster.rows)
+
+        try:
+            students, next_cursor = page_roster(
+                roster,
+                sort=sort,
+                descending=descending,
+                query=search,
+                cursor=cursor,
+                limit=limit,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        # 2. Get student_list joined with students, filtered by course
-        student_response = (
-            supabase.table("student_list")
-            .select("""
-                id,
-                student_id,
-                year_level,
-                assessment,
-                initial_interview,
-                counseling_status,
-                exit_interview,
-                students:students!student_list_student_id_fkey(
-                    id_number, given_name, family_name, course
-                )
-            """)
-            .in_("students.course", assigned_courses)
-            .execute()
-        )
+        result = {"students": students}
+        if paginate:
+            result["nextCursor"] = next_cursor
 
-        formatted = []
-        for row in student_response.data:
-            student = row.get("students") or {}
-            if not student:
-                continue
-
-            formatted.append({
-                "idNumber": student.get("id_number"),
-                "studentName": f"{student.get('given_name','')} {student.get('family_name','')}",
-                "course": student.get("course"),
-                "yearLevel": row.get("year_level"),
-                "assessment": row.get("assessment"),
-                "initialInterview": row.get("initial_interview"),
-                "counselingStatus": row.get("counseling_status"),
-                "exitInterview": row.get("exit_interview"),
-                "studentAuthId": row.get("student_id"),
-            })
-
-        return jsonify({"students": formatted}), 200
+        return jsonify(result), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
     
+@counselors_bp.route("/students/export", methods=["GET"])
+@require_auth
+@require_role("counselor")
+def export_students(user_id: str):
+    """
+    Stream every student profile in the counselor's assigned courses
+
+    `format` is csv (default) or parquet; parquet needs the optional
+    pyarrow package.
+    """
+    export_format = request.args.get("format", "csv").lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Must be one of: {list(EXPORT_FORMATS)}"}), 400
+    if export_format == "parquet" and not parquet_available():
+        return jsonify({"error": "Parquet export requires pyarrow to be installed"}), 501
+
+    try:
+        courses = list(get_current_principal().courses)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    chunks = iter_student_chunks(courses)
+    body = stream_csv(chunks) if export_format == "csv" else stream_parquet(chunks)
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="students.{extension}"'},
+    )
+
+
+@counselors_bp.route("/student-list/bulk", methods=["PUT"])
+@require_auth
+@require_role("counselor")
+def bulk_update_student_list(user_id: str):
+    """
+    Update student_list statuses for many students at once
+
+    Body: {"changes": [{"studentAuthId", "field", "value"}, ...]} where field is
+    assessment, initial_interview, counseling_status or exit_interview.
+    Responds with a result per change.
+    """
+    try:
+        data = request.get_json() or {}
+        changes = data.get("changes")
+
+        if not isinstance(changes, list) or not changes:
+            return jsonify({"error": "changes must be a non-empty list"}), 400
+        if len(changes) > MAX_BULK_CHANGES:
+            return jsonify({"error": f"At most {MAX_BULK_CHANGES} changes per request"}), 400
+
+        results, updated_students = apply_bulk_status_changes(get_current_principal().courses, changes)
+
+        return jsonify({
+            "results": results,
+            "updated": sum(1 for r in results if r["status"] == "updated"),
+            "failed": sum(1 for r in results if r["status"] == "error"),
+            "updatedStudents": updated_students,
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @counselors_bp.route("/student/<string:student_auth_id>/assessment", methods=["PUT"])
 @require_auth
+@require_role("counselor")
 def update_student_assessment(user_id: str, student_auth_id: str):
     """Update assessment status for a student"""
     try:
         data = request.get_json()
         new_assessment = data.get("assessment")
 
-        if new_assessment not in ["pending", "high risk", "low risk"]:
+        if new_assessment not in STUDENT_LIST_STATUS_VALUES["assessment"]:
             return jsonify({"error": "Invalid assessment value"}), 400
 
         supabase = get_supabase_client(use_service_role=True)
@@ -152,6 +240,8 @@ def update_student_assessment(user_id: str, student_auth_id: str):
         if not student_lookup.data:
             return jsonify({"error": "Failed to update assessment"}), 500
 
+        on_student_status_updated(student_auth_id, {"assessment": new_assessment})
+
         return jsonify({
             "message": "Assessment updated successfully",
             "updated": student_lookup.data[0]
@@ -162,11 +252,12 @@ def update_student_assessment(user_id: str, student_auth_id: str):
     
 @counselors_bp.route("/student/<string:student_auth_id>/counseling_status", methods=["PUT"])
 @require_auth
+@require_role("counselor")
 def update_student_counselingstatus(user_id: str, student_auth_id: str):
     data = request.get_json()
     new_status = data.get("counseling_status")
 
-    if new_status not in ["no record", "ongoing", "closed"]:
+    if new_status not in STUDENT_LIST_STATUS_VALUES["counseling_status"]:
         return jsonify({"error": "Invalid counseling status"}), 400
 
     supabase = get_supabase_client(use_service_role=True)
@@ -181,6 +272,8 @@ def update_student_counselingstatus(user_id: str, student_auth_id: str):
     if not student_lookup.data:
         return jsonify({"error": "Failed to update status"}), 500
 
+    on_student_status_updated(student_auth_id, {"counseling_status": new_status})
+
     return jsonify({
         "message": "Counseling status updated successfully",
         "updated": student_lookup.data[0]
@@ -189,23 +282,41 @@ def update_student_counselingstatus(user_id: str, student_auth_id: str):
     
 @counselors_bp.route("/student/<string:id_number>/notes", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def get_student_notes(user_id: str, id_number: str):
-    """Fetch notes for a student"""
+    """
+    Fetch notes for a student
+
+    Without query parameters every note is returned with its content. Pass
+    `limit` (and `cursor` from the previous page's `nextCursor`) to page
+    through titles and metadata only, and `q` to full-text search them;
+    bodies are then loaded from /notes/<note_id>.
+    """
     try:
-        supabase = get_supabase_client(use_service_role=True)
-
-        student_lookup = (
-            supabase.table("students")
-            .select("id")
-            .eq("id_number", id_number)
-            .single()
-            .execute()
-        )
+        cursor = request.args.get("cursor")
+        limit = request.args.get("limit", type=int)
+        search = (request.args.get("q") or "").strip()
 
-        if not student_lookup.data:
+        student = resolve_student(user_id, id_number)
+        if student is None:
             return jsonify({"error": "Student not found"}), 404
 
-        student_id = student_lookup.data["id"]
+        student_id = student.student_id
+
+        if limit is not None or cursor or search:
+            try:
+                notes, next_cursor = list_student_notes(
+                    student_id,
+                    clamp_page_size(limit),
+                    cursor=cursor,
+                    search=search or None,
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            return jsonify({"notes": notes, "nextCursor": next_cursor}), 200
+
+        supabase = get_supabase_client(use_service_role=True)
 
         response = (
             supabase.table("student_notes")
@@ -219,9 +330,57 @@ def get_student_notes(user_id: str, id_number: str):
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@counselors_bp.route("/student/<string:id_number>/notes/<string:note_id>", methods=["GET"])
+@require_auth
+@require_role("counselor")
+def get_student_note_detail(user_id: str, id_number: str, note_id: str):
+    """Fetch one note with its content"""
+    try:
+        student = resolve_student(user_id, id_number)
+        if student is None:
+            return jsonify({"error": "Student not found"}), 404
+
+        note = get_student_note(student.student_id, note_id)
+        if note is None:
+            return jsonify({"error": "Note not found"}), 404
+
+        return jsonify({"note": note}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@counselors_bp.route("/notes/search", methods=["GET"])
+@require_auth
+@require_role("counselor")
+def search_notes(user_id: str):
+    """Full-text search across the notes of every student in the counselor's courses"""
+    try:
+        search = (request.args.get("q") or "").strip()
+        if not search:
+            return jsonify({"error": "q query parameter required"}), 400
+
+        try:
+            notes, next_cursor = search_counselor_notes(
+                get_current_principal().courses,
+                search,
+                clamp_page_size(request.args.get("limit", type=int)),
+                cursor=request.args.get("cursor"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify({"notes": notes, "nextCursor": next_cursor}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
     
 @counselors_bp.route("/student/<string:id_number>/notes", methods=["POST"])
 @require_auth
+@require_role("counselor")
 def add_student_note(user_id: str, id_number: str):
     """Add a new note for a student"""
     try:
@@ -238,18 +397,11 @@ def add_student_note(user_id: str, id_number: str):
 
         supabase = get_supabase_client(use_service_role=True)
 
-        student_lookup = (
-            supabase.table("students")
-            .select("id")
-            .eq("id_number", id_number)
-            .single()
-            .execute()
-        )
-
-        if not student_lookup.data:
+        student = resolve_student(user_id, id_number)
+        if student is None:
             return jsonify({"error": "Student not found"}), 404
 
-        student_id = student_lookup.data["id"]
+        student_id = student.student_id
 
         response = (
             supabase.table("student_notes")
@@ -275,6 +427,7 @@ def add_student_note(user_id: str, id_number: str):
 
 @counselors_bp.route("/student/<string:id_number>/notes/<string:note_id>", methods=["PUT"])
 @require_auth
+@require_role("counselor")
 def update_student_note(user_id: str, id_number: str, note_id: str):
     """Update an existing note"""
     try:
@@ -285,17 +438,11 @@ def update_student_note(user_id: str, id_number: str, note_id: str):
 
         supabase = get_supabase_client(use_service_role=True)
 
-        student_lookup = (
-            supabase.table("students")
-            .select("id")
-            .eq("id_number", id_number)
-            .single()
-            .execute()
-        )
-        if not student_lookup.data:
+        student = resolve_student(user_id, id_number)
+        if student is None:
             return jsonify({"error": "Student not found"}), 404
 
-        student_id = student_lookup.data["id"]
+        student_id = student.student_id
 
         response = (
             supabase.table("student_notes")
@@ -321,22 +468,17 @@ def update_student_note(user_id: str, id_number: str, note_id: str):
     
 @counselors_bp.route("/student/<string:id_number>/notes/<string:note_id>", methods=["DELETE"])
 @require_auth
+@require_role("counselor")
 def delete_student_note(user_id: str, id_number: str, note_id: str):
     """Delete a note for a student"""
     try:
         supabase = get_supabase_client(use_service_role=True)
 
-        student_lookup = (
-            supabase.table("students")
-            .select("id")
-            .eq("id_number", id_number)
-            .single()
-            .execute()
-        )
-        if not student_lookup.data:
+        student = resolve_student(user_id, id_number)
+        if student is None:
             return jsonify({"error": "Student not found"}), 404
 
-        student_id = student_lookup.data["id"]
+        student_id = student.student_id
 
         response = (
             supabase.table("student_notes")
@@ -356,6 +498,7 @@ def delete_student_note(user_id: str, id_number: str, note_id: str):
     
 @counselors_bp.route("/student/<string:student_auth_id>/profile", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def get_student_profile(user_id: str, student_auth_id: str):
     """Get student profile data by auth_user_id"""
     try:
@@ -379,6 +522,7 @@ def get_student_profile(user_id: str, student_auth_id: str):
     
 @counselors_bp.route("/student/<string:student_auth_id>/email", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def get_student_email(user_id: str, student_auth_id: str):
     """Get student email by auth_user_id"""
     try:
@@ -402,6 +546,7 @@ def get_student_email(user_id: str, student_auth_id: str):
 
 @counselors_bp.route("/student/<string:student_auth_id>/exists", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def profile_exists_by_authid(user_id: str, student_auth_id:str):
     """Check if student profile exists through student_auth_id"""
     try:
@@ -422,6 +567,7 @@ def profile_exists_by_authid(user_id: str, student_auth_id:str):
 
 @counselors_bp.route("/student/<string:student_auth_id>/completion-status", methods=["GET"])
 @require_auth
+@require_role("counselor")
 def get_student_profile_completion_status_by_authid(user_id: str, student_auth_id:str):
     """Check if student profile is in progress or completed"""
     try:
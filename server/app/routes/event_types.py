@@ -5,6 +5,7 @@ Event Types API routes for counselor appointment type management
 from flask import Blueprint, request, jsonify
 from app.utils.auth import require_auth
 from app.services.supabase_service import get_supabase_client
+from app.services.availability_index import invalidate_availability_index
 
 event_types_bp = Blueprint("event_types", __name__, url_prefix="/api/event-types")
 
@@ -86,6 +87,8 @@ def create_event_type(user_id: str):
         
         response = supabase.table("event_types").insert(insert_data).execute()
         
+        invalidate_availability_index(user_id)
+        
         if not response.data:
             return jsonify({"error": "Failed to create event type"}), 500
         
@@ -206,6 +209,8 @@ def update_event_type(user_id: str, event_type_id: str):
             .execute()
         )
         
+        invalidate_availability_index(user_id)
+        
         if not response.data:
             return jsonify({"error": "Failed to update event type"}), 500
         
@@ -274,6 +279,8 @@ def delete_event_type(user_id: str, event_type_id: str):
             "id", event_type_id
         ).eq("counselor_id", user_id).execute()
         
+        invalidate_availability_index(user_id)
+        
         return jsonify({"message": "Event type deleted successfully"}), 200
         
     except Exception as e:
@@ -327,6 +334,8 @@ def duplicate_event_type(user_id: str, event_type_id: str):
         
         response = supabase.table("event_types").insert(insert_data).execute()
         
+        invalidate_availability_index(user_id)
+        
         if not response.data:
             return jsonify({"error": "Failed to duplicate event type"}), 500
         
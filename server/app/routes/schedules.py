@@ -2,6 +2,8 @@
 from flask import Blueprint, request, jsonify
 from app.utils.auth import require_auth
 from app.services.supabase_service import get_supabase_client
+from app.services.availability_index import invalidate_availability_index
+from app.services.schedule_writes import create_counselor_schedule, update_counselor_schedule
 
 schedules_bp = Blueprint("schedules", __name__, url_prefix="/api/schedules")
 
@@ -53,86 +55,21 @@ def create_schedule(user_id: str):
         if not name:
             return jsonify({"error": "Schedule name is required"}), 400
         
-        supabase = get_supabase_client(use_service_role=True)
-        
-        # Check if schedule name already exists for this counselor
-        existing = (
-            supabase.table("counselor_schedules")
-            .select("id")
-            .eq("counselor_id", user_id)
-            .eq("name", name)
-            .execute()
-        )
-        
-        if existing.data:
-            return jsonify({"error": "A schedule with this name already exists"}), 400
-        
-        # Create the new schedule
-        response = supabase.table("counselor_schedules").insert({
-            "counselor_id": user_id,
-            "name": name,
-            "is_default": is_default,
-            "booking_buffer": booking_buffer,
-        }).execute()
-        
-        if not response.data:
-            return jsonify({"error": "Failed to create schedule"}), 500
+        try:
+            new_schedule = create_counselor_schedule(
+                user_id,
+                name,
+                is_default=is_default,
+                booking_buffer=booking_buffer,
+                source_name=duplicate_from or None,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        new_schedule = response.data[0]
+        if new_schedule is None:
+            return jsonify({"error": "Source schedule not found"}), 404
         
-        # If duplicating from another schedule, copy its availability
-        if duplicate_from:
-            # Get availability from source schedule
-            source_availability = (
-                supabase.table("counselor_availability")
-                .select("*")
-                .eq("counselor_id", user_id)
-                .eq("schedule_name", duplicate_from)
-                .execute()
-            )
-            
-            if source_availability.data:
-                # Create copies with new schedule name
-                rows_to_insert = []
-                for row in source_availability.data:
-                    rows_to_insert.append({
-                        "counselor_id": user_id,
-                        "schedule_name": name,
-                        "type": row["type"],
-                        "day_of_week": row["day_of_week"],
-                        "specific_date": row["specific_date"],
-                        "start_time": row["start_time"],
-                        "end_time": row["end_time"],
-                    })
-                
-                if rows_to_insert:
-                    supabase.table("counselor_availability").insert(rows_to_insert).execute()
-        else:
-            # Initialize with default availability (Mon-Fri 9-5)
-            default_availability = []
-            for day in range(7):
-                if day == 0 or day == 6:  # Sunday and Saturday
-                    default_availability.append({
-                        "counselor_id": user_id,
-                        "schedule_name": name,
-                        "type": "weekly",
-                        "day_of_week": day,
-                        "specific_date": None,
-                        "start_time": None,
-                        "end_time": None,
-                    })
-                else:  # Monday to Friday
-                    default_availability.append({
-                        "counselor_id": user_id,
-                        "schedule_name": name,
-                        "type": "weekly",
-                        "day_of_week": day,
-                        "specific_date": None,
-                        "start_time": "09:00",
-                        "end_time": "17:00",
-                    })
-            
-            supabase.table("counselor_availability").insert(default_availability).execute()
+        invalidate_availability_index(user_id)
         
         return jsonify({
             "message": "Schedule created successfully",
@@ -160,69 +97,24 @@ def update_schedule(user_id: str, schedule_id: str):
         is_default = data.get("isDefault")
         booking_buffer = data.get("bookingBuffer")
         
-        supabase = get_supabase_client(use_service_role=True)
-        
-        # Get current schedule
-        current = (
-            supabase.table("counselor_schedules")
-            .select("*")
-            .eq("id", schedule_id)
-            .eq("counselor_id", user_id)
-            .execute()
-        )
-        
-        if not current.data:
-            return jsonify({"error": "Schedule not found"}), 404
-        
-        old_name = current.data[0]["name"]
-        update_data = {}
-        
-        # Handle name change
-        if new_name and new_name != old_name:
-            # Check if new name already exists
-            existing = (
-                supabase.table("counselor_schedules")
-                .select("id")
-                .eq("counselor_id", user_id)
-                .eq("name", new_name)
-                .neq("id", schedule_id)
-                .execute()
-            )
-            
-            if existing.data:
-                return jsonify({"error": "A schedule with this name already exists"}), 400
-            
-            update_data["name"] = new_name
-            
-            # Also update schedule_name in counselor_availability
-            supabase.table("counselor_availability").update({
-                "schedule_name": new_name
-            }).eq("counselor_id", user_id).eq("schedule_name", old_name).execute()
-        
-        # Handle default change
-        if is_default is not None:
-            update_data["is_default"] = is_default
-        
-        # Handle booking buffer change
-        if booking_buffer is not None:
-            update_data["booking_buffer"] = booking_buffer
-        
-        if not update_data:
+        if not new_name and is_default is None and booking_buffer is None:
             return jsonify({"error": "No changes provided"}), 400
         
-        # Update the schedule
-        response = (
-            supabase.table("counselor_schedules")
-            .update(update_data)
-            .eq("id", schedule_id)
-            .eq("counselor_id", user_id)
-            .execute()
-        )
+        try:
+            updated = update_counselor_schedule(
+                user_id,
+                schedule_id,
+                name=new_name or None,
+                is_default=is_default,
+                booking_buffer=booking_buffer,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        if not response.data:
-            return jsonify({"error": "Failed to update schedule"}), 500
+        invalidate_availability_index(user_id)
         
-        updated = response.data[0]
+        if updated is None:
+            return jsonify({"error": "Schedule not found"}), 404
         
         return jsonify({
             "message": "Schedule updated successfully",
@@ -259,7 +151,6 @@ def delete_schedule(user_id: str, schedule_id: str):
         if not current.data:
             return jsonify({"error": "Schedule not found"}), 404
         
-        schedule_name = current.data[0]["name"]
         was_default = current.data[0]["is_default"]
         
         # Check if this is the last schedule
@@ -275,8 +166,8 @@ def delete_schedule(user_id: str, schedule_id: str):
         
         # Delete associated availability first
         supabase.table("counselor_availability").delete().eq(
-            "counselor_id", user_id
-        ).eq("schedule_name", schedule_name).execute()
+            "schedule_id", schedule_id
+        ).execute()
         
         # Delete the schedule
         supabase.table("counselor_schedules").delete().eq(
@@ -299,6 +190,8 @@ def delete_schedule(user_id: str, schedule_id: str):
                     "is_default": True
                 }).eq("id", remaining.data[0]["id"]).execute()
         
+        invalidate_availability_index(user_id)
+        
         return jsonify({"message": "Schedule deleted successfully"}), 200
         
     except Exception as e:
@@ -316,72 +209,15 @@ def duplicate_schedule(user_id: str, schedule_id: str):
         if not new_name:
             return jsonify({"error": "New schedule name is required"}), 400
         
-        supabase = get_supabase_client(use_service_role=True)
-        
-        # Get source schedule
-        source = (
-            supabase.table("counselor_schedules")
-            .select("*")
-            .eq("id", schedule_id)
-            .eq("counselor_id", user_id)
-            .execute()
-        )
+        try:
+            new_schedule = create_counselor_schedule(user_id, new_name, source_id=schedule_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        if not source.data:
+        if new_schedule is None:
             return jsonify({"error": "Source schedule not found"}), 404
         
-        source_name = source.data[0]["name"]
-        source_booking_buffer = source.data[0].get("booking_buffer", 24)
-        
-        # Check if new name already exists
-        existing = (
-            supabase.table("counselor_schedules")
-            .select("id")
-            .eq("counselor_id", user_id)
-            .eq("name", new_name)
-            .execute()
-        )
-        
-        if existing.data:
-            return jsonify({"error": "A schedule with this name already exists"}), 400
-        
-        # Create new schedule
-        new_schedule_response = supabase.table("counselor_schedules").insert({
-            "counselor_id": user_id,
-            "name": new_name,
-            "is_default": False,
-            "booking_buffer": source_booking_buffer,
-        }).execute()
-        
-        if not new_schedule_response.data:
-            return jsonify({"error": "Failed to create duplicate schedule"}), 500
-        
-        # Copy availability from source
-        source_availability = (
-            supabase.table("counselor_availability")
-            .select("*")
-            .eq("counselor_id", user_id)
-            .eq("schedule_name", source_name)
-            .execute()
-        )
-        
-        if source_availability.data:
-            rows_to_insert = []
-            for row in source_availability.data:
-                rows_to_insert.append({
-                    "counselor_id": user_id,
-                    "schedule_name": new_name,
-                    "type": row["type"],
-                    "day_of_week": row["day_of_week"],
-                    "specific_date": row["specific_date"],
-                    "start_time": row["start_time"],
-                    "end_time": row["end_time"],
-                })
-            
-            if rows_to_insert:
-                supabase.table("counselor_availability").insert(rows_to_insert).execute()
-        
-        new_schedule = new_schedule_response.data[0]
+        invalidate_availability_index(user_id)
         
         return jsonify({
             "message": "Schedule duplicated successfully",
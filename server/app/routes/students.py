@@ -2,45 +2,10 @@
 from flask import Blueprint, request, jsonify
 from app.utils.auth import require_auth
 from app.services.supabase_service import get_supabase_client
+from app.services.student_ids import invalidate_student
+from app.services.student_roster import on_student_profile_saved
 from app.models.student import (
-    transform_personal_data_a,
-    transform_personal_data_b,
-    transform_personal_data_c,
-    transform_personal_data_d,
-    transform_family_data_a,
-    transform_family_data_b,
-    transform_family_data_c,
-    transform_academic_data_a,
-    transform_academic_data_b,
-    transform_academic_data_c,
-    transform_distance_learning_data_a,
-    transform_distance_learning_data_b,
-    transform_psychosocial_data_a,
-    transform_psychosocial_data_b,
-    transform_needs_assessment_data_a,
-    transform_needs_assessment_data_b,
-    transform_needs_assessment_data_c,
-    transform_needs_assessment_data_d,
-    transform_needs_assessment_data_e,
-    transform_from_personal_data_a,
-    transform_from_personal_data_b,
-    transform_from_personal_data_c,
-    transform_from_personal_data_d,
-    transform_from_family_data_a,
-    transform_from_family_data_b,
-    transform_from_family_data_c,
-    transform_from_academic_data_a,
-    transform_from_academic_data_b,
-    transform_from_academic_data_c,
-    transform_from_distance_learning_data_a,
-    transform_from_distance_learning_data_b,
-    transform_from_psychosocial_data_a,
-    transform_from_psychosocial_data_b,
-    transform_from_needs_assessment_data_a,
-    transform_from_needs_assessment_data_b,
-    transform_from_needs_assessment_data_c,
-    transform_from_needs_assessment_data_d,
-    transform_from_needs_assessment_data_e,
+    get_section_part,
     check_personal_data_complete,
     check_family_data_complete,
     check_academic_data_complete,
@@ -51,6 +16,16 @@ from app.models.student import (
 
 students_bp = Blueprint("students", __name__, url_prefix="/api/students")
 
+# section index -> (completion flag column, checker)
+SECTION_COMPLETENESS_CHECKS = {
+    0: ("is_personal_data_complete", check_personal_data_complete),
+    1: ("is_family_data_complete", check_family_data_complete),
+    2: ("is_academic_data_complete", check_academic_data_complete),
+    3: ("is_distance_learning_data_complete", check_distance_learning_data_complete),
+    4: ("is_psychosocial_data_complete", check_psychosocial_data_complete),
+    5: ("is_needs_assessment_data_complete", check_needs_assessment_data_complete),
+}
+
 @students_bp.route("/profile/onboarding-status", methods=["GET"])
 @require_auth
 def get_onboarding_status(user_id: str):
@@ -243,11 +218,16 @@ def get_student_section(user_id: str):
         if section_index is None or part_index is None:
             return jsonify({"error": "section and part query parameters required"}), 400
         
+        section_part = get_section_part(section_index, part_index)
+        if section_part is None:
+            return jsonify({"error": "Invalid section or part index"}), 400
+        
         supabase = get_supabase_client(use_service_role=True)
         
+        # read only the columns this part's form uses
         response = (
             supabase.table("students")
-            .select("*")
+            .select(section_part.select_clause)
             .eq("auth_user_id", user_id)
             .execute()
         )
@@ -255,63 +235,7 @@ def get_student_section(user_id: str):
         if not response.data:
             return jsonify({"data": None}), 200
         
-        db_record = response.data[0]
-        
-        # transform based on section and part
-        form_data = None
-        
-        if section_index == 0:  # Personal Data
-            if part_index == 0:
-                form_data = transform_from_personal_data_a(db_record)
-            elif part_index == 1:
-                form_data = transform_from_personal_data_b(db_record)
-            elif part_index == 2:
-                form_data = transform_from_personal_data_c(db_record)
-            elif part_index == 3:
-                form_data = transform_from_personal_data_d(db_record)
-        
-        elif section_index == 1:  # Family Data
-            if part_index == 0:
-                form_data = transform_from_family_data_a(db_record)
-            elif part_index == 1:
-                form_data = transform_from_family_data_b(db_record)
-            elif part_index == 2:
-                form_data = transform_from_family_data_c(db_record)
-
-        elif section_index == 2:  # Academic Data
-            if part_index == 0:
-                form_data = transform_from_academic_data_a(db_record)
-            elif part_index == 1:
-                form_data = transform_from_academic_data_b(db_record)
-            elif part_index == 2:
-                form_data = transform_from_academic_data_c(db_record)
-
-        elif section_index == 3:  # Distance Learning Data
-            if part_index == 0:
-                form_data = transform_from_distance_learning_data_a(db_record)
-            elif part_index == 1:
-                form_data = transform_from_distance_learning_data_b(db_record)
-                
-        elif section_index == 4: # Psychosocial Data
-            if part_index == 0:
-                form_data = transform_from_psychosocial_data_a(db_record)
-            elif part_index == 1:
-                form_data = transform_from_psychosocial_data_b(db_record)
-
-        elif section_index == 5: # Needs Assessment Data
-            if part_index == 0:
-                form_data = transform_from_needs_assessment_data_a(db_record)
-            if part_index == 1:
-                form_data = transform_from_needs_assessment_data_b(db_record)
-            if part_index == 2:
-                form_data = transform_from_needs_assessment_data_c(db_record)
-            if part_index == 3:
-                form_data = transform_from_needs_assessment_data_d(db_record)
-            if part_index == 4:
-                form_data = transform_from_needs_assessment_data_e(db_record)
-
-        if form_data is None:
-            return jsonify({"error": "Invalid section or part index"}), 400
+        form_data = section_part.from_db(response.data[0])
 
         return jsonify({"data": form_data}), 200
     except Exception as e:
@@ -335,132 +259,55 @@ def save_student_section(user_id: str):
         if form_data is None or section_index is None or part_index is None:
             return jsonify({"error": "formData, sectionIndex, and partIndex required"}), 400
         
+        section_part = get_section_part(section_index, part_index)
+        if section_part is None:
+            return jsonify({"error": "Invalid section or part index"}), 400
+        
         supabase = get_supabase_client(use_service_role=True)
         
         # transform form data to database format based on section/part
-        db_data = {}
-        
-        if section_index == 0:  # Personal Data
-            if part_index == 0:
-                db_data = transform_personal_data_a(form_data)
-            elif part_index == 1:
-                db_data = transform_personal_data_b(form_data)
-            elif part_index == 2:
-                db_data = transform_personal_data_c(form_data)
-            elif part_index == 3:
-                db_data = transform_personal_data_d(form_data)
-        
-        elif section_index == 1:  # Family Data
-            if part_index == 0:
-                db_data = transform_family_data_a(form_data)
-            elif part_index == 1:
-                db_data = transform_family_data_b(form_data)
-            elif part_index == 2:
-                db_data = transform_family_data_c(form_data)
-
-        elif section_index == 2:  # Academic Data
-            if part_index == 0:
-                db_data = transform_academic_data_a(form_data)
-            elif part_index == 1:
-                db_data = transform_academic_data_b(form_data)
-            elif part_index == 2:
-                db_data = transform_academic_data_c(form_data)
-
-        elif section_index == 3:  # Distance Learning Data
-            if part_index == 0:
-                db_data = transform_distance_learning_data_a(form_data)
-            elif part_index == 1:
-                db_data = transform_distance_learning_data_b(form_data)
-
-        elif section_index == 4: # Psychosocial Data
-            if part_index == 0:
-                db_data = transform_psychosocial_data_a(form_data)
-            elif part_index == 1:
-                db_data = transform_psychosocial_data_b(form_data)
-        
-        elif section_index == 5: # Needs Assessment Data
-            if part_index == 0:
-                db_data = transform_needs_assessment_data_a(form_data)
-            if part_index == 1:
-                db_data = transform_needs_assessment_data_b(form_data)
-            if part_index == 2:
-                db_data = transform_needs_assessment_data_c(form_data)
-            if part_index == 3:
-                db_data = transform_needs_assessment_data_d(form_data)
-            if part_index == 4:
-                db_data = transform_needs_assessment_data_e(form_data)                
+        db_data = section_part.to_db(form_data)
 
         # always include auth_user_id
         db_data["auth_user_id"] = user_id
         
-        # check if record exists
-        existing_response = (
+        # update first: the returned row is the merged record, so completeness
+        # can be checked without reading it back. An upsert would send only
+        # this part's columns as the insert row, which Postgres checks
+        # against NOT NULL constraints before resolving the conflict.
+        save_response = (
             supabase.table("students")
-            .select("id")
+            .update(db_data)
             .eq("auth_user_id", user_id)
             .execute()
         )
-        
-        if existing_response.data:
-            # update existing record
-            update_response = (
-                supabase.table("students")
-                .update(db_data)
-                .eq("auth_user_id", user_id)
-                .execute()
-            )
-            result_id = existing_response.data[0]["id"]
-        else:
-            # insert new record
-            insert_response = (
-                supabase.table("students")
-                .insert(db_data)
-                .execute()
-            )
-            result_id = insert_response.data[0]["id"] if insert_response.data else None
-            
-            # update profiles.student_profile_id after creating student record
-            if result_id:
-                try:
-                    supabase.table("profiles").update({
-                        "student_profile_id": result_id
-                    }).eq("id", user_id).execute()
-                except Exception:
-                    pass  # Don't fail if this fails
+        if not save_response.data:
+            # no record yet (profiles.student_profile_id is linked by an insert trigger)
+            try:
+                save_response = supabase.table("students").insert(db_data).execute()
+            except Exception as e:
+                # a concurrent first save created the record in between
+                if getattr(e, "code", None) != "23505":
+                    raise
+                save_response = (
+                    supabase.table("students")
+                    .update(db_data)
+                    .eq("auth_user_id", user_id)
+                    .execute()
+                )
+        
+        on_student_profile_saved(user_id, db_data)
+        invalidate_student(user_id)
         
         # check and update completion flags
-        if result_id:
-            full_record_response = (
-                supabase.table("students")
-                .select("*")
-                .eq("auth_user_id", user_id)
-                .execute()
-            )
+        if save_response.data:
+            full_record = save_response.data[0]
+            section_check = SECTION_COMPLETENESS_CHECKS.get(section_index)
             
-            if full_record_response.data:
-                full_record = full_record_response.data[0]
-                update_flags = {}
-                
-                if section_index == 0 and check_personal_data_complete(full_record):
-                    update_flags["is_personal_data_complete"] = True
-                
-                if section_index == 1 and check_family_data_complete(full_record):
-                    update_flags["is_family_data_complete"] = True
-                
-                if section_index == 2 and check_academic_data_complete(full_record):
-                    update_flags["is_academic_data_complete"] = True
-
-                if section_index == 3 and check_distance_learning_data_complete(full_record):
-                    update_flags["is_distance_learning_data_complete"] = True
-
-                if section_index == 4 and check_psychosocial_data_complete(full_record):
-                    update_flags["is_psychosocial_data_complete"] = True
-                
-                if section_index == 5 and check_needs_assessment_data_complete(full_record):
-                    update_flags["is_needs_assessment_data_complete"] = True
-                
-                if update_flags:
-                    supabase.table("students").update(update_flags).eq("auth_user_id", user_id).execute()
+            if section_check:
+                flag, is_complete = section_check
+                if not full_record.get(flag) and is_complete(full_record):
+                    supabase.table("students").update({flag: True}).eq("auth_user_id", user_id).execute()
         
         return jsonify({"success": True}), 200
     except Exception as e:
@@ -0,0 +1,162 @@
+"""
+Per-student appointment statistics for the activity dashboard
+Counts are grouped in the database and cached per student; booking and
+status-change paths apply deltas instead of invalidating
+"""
+import threading
+import time as time_module
+from datetime import date
+from typing import Any, Dict, Optional
+
+from app.services.supabase_service import get_supabase_client, is_missing_rpc
+from config import Config
+
+# stats key -> appointment status it counts
+STATUS_COUNTERS = {
+    "counselingSessions": "completed",
+    "pendingAppointments": "pending",
+    "cancelledAppointments": "cancelled",
+    # the status update route stores "no_show"; the old counter matched
+    # "no-show", which no row has, so it always reported 0
+    "noShowAppointments": "no_show",
+}
+
+# RPC column -> stats key
+_RPC_COLUMNS = {
+    "completed": "counselingSessions",
+    "pending": "pendingAppointments",
+    "upcoming": "upcomingAppointments",
+    "cancelled": "cancelledAppointments",
+    "no_show": "noShowAppointments",
+    "total": "totalActivities",
+}
+
+
+def _count(query) -> int:
+    return query.execute().count or 0
+
+
+def fetch_activity_stats(
+    student_id: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    today: Optional[date] = None,
+) -> Dict[str, int]:
+    """Count a student's appointments by status in the database"""
+    supabase = get_supabase_client(use_service_role=True)
+    today_str = (today or date.today()).isoformat()
+
+    try:
+        # single grouped count (see get_student_activity_stats migration)
+        resp = supabase.rpc("get_student_activity_stats", {
+            "p_student_id": student_id,
+            "p_today": today_str,
+            "p_date_from": date_from,
+            "p_date_to": date_to,
+        }).execute()
+        row = (resp.data or [{}])[0]
+        return {key: int(row.get(column) or 0) for column, key in _RPC_COLUMNS.items()}
+    except Exception as e:
+        # only a database without the function gets the count queries; any
+        # other failure is raised rather than multiplied by six
+        if not is_missing_rpc(e):
+            raise
+        print(f"get_student_activity_stats is not deployed, falling back to count queries: {e}")
+
+    def base():
+        query = supabase.table("appointments").select("id", count="exact", head=True).eq("student_id", student_id)
+        if date_from:
+            query = query.gte("scheduled_date", date_from)
+        if date_to:
+            query = query.lte("scheduled_date", date_to)
+        return query
+
+    # Fallback: head-only exact counts, no rows are transferred
+    stats = {key: _count(base().eq("status", status)) for key, status in STATUS_COUNTERS.items()}
+    stats["upcomingAppointments"] = _count(base().eq("status", "confirmed").gte("scheduled_date", today_str))
+    stats["totalActivities"] = _count(base())
+    return stats
+
+
+class _StatsEntry:
+    """Cached unfiltered stats for one student, valid for the day it was loaded"""
+
+    def __init__(self, stats: Dict[str, int], as_of: date):
+        self.stats = stats
+        self.as_of = as_of
+        self.loaded_at = time_module.monotonic()
+
+    def is_valid(self, today: date, ttl_seconds: float) -> bool:
+        # upcoming counts depend on today's date, so entries expire at midnight
+        return self.as_of == today and time_module.monotonic() - self.loaded_at <= ttl_seconds
+
+
+_lock = threading.Lock()
+_entries: Dict[str, _StatsEntry] = {}
+# bumped on every delta so a load that raced a write is not cached
+_generations: Dict[str, int] = {}
+
+
+def get_activity_stats(student_id: str, date_from: str = None, date_to: str = None) -> Dict[str, Any]:
+    """
+    Get activity statistics for a student
+
+    Unfiltered stats are served from the per-student cache; date-filtered
+    requests always go to the database. ACTIVITY_STATS_TTL bounds staleness
+    for changes made by other worker processes.
+    """
+    if date_from or date_to:
+        return fetch_activity_stats(student_id, date_from, date_to)
+
+    today = date.today()
+    entry = _entries.get(student_id)
+    if entry is not None and entry.is_valid(today, Config.ACTIVITY_STATS_TTL):
+        return dict(entry.stats)
+
+    generation = _generations.get(student_id, 0)
+    stats = fetch_activity_stats(student_id, today=today)
+    with _lock:
+        if _generations.get(student_id, 0) == generation:
+            _entries[student_id] = _StatsEntry(stats, today)
+    return dict(stats)
+
+
+def _apply_status_delta(stats: Dict[str, int], status: Optional[str], scheduled_date: Optional[str], as_of: date, delta: int) -> None:
+    for key, counted_status in STATUS_COUNTERS.items():
+        if status == counted_status:
+            stats[key] += delta
+    if status == "confirmed" and scheduled_date and scheduled_date >= as_of.isoformat():
+        stats["upcomingAppointments"] += delta
+
+
+def record_appointment_status(
+    student_id: str,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    scheduled_date: Optional[str],
+) -> None:
+    """
+    Apply a booking (old_status=None) or status change to the cached stats
+
+    Students without a cached entry are left alone; their next read loads
+    fresh counts.
+    """
+    with _lock:
+        _generations[student_id] = _generations.get(student_id, 0) + 1
+        entry = _entries.get(student_id)
+        if entry is None:
+            return
+        stats = dict(entry.stats)
+        if old_status is None:
+            stats["totalActivities"] += 1
+        else:
+            _apply_status_delta(stats, old_status, scheduled_date, entry.as_of, -1)
+        _apply_status_delta(stats, new_status, scheduled_date, entry.as_of, 1)
+        entry.stats = stats
+
+
+def invalidate_activity_stats(student_id: str) -> None:
+    """Drop a student's cached stats"""
+    with _lock:
+        _generations[student_id] = _generations.get(student_id, 0) + 1
+        _entries.pop(student_id, None)
@@ -0,0 +1,143 @@
+"""
+In-process availability index per counselor
+Caches schedules, availability windows and event types used by the slot engine
+"""
+import threading
+import time as time_module
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from app.services.supabase_service import get_supabase_client
+from app.services.slot_service import Interval, rows_to_windows, to_db_day_of_week
+from config import Config
+
+
+class CounselorAvailabilityIndex:
+    """Read-only snapshot of one counselor's booking configuration"""
+
+    def __init__(
+        self,
+        counselor_id: str,
+        schedules: List[Dict[str, Any]],
+        availability: List[Dict[str, Any]],
+        event_types: List[Dict[str, Any]],
+    ):
+        self.counselor_id = counselor_id
+        self.loaded_at = time_module.monotonic()
+
+        self.schedules_by_id = {row["id"]: row for row in schedules}
+        self.default_schedule = next((row for row in schedules if row.get("is_default")), None)
+        self.event_types = {row["id"]: row for row in event_types}
+
+        # schedule_id -> day_of_week -> windows
+        self.weekly: Dict[str, Dict[int, List[Interval]]] = {}
+        # schedule_id -> YYYY-MM-DD -> windows (empty list = unavailable that day)
+        self.overrides: Dict[str, Dict[str, List[Interval]]] = {}
+
+        weekly_rows: Dict[str, Dict[int, List[Dict[str, Any]]]] = {}
+        override_rows: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for row in availability:
+            if row["type"] == "weekly":
+                weekly_rows.setdefault(row["schedule_id"], {}).setdefault(row["day_of_week"], []).append(row)
+            else:
+                override_rows.setdefault(row["schedule_id"], {}).setdefault(row["specific_date"], []).append(row)
+
+        for schedule_id, days in weekly_rows.items():
+            self.weekly[schedule_id] = {dow: rows_to_windows(rows) for dow, rows in days.items()}
+        for schedule_id, dates in override_rows.items():
+            self.overrides[schedule_id] = {d: rows_to_windows(rows) for d, rows in dates.items()}
+
+    def is_expired(self, ttl_seconds: float) -> bool:
+        """Check whether the snapshot is older than the TTL"""
+        return time_module.monotonic() - self.loaded_at > ttl_seconds
+
+    def schedule_for_event_type(self, event_type: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the schedule an event type books against (or the default)"""
+        schedule_id = event_type.get("schedule_id")
+        if schedule_id:
+            return self.schedules_by_id.get(schedule_id)
+        return self.default_schedule
+
+    def weekly_windows(self, schedule_id: str) -> Dict[int, List[Interval]]:
+        """Get day_of_week -> windows for a schedule"""
+        return self.weekly.get(schedule_id, {})
+
+    def override_windows(self, schedule_id: str) -> Dict[str, List[Interval]]:
+        """Get YYYY-MM-DD -> windows for a schedule's date overrides"""
+        return self.overrides.get(schedule_id, {})
+
+    def windows_for_date(self, schedule_id: str, d: date) -> List[Interval]:
+        """Get availability windows for a date (override wins over weekly)"""
+        overrides = self.override_windows(schedule_id)
+        date_str = d.isoformat()
+        if date_str in overrides:
+            return overrides[date_str]
+        return self.weekly_windows(schedule_id).get(to_db_day_of_week(d), [])
+
+
+_indexes: Dict[str, CounselorAvailabilityIndex] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+# bumped on every invalidation so a load that raced a write is not cached
+_generations: Dict[str, int] = {}
+
+
+def _load_index(counselor_id: str) -> CounselorAvailabilityIndex:
+    """Read a counselor's schedules, availability and event types"""
+    supabase = get_supabase_client(use_service_role=True)
+
+    schedules = supabase.table("counselor_schedules").select(
+        "id, name, is_default, booking_buffer"
+    ).eq("counselor_id", counselor_id).execute()
+
+    # past overrides can never produce slots, so leave them out
+    availability = supabase.table("counselor_availability").select(
+        "schedule_id, type, day_of_week, specific_date, start_time, end_time"
+    ).eq("counselor_id", counselor_id).or_(
+        f"type.eq.weekly,specific_date.gte.{date.today().isoformat()}"
+    ).execute()
+
+    event_types = supabase.table("event_types").select(
+        "id, duration, buffer_before, buffer_after, schedule_id, max_bookings_per_day"
+    ).eq("counselor_id", counselor_id).execute()
+
+    return CounselorAvailabilityIndex(
+        counselor_id,
+        schedules.data or [],
+        availability.data or [],
+        event_types.data or [],
+    )
+
+
+def get_availability_index(counselor_id: str) -> CounselorAvailabilityIndex:
+    """
+    Get the cached availability index for a counselor
+
+    Entries are dropped by invalidate_availability_index() on writes; the TTL
+    (AVAILABILITY_INDEX_TTL) bounds staleness for writes handled by other
+    worker processes.
+    """
+    ttl = Config.AVAILABILITY_INDEX_TTL
+    index = _indexes.get(counselor_id)
+    if index is not None and not index.is_expired(ttl):
+        return index
+
+    with _locks_guard:
+        lock = _load_locks.setdefault(counselor_id, threading.Lock())
+
+    # one loader per counselor, concurrent requests wait for its result
+    with lock:
+        index = _indexes.get(counselor_id)
+        if index is None or index.is_expired(ttl):
+            generation = _generations.get(counselor_id, 0)
+            index = _load_index(counselor_id)
+            if _generations.get(counselor_id, 0) == generation:
+                _indexes[counselor_id] = index
+        return index
+
+
+def invalidate_availability_index(counselor_id: str) -> None:
+    """Drop a counselor's cached index after their schedule data changes"""
+    with _locks_guard:
+        _generations[counselor_id] = _generations.get(counselor_id, 0) + 1
+    _indexes.pop(counselor_id, None)
@@ -0,0 +1,162 @@
+"""
+Diff-based saves of a counselor's availability
+PUT /api/availability submits a whole schedule; only the rows that changed
+are inserted, updated or deleted
+"""
+import uuid
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.slot_service import parse_time_string
+from app.services.supabase_service import get_supabase_client, is_missing_rpc
+
+# columns compared when pairing submitted rows with stored ones
+AVAILABILITY_CONTENT_COLUMNS = ("type", "day_of_week", "specific_date", "start_time", "end_time")
+
+
+def _normalize_time(value: Any) -> Optional[str]:
+    """HH:MM or HH:MM:SS -> HH:MM:SS, the format Postgres returns"""
+    if value in (None, ""):
+        return None
+    try:
+        return parse_time_string(value).strftime("%H:%M:%S")
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid time: {value}")
+
+
+def _row_id(value: Any) -> Optional[str]:
+    """Keep ids echoed back from GET; anything else is treated as a new row"""
+    try:
+        return str(uuid.UUID(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def build_availability_rows(weekly: List[Dict[str, Any]], overrides: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert the PUT body's weekly/overrides lists to counselor_availability rows"""
+    rows: List[Dict[str, Any]] = []
+
+    for item in weekly:
+        day_of_week = item.get("dayOfWeek")
+        if not isinstance(day_of_week, int) or isinstance(day_of_week, bool) or not 0 <= day_of_week <= 6:
+            raise ValueError("Invalid day of week")
+        rows.append({
+            "id": _row_id(item.get("id")),
+            "type": "weekly",
+            "day_of_week": day_of_week,
+            "specific_date": None,
+            "start_time": _normalize_time(item.get("startTime")),
+            "end_time": _normalize_time(item.get("endTime")),
+        })
+
+    for item in overrides:
+        try:
+            specific_date = date.fromisoformat(item.get("date")).isoformat()
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid date: {item.get('date')}")
+        rows.append({
+            "id": _row_id(item.get("id")),
+            "type": "override",
+            "day_of_week": None,
+            "specific_date": specific_date,
+            "start_time": _normalize_time(item.get("startTime")),
+            "end_time": _normalize_time(item.get("endTime")),
+        })
+
+    return rows
+
+
+def _content(row: Dict[str, Any]) -> Tuple:
+    return tuple(row.get(column) for column in AVAILABILITY_CONTENT_COLUMNS)
+
+
+def diff_availability(
+    stored: List[Dict[str, Any]],
+    wanted: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, Dict[str, Any]]], List[str]]:
+    """
+    Work out the writes that turn the stored rows into the wanted ones
+
+    Returns (rows to insert, (id, changes) updates, ids to delete). A wanted
+    row carrying a stored row's id updates that row; other wanted rows keep
+    an identical stored row if one is left over. Mirrors the pairing done by
+    the save_counselor_availability RPC.
+    """
+    stored_by_id = {row["id"]: row for row in stored}
+    matched_ids = set()
+    updates: List[Tuple[str, Dict[str, Any]]] = []
+    rest: List[Dict[str, Any]] = []
+
+    for row in wanted:
+        row_id = row.get("id")
+        if row_id in stored_by_id and row_id not in matched_ids:
+            matched_ids.add(row_id)
+            current = stored_by_id[row_id]
+            changes = {
+                column: row[column] for column in AVAILABILITY_CONTENT_COLUMNS
+                if row[column] != current.get(column)
+            }
+            if changes:
+                updates.append((row_id, changes))
+        else:
+            rest.append(row)
+
+    # content -> unclaimed stored ids, so duplicates pair one to one
+    leftovers: Dict[Tuple, List[str]] = defaultdict(list)
+    for row in stored:
+        if row["id"] not in matched_ids:
+            leftovers[_content(row)].append(row["id"])
+
+    inserts: List[Dict[str, Any]] = []
+    for row in rest:
+        ids = leftovers.get(_content(row))
+        if ids:
+            matched_ids.add(ids.pop(0))
+        else:
+            inserts.append({column: row[column] for column in AVAILABILITY_CONTENT_COLUMNS})
+
+    deletes = [row["id"] for row in stored if row["id"] not in matched_ids]
+    return inserts, updates, deletes
+
+
+def save_schedule_availability(counselor_id: str, schedule_name: str, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Replace a schedule's availability with the given rows, writing only the diff
+
+    Returns {"inserted", "updated", "deleted"} row counts.
+    """
+    supabase = get_supabase_client(use_service_role=True)
+
+    try:
+        # diffed and applied in one transaction (see save_counselor_availability migration)
+        resp = supabase.rpc("save_counselor_availability", {
+            "p_counselor_id": counselor_id,
+            "p_schedule_name": schedule_name,
+            "p_rows": rows,
+        }).execute()
+        result = (resp.data or [{}])[0]
+        return {key: int(result.get(key) or 0) for key in ("inserted", "updated", "deleted")}
+    except Exception as e:
+        # only a database without the function gets the non-atomic path below
+        if not is_missing_rpc(e):
+            raise
+        print(f"save_counselor_availability is not deployed, falling back to diffed writes: {e}")
+
+    stored = supabase.table("counselor_availability").select(
+        "id, " + ", ".join(AVAILABILITY_CONTENT_COLUMNS)
+    ).eq("counselor_id", counselor_id).eq("schedule_name", schedule_name).execute()
+
+    inserts, updates, deletes = diff_availability(stored.data or [], rows)
+
+    # insert before deleting so readers never see an empty schedule
+    if inserts:
+        supabase.table("counselor_availability").insert([
+            {"counselor_id": counselor_id, "schedule_name": schedule_name, **row} for row in inserts
+        ]).execute()
+    for row_id, changes in updates:
+        supabase.table("counselor_availability").update(changes).eq("id", row_id).execute()
+    if deletes:
+        supabase.table("counselor_availability").delete().in_("id", deletes).execute()
+
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
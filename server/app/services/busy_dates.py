@@ -0,0 +1,142 @@
+"""
+Per-counselor busy-date heatmap
+Grouped booking counts over a bounded window, cached per counselor and
+dropped whenever one of the counselor's appointments is booked or changes status
+"""
+import threading
+import time as time_module
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.availability_index import get_availability_index
+from app.services.slot_service import SLOT_STEP_MINUTES, time_string_to_minutes
+from app.services.supabase_service import get_supabase_client, is_missing_rpc
+from config import Config
+
+# window used when the caller does not pass one, and the largest allowed
+DEFAULT_BUSY_WINDOW_DAYS = 90
+MAX_BUSY_WINDOW_DAYS = 366
+
+# date string -> (booked appointments, booked minutes)
+DayTotals = Dict[str, Tuple[int, int]]
+
+
+def fetch_busy_dates(counselor_id: str, start_date: date, end_date: date) -> DayTotals:
+    """Count pending/confirmed appointments per day in [start_date, end_date]"""
+    supabase = get_supabase_client(use_service_role=True)
+
+    try:
+        # grouped server-side (see get_counselor_busy_dates migration)
+        resp = supabase.rpc("get_counselor_busy_dates", {
+            "p_counselor_id": counselor_id,
+            "p_from": start_date.isoformat(),
+            "p_to": end_date.isoformat(),
+        }).execute()
+        return {
+            row["scheduled_date"]: (int(row["booked"]), int(row["booked_minutes"] or 0))
+            for row in resp.data or []
+        }
+    except Exception as e:
+        if not is_missing_rpc(e):
+            raise
+        print(f"get_counselor_busy_dates is not deployed, falling back to row query: {e}")
+
+    resp = supabase.table("appointments").select(
+        "scheduled_date, start_time, end_time"
+    ).eq("counselor_id", counselor_id).gte(
+        "scheduled_date", start_date.isoformat()
+    ).lte(
+        "scheduled_date", end_date.isoformat()
+    ).in_("status", ["pending", "confirmed"]).execute()
+
+    totals: DayTotals = {}
+    for apt in resp.data or []:
+        booked, minutes = totals.get(apt["scheduled_date"], (0, 0))
+        totals[apt["scheduled_date"]] = (
+            booked + 1,
+            minutes + time_string_to_minutes(apt["end_time"]) - time_string_to_minutes(apt["start_time"]),
+        )
+    return totals
+
+
+class _BusyEntry:
+    def __init__(self, totals: DayTotals):
+        self.totals = totals
+        self.loaded_at = time_module.monotonic()
+
+    def is_expired(self, ttl_seconds: float) -> bool:
+        return time_module.monotonic() - self.loaded_at > ttl_seconds
+
+
+_lock = threading.Lock()
+# counselor_id -> (from, to) -> entry
+_entries: Dict[str, Dict[Tuple[str, str], _BusyEntry]] = {}
+# bumped on every invalidation so a load that raced a booking is not cached
+_generations: Dict[str, int] = {}
+
+
+def _get_day_totals(counselor_id: str, start_date: date, end_date: date) -> DayTotals:
+    window = (start_date.isoformat(), end_date.isoformat())
+    entry = _entries.get(counselor_id, {}).get(window)
+    if entry is not None and not entry.is_expired(Config.BUSY_DATES_TTL):
+        return entry.totals
+
+    generation = _generations.get(counselor_id, 0)
+    totals = fetch_busy_dates(counselor_id, start_date, end_date)
+    with _lock:
+        if _generations.get(counselor_id, 0) == generation:
+            windows = _entries.setdefault(counselor_id, {})
+            # keep only a few windows per counselor (calendar views page by month)
+            if len(windows) >= 8:
+                windows.clear()
+            windows[window] = _BusyEntry(totals)
+    return totals
+
+
+def get_busy_dates(
+    counselor_id: str,
+    start_date: date,
+    end_date: date,
+    today: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Build the busy-date heatmap for a counselor
+
+    Returns per-day booking counts (`busyDates`) and, for days the counselor's
+    default schedule has availability, the remaining capacity in
+    SLOT_STEP_MINUTES blocks (`remainingCapacity`). Capacity is only
+    reported from today on.
+    """
+    today = today or date.today()
+    totals = _get_day_totals(counselor_id, start_date, end_date)
+
+    busy_dates = {d: booked for d, (booked, _) in totals.items()}
+
+    remaining: Dict[str, int] = {}
+    index = get_availability_index(counselor_id)
+    schedule = index.default_schedule
+    if schedule:
+        current = max(start_date, today)
+        while current <= end_date:
+            windows = index.windows_for_date(schedule["id"], current)
+            if windows:
+                date_str = current.isoformat()
+                available = sum(end - start for start, end in windows)
+                booked_minutes = totals.get(date_str, (0, 0))[1]
+                remaining[date_str] = max(0, available - booked_minutes) // SLOT_STEP_MINUTES
+            current += timedelta(days=1)
+
+    return {
+        "busyDates": busy_dates,
+        "remainingCapacity": remaining,
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "slotMinutes": SLOT_STEP_MINUTES,
+    }
+
+
+def invalidate_busy_dates(counselor_id: str) -> None:
+    """Drop a counselor's cached heatmap after a booking or status change"""
+    with _lock:
+        _generations[counselor_id] = _generations.get(counselor_id, 0) + 1
+        _entries.pop(counselor_id, None)
@@ -0,0 +1,391 @@
+"""
+Background Google Calendar sync for appointments
+
+Booking and status endpoints record a job in the calendar_sync_jobs outbox
+table and return immediately. Worker threads pick the job up, reconcile the
+appointment's Google Calendar events with its current state, and retry with
+exponential backoff on failure. Jobs are keyed by appointment ID, so a newer
+request for the same appointment replaces one that has not run yet.
+"""
+import os
+import queue
+import random
+import threading
+import time as time_module
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.supabase_service import get_supabase_client
+from config import Config
+
+# job statuses exposed to clients
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# actions recorded by the routes
+ACTION_CREATE = "create"
+ACTION_CONFIRM = "confirmed"
+ACTION_CANCEL = "cancelled"
+ACTION_COMPLETE = "completed"
+
+# a job stuck in "processing" this long is assumed lost (worker died)
+STALE_PROCESSING_SECONDS = 600
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def calendar_sync_configured() -> bool:
+    """Check whether Google Calendar credentials are configured"""
+    return all([Config.GOOGLE_CLIENT_ID, Config.GOOGLE_CLIENT_SECRET, Config.ENCRYPTION_KEY])
+
+
+class CalendarSyncQueue:
+    """Outbox-backed job queue with an in-process worker pool"""
+
+    def __init__(self, workers: int, max_attempts: int, retry_base_seconds: float, sweep_seconds: float):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.sweep_seconds = sweep_seconds
+
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        # pid the threads were started in; threads do not survive a fork
+        self._started_pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    # ---- producer side -------------------------------------------------
+
+    def enqueue(self, appointment_id: str, action: str) -> Optional[Dict[str, Any]]:
+        """
+        Record a sync job for an appointment and hand it to the workers
+
+        Returns the job status dict, or None if calendar sync is not configured.
+        """
+        if not calendar_sync_configured():
+            return None
+
+        supabase = get_supabase_client(use_service_role=True)
+        run_token = str(uuid.uuid4())
+        now = _now().isoformat()
+
+        # upsert keyed on appointment_id: a newer action supersedes a queued one
+        supabase.table("calendar_sync_jobs").upsert({
+            "appointment_id": appointment_id,
+            "action": action,
+            "status": STATUS_PENDING,
+            "attempts": 0,
+            "last_error": None,
+            "run_token": run_token,
+            "next_attempt_at": now,
+            "updated_at": now,
+        }, on_conflict="appointment_id").execute()
+
+        self.start()
+        self._queue.put((appointment_id, run_token))
+
+        return {"status": STATUS_PENDING, "attempts": 0}
+
+    def get_status(self, appointment_id: str) -> Optional[Dict[str, Any]]:
+        """Get the sync job status for an appointment (None if never queued)"""
+        supabase = get_supabase_client(use_service_role=True)
+        response = supabase.table("calendar_sync_jobs").select(
+            "action, status, attempts, last_error, next_attempt_at, updated_at"
+        ).eq("appointment_id", appointment_id).execute()
+
+        if not response.data:
+            return None
+
+        job = response.data[0]
+        return {
+            "action": job["action"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "lastError": job.get("last_error"),
+            "nextAttemptAt": job.get("next_attempt_at") if job["status"] == STATUS_PENDING else None,
+            "updatedAt": job.get("updated_at"),
+        }
+
+    # ---- worker side ---------------------------------------------------
+
+    def start(self) -> None:
+        """
+        Start the worker and sweeper threads in this process (idempotent)
+        Called at app startup so jobs left pending by a restart are swept
+        without waiting for a new enqueue; a forked worker starts its own.
+        """
+        if self._started_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._started_pid == os.getpid():
+                return
+            if self._started_pid is not None:
+                # inherited from the parent, whose threads did not come along
+                self._queue = queue.Queue()
+            for i in range(self.workers):
+                threading.Thread(
+                    target=self._worker_loop, name=f"calendar-sync-{i}", daemon=True
+                ).start()
+            threading.Thread(
+                target=self._sweeper_loop, name="calendar-sync-sweeper", daemon=True
+            ).start()
+            self._started_pid = os.getpid()
+
+    def _worker_loop(self) -> None:
+        while True:
+            appointment_id, run_token = self._queue.get()
+            try:
+                self._run_job(appointment_id, run_token)
+            except Exception as e:
+                print(f"Calendar sync worker error for appointment {appointment_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _sweeper_loop(self) -> None:
+        """Re-queue due retries and jobs left behind by restarts or crashed workers"""
+        while True:
+            time_module.sleep(self.sweep_seconds)
+            try:
+                supabase = get_supabase_client(use_service_role=True)
+                now = _now()
+                stale = (now - timedelta(seconds=STALE_PROCESSING_SECONDS)).isoformat()
+                due = supabase.table("calendar_sync_jobs").select(
+                    "appointment_id, run_token"
+                ).or_(
+                    f"and(status.eq.{STATUS_PENDING},next_attempt_at.lte.\"{now.isoformat()}\"),"
+                    f"and(status.eq.{STATUS_PROCESSING},updated_at.lt.\"{stale}\")"
+                ).limit(100).execute()
+
+                for job in due.data or []:
+                    self._queue.put((job["appointment_id"], job["run_token"]))
+            except Exception as e:
+                print(f"Calendar sync sweeper error: {e}")
+
+    def _claim(self, appointment_id: str, run_token: str) -> Optional[Dict[str, Any]]:
+        """Atomically take ownership of a job; fails if it was superseded or taken"""
+        supabase = get_supabase_client(use_service_role=True)
+        response = supabase.table("calendar_sync_jobs").update({
+            "status": STATUS_PROCESSING,
+            "run_token": str(uuid.uuid4()),
+            "updated_at": _now().isoformat(),
+        }).eq("appointment_id", appointment_id).eq(
+            "run_token", run_token
+        ).in_("status", [STATUS_PENDING, STATUS_PROCESSING]).execute()
+
+        return response.data[0] if response.data else None
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait after failed attempt number `attempts`: exponential backoff plus jitter"""
+        delay = self.retry_base_seconds * (2 ** (attempts - 1))
+        return delay + random.uniform(0, self.retry_base_seconds)
+
+    def _run_job(self, appointment_id: str, run_token: str) -> None:
+        job = self._claim(appointment_id, run_token)
+        if not job:
+            return
+
+        supabase = get_supabase_client(use_service_role=True)
+        attempts = job["attempts"] + 1
+        final_attempt = attempts >= self.max_attempts
+
+        try:
+            errors = sync_appointment_calendar(appointment_id, job["action"], final_attempt)
+        except Exception as e:
+            errors = [f"{type(e).__name__}: {e}"]
+
+        update: Dict[str, Any] = {"attempts": attempts, "updated_at": _now().isoformat()}
+
+        if not errors:
+            update.update({"status": STATUS_DONE, "last_error": None})
+        elif final_attempt:
+            update.update({"status": STATUS_FAILED, "last_error": "; ".join(errors)})
+            print(f"Calendar sync gave up for appointment {appointment_id}: {update['last_error']}")
+        else:
+            # the sweeper re-queues the job when it comes due
+            update.update({
+                "status": STATUS_PENDING,
+                "last_error": "; ".join(errors),
+                "next_attempt_at": (_now() + timedelta(seconds=self.retry_delay(attempts))).isoformat(),
+            })
+
+        # only record the outcome if no newer request replaced this job meanwhile
+        supabase.table("calendar_sync_jobs").update(update).eq(
+            "appointment_id", appointment_id
+        ).eq("run_token", job["run_token"]).execute()
+
+
+def sync_appointment_calendar(appointment_id: str, action: str, final_attempt: bool = False) -> List[str]:
+    """
+    Bring an appointment's Google Calendar events in line with its state
+
+    Safe to run repeatedly: events are only created when their stored ID is
+    missing, and IDs are cleared once the event is deleted. Returns a list of
+    errors (empty on success).
+
+    A confirm job also creates events that are missing for connected users,
+    because it replaces a create job that had not run yet. Those events get
+    the "(Confirmed)" title the confirm update gives existing ones.
+    """
+    from app.services.google_calendar_service import get_calendar_service
+
+    supabase = get_supabase_client(use_service_role=True)
+    calendar_service = get_calendar_service()
+
+    apt_resp = supabase.table("appointments").select(
+        "id, student_id, counselor_id, scheduled_date, start_time, end_time, status, "
+        "student_notes, location_details, google_event_id_student, google_event_id_counselor, "
+        "event_types(name)"
+    ).eq("id", appointment_id).execute()
+
+    if not apt_resp.data:
+        # appointment no longer exists, nothing to sync
+        return []
+
+    apt = apt_resp.data[0]
+    student_id = apt["student_id"]
+    counselor_id = apt["counselor_id"]
+    google_event_id_student = apt.get("google_event_id_student")
+    google_event_id_counselor = apt.get("google_event_id_counselor")
+    event_type_name = (apt.get("event_types") or {}).get("name") or "Appointment"
+
+    # Build datetime strings for calendar
+    start_datetime = f"{apt['scheduled_date']}T{apt['start_time'][:5]}:00"
+    end_datetime = f"{apt['scheduled_date']}T{apt['end_time'][:5]}:00"
+
+    errors: List[str] = []
+    update_data: Dict[str, Any] = {}
+
+    # One tokens query resolves connection status and credentials for both users
+    credentials = calendar_service.get_connected_credentials([student_id, counselor_id])
+
+    if apt["status"] in ("cancelled", "completed"):
+        # Delete calendar events
+        for owner_id, event_id, column, label in (
+            (student_id, google_event_id_student, "google_event_id_student", "student"),
+            (counselor_id, google_event_id_counselor, "google_event_id_counselor", "counselor"),
+        ):
+            if not event_id:
+                continue
+            if owner_id not in credentials or \
+                    calendar_service.delete_calendar_event(owner_id, event_id, credentials=credentials[owner_id]):
+                update_data[column] = None
+            else:
+                errors.append(f"Failed to delete {label} calendar event: {event_id}")
+                # Clear the ID once retries are exhausted so it is not retried forever
+                if final_attempt:
+                    update_data[column] = None
+
+    elif apt["status"] in ("pending", "confirmed"):
+        missing_student = not google_event_id_student and student_id in credentials
+        missing_counselor = not google_event_id_counselor and counselor_id in credentials
+
+        if missing_student or missing_counselor:
+            # Get student and counselor info for calendar
+            student_resp = supabase.table("students").select(
+                "given_name, family_name"
+            ).eq("auth_user_id", student_id).execute()
+            student_name = f"{student_resp.data[0]['given_name']} {student_resp.data[0]['family_name']}" if student_resp.data else "Student"
+
+            counselor_resp = supabase.table("profiles").select(
+                "first_name"
+            ).eq("id", counselor_id).execute()
+            counselor_name = counselor_resp.data[0].get("first_name", "Counselor") if counselor_resp.data else "Counselor"
+
+            # Get user emails for attendees
+            attendees = []
+            for uid in (student_id, counselor_id):
+                try:
+                    auth_user = supabase.auth.admin.get_user_by_id(uid)
+                    if auth_user and auth_user.user and auth_user.user.email:
+                        attendees.append(auth_user.user.email)
+                except Exception:
+                    pass
+
+            student_notes = apt.get("student_notes")
+            location = apt.get("location_details") or ""
+            confirmed_summary = f"{event_type_name} (Confirmed)" if action == ACTION_CONFIRM else None
+
+            if missing_student:
+                event_id = calendar_service.create_calendar_event(
+                    user_id=student_id,
+                    summary=confirmed_summary or f"{event_type_name} with {counselor_name}",
+                    description=student_notes or f"Appointment: {event_type_name}",
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    attendees=attendees,
+                    location=location,
+                    credentials=credentials[student_id]
+                )
+                if event_id:
+                    update_data["google_event_id_student"] = event_id
+                else:
+                    errors.append("Failed to create student calendar event")
+
+            if missing_counselor:
+                event_id = calendar_service.create_calendar_event(
+                    user_id=counselor_id,
+                    summary=confirmed_summary or f"{event_type_name} - {student_name}",
+                    description=student_notes or f"Appointment with {student_name}",
+                    start_datetime=start_datetime,
+                    end_datetime=end_datetime,
+                    attendees=attendees,
+                    location=location,
+                    credentials=credentials[counselor_id]
+                )
+                if event_id:
+                    update_data["google_event_id_counselor"] = event_id
+                else:
+                    errors.append("Failed to create counselor calendar event")
+
+        if action == ACTION_CONFIRM:
+            # Update existing calendar events (add status to title); events
+            # created above already have it
+            for owner_id, event_id, label in (
+                (student_id, google_event_id_student, "student"),
+                (counselor_id, google_event_id_counselor, "counselor"),
+            ):
+                if event_id and owner_id in credentials:
+                    if not calendar_service.update_calendar_event(
+                        user_id=owner_id,
+                        event_id=event_id,
+                        summary=f"{event_type_name} (Confirmed)",
+                        start_datetime=start_datetime,
+                        end_datetime=end_datetime,
+                        credentials=credentials[owner_id]
+                    ):
+                        errors.append(f"Failed to update {label} calendar event: {event_id}")
+
+    # Record event IDs and last sync time
+    update_data["last_calendar_sync_at"] = _now().isoformat()
+    supabase.table("appointments").update(update_data).eq("id", appointment_id).execute()
+
+    return errors
+
+
+# Singleton instance
+_sync_queue = None
+_sync_queue_lock = threading.Lock()
+
+def get_calendar_sync_queue() -> CalendarSyncQueue:
+    """Get singleton calendar sync queue for this process"""
+    global _sync_queue
+    if _sync_queue is None:
+        with _sync_queue_lock:
+            if _sync_queue is None:
+                _sync_queue = CalendarSyncQueue(
+                    workers=Config.CALENDAR_SYNC_WORKERS,
+                    max_attempts=Config.CALENDAR_SYNC_MAX_ATTEMPTS,
+                    retry_base_seconds=Config.CALENDAR_SYNC_RETRY_BASE_SECONDS,
+                    sweep_seconds=Config.CALENDAR_SYNC_SWEEP_SECONDS,
+                )
+    return _sync_queue
+
+
+def start_calendar_sync() -> None:
+    """Start this process's sync workers if calendar sync is configured"""
+    if calendar_sync_configured():
+        get_calendar_sync_queue().start()
@@ -2,18 +2,43 @@
 Google Calendar service for creating, updating, and deleting calendar events
 """
 import os
+import json
+import threading
+import time as time_module
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import httplib2
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 from cryptography.fernet import Fernet
 from app.services.supabase_service import get_supabase_client
+from app.utils.request_metrics import InstrumentedHttp, google_target, track_call
 from config import Config
 
 
+def _utcnow_naive() -> datetime:
+    """Current UTC time as a naive datetime (google-auth's expiry convention)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _parse_expiry(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored token_expires_at into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        expiry = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
+
+
 class GoogleCalendarService:
     """Service for managing Google Calendar integration"""
     
@@ -32,6 +57,43 @@ class GoogleCalendarService:
             raise ValueError("Google Calendar credentials not configured")
         
         self.cipher = Fernet(self.encryption_key.encode())
+        
+        # Calendar API resource, built once from the discovery document
+        self._service = None
+        self._service_lock = threading.Lock()
+        # httplib2.Http is not thread-safe, so each thread keeps its own
+        # (and its own keep-alive connections to Google)
+        self._http_local = threading.local()
+        
+        # Decrypted per-user credentials, kept until shortly before expiry
+        self._creds_cache: Dict[str, Credentials] = {}
+        self._creds_last_used: Dict[str, float] = {}
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._creds_lock = threading.Lock()
+        self._refresher_started = False
+    
+    def _get_service(self):
+        """
+        Get the shared Calendar API resource
+        Credentials are not bound here, they are passed per request via execute(http=...)
+        """
+        if self._service is None:
+            with self._service_lock:
+                if self._service is None:
+                    document = get_static_doc('calendar', 'v3')
+                    if document:
+                        self._service = build_from_document(json.loads(document), http=httplib2.Http())
+                    else:
+                        self._service = build('calendar', 'v3', http=httplib2.Http(), cache_discovery=False)
+        return self._service
+    
+    def _authorized_http(self, creds: Credentials) -> InstrumentedHttp:
+        """Bind credentials to this thread's pooled HTTP transport, timed per request"""
+        http = getattr(self._http_local, "http", None)
+        if http is None:
+            http = httplib2.Http(timeout=30)
+            self._http_local.http = http
+        return InstrumentedHttp(AuthorizedHttp(creds, http=http))
     
     def encrypt_token(self, token: str) -> str:
         """Encrypt a token for storage"""
@@ -44,8 +106,13 @@ class GoogleCalendarService:
     def get_user_credentials(self, user_id: str) -> Optional[Credentials]:
         """
         Get valid Google OAuth credentials for a user
-        Refreshes access token if needed
+        Served from the in-process cache while the access token is fresh;
+        otherwise loaded from the database and refreshed if needed
         """
+        creds = self._get_cached_credentials(user_id)
+        if creds is not None:
+            return creds
+        
         supabase = get_supabase_client(use_service_role=True)
         
         # Get user's tokens
@@ -60,7 +127,10 @@ class GoogleCalendarService:
             # No token record found
             return None
         
-        tokens = response.data
+        return self._credentials_from_row(user_id, response.data)
+    
+    def _credentials_from_row(self, user_id: str, tokens: Dict[str, Any]) -> Optional[Credentials]:
+        """Build, refresh if needed, and cache credentials from a google_calendar_tokens row"""
         refresh_token = self.decrypt_token(tokens["refresh_token"])
         
         # Build credentials
@@ -69,34 +139,153 @@ class GoogleCalendarService:
             refresh_token=refresh_token,
             token_uri="https://oauth2.googleapis.com/token",
             client_id=self.client_id,
-            client_secret=self.client_secret
+            client_secret=self.client_secret,
+            expiry=_parse_expiry(tokens.get("token_expires_at"))
         )
         
-        # Refresh if expired or missing
-        if not creds.valid:
+        # Refresh if expired, missing, or about to expire
+        if not self._is_fresh(creds):
+            if not self._refresh_credentials(user_id, creds):
+                return None
+        
+        with self._creds_lock:
+            self._creds_cache[user_id] = creds
+            self._creds_last_used[user_id] = time_module.monotonic()
+        self._ensure_refresher()
+        
+        return creds
+    
+    def _is_fresh(self, creds: Credentials, margin: Optional[float] = None) -> bool:
+        """Check the access token is present and valid for at least `margin` seconds"""
+        if not creds.token or not creds.expiry:
+            # without a known expiry google-auth treats the token as valid;
+            # keep that behaviour but never for a missing token
+            return bool(creds.token) and creds.expiry is None
+        margin = Config.GOOGLE_CREDENTIALS_REFRESH_MARGIN if margin is None else margin
+        remaining = (creds.expiry - _utcnow_naive()).total_seconds()
+        return remaining > margin
+    
+    def _refresh_credentials(self, user_id: str, creds: Credentials) -> bool:
+        """Refresh an access token and write it back only if it changed"""
+        lock = self._refresh_lock_for(user_id)
+        with lock:
+            previous_token = creds.token
             try:
-                creds.refresh(Request())
-                
+                with track_call("google", "POST", google_target(creds.token_uri)):
+                    creds.refresh(Request())
+            except Exception as e:
+                print(f"Error refreshing token for user {user_id}: {e}")
+                self.invalidate_credentials(user_id)
+                return False
+            
+            if creds.token != previous_token:
                 # Update stored access token
                 # creds.expiry is already a datetime, not a timedelta
                 expires_at = creds.expiry
-                supabase.table("google_calendar_tokens").update({
-                    "access_token": creds.token,
-                    "token_expires_at": expires_at.isoformat() if expires_at else None
-                }).eq("user_id", user_id).execute()
-            except Exception as e:
-                print(f"Error refreshing token for user {user_id}: {e}")
+                try:
+                    supabase = get_supabase_client(use_service_role=True)
+                    supabase.table("google_calendar_tokens").update({
+                        "access_token": creds.token,
+                        "token_expires_at": expires_at.isoformat() if expires_at else None
+                    }).eq("user_id", user_id).execute()
+                except Exception as e:
+                    # the fresh token is still usable from the cache
+                    print(f"Error storing refreshed token for user {user_id}: {e}")
+            return True
+    
+    def _refresh_lock_for(self, user_id: str) -> threading.Lock:
+        with self._creds_lock:
+            return self._refresh_locks.setdefault(user_id, threading.Lock())
+    
+    def _get_cached_credentials(self, user_id: str) -> Optional[Credentials]:
+        """Get cached credentials if the access token is still fresh"""
+        with self._creds_lock:
+            creds = self._creds_cache.get(user_id)
+            if creds is None:
                 return None
+            self._creds_last_used[user_id] = time_module.monotonic()
         
-        return creds
+        if self._is_fresh(creds):
+            return creds
+        
+        # close to expiry: refresh in place instead of rereading the database
+        return creds if self._refresh_credentials(user_id, creds) else None
     
-    def user_has_calendar_connected(self, user_id: str) -> bool:
-        """Check if user has connected their Google Calendar"""
+    def invalidate_credentials(self, user_id: str) -> None:
+        """Forget cached credentials for a user (token stored, revoked or broken)"""
+        with self._creds_lock:
+            self._creds_cache.pop(user_id, None)
+            self._creds_last_used.pop(user_id, None)
+    
+    def _ensure_refresher(self) -> None:
+        """Start the background refresher thread on first use"""
+        if self._refresher_started:
+            return
+        with self._creds_lock:
+            if self._refresher_started:
+                return
+            threading.Thread(
+                target=self._refresher_loop, name="google-credentials-refresher", daemon=True
+            ).start()
+            self._refresher_started = True
+    
+    def _refresher_loop(self) -> None:
+        """
+        Renew access tokens of recently active users before they expire,
+        so calendar calls rarely wait on a token refresh. Idle users are
+        dropped from the cache instead of being refreshed.
+        """
+        while True:
+            time_module.sleep(Config.GOOGLE_CREDENTIALS_REFRESH_INTERVAL)
+            now = time_module.monotonic()
+            with self._creds_lock:
+                entries = list(self._creds_cache.items())
+                last_used = dict(self._creds_last_used)
+            
+            for user_id, creds in entries:
+                try:
+                    if now - last_used.get(user_id, 0) > Config.GOOGLE_CREDENTIALS_IDLE_TTL:
+                        self.invalidate_credentials(user_id)
+                        continue
+                    # refresh ahead of the request-path margin by one interval
+                    margin = Config.GOOGLE_CREDENTIALS_REFRESH_MARGIN + Config.GOOGLE_CREDENTIALS_REFRESH_INTERVAL
+                    if not self._is_fresh(creds, margin=margin):
+                        self._refresh_credentials(user_id, creds)
+                except Exception as e:
+                    print(f"Background token refresh error for user {user_id}: {e}")
+    
+    def get_calendar_connections(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve calendar connection status for several users in one query
+        Returns {user_id: token row} for users with sync enabled
+        """
+        user_ids = [uid for uid in dict.fromkeys(user_ids) if uid]
+        if not user_ids:
+            return {}
+        
         supabase = get_supabase_client(use_service_role=True)
         response = supabase.table("google_calendar_tokens").select(
-            "id, sync_enabled"
-        ).eq("user_id", user_id).eq("sync_enabled", True).execute()
-        return len(response.data) > 0
+            "user_id, sync_enabled, refresh_token, access_token, token_expires_at"
+        ).in_("user_id", user_ids).eq("sync_enabled", True).execute()
+        
+        return {row["user_id"]: row for row in response.data or []}
+    
+    def get_connected_credentials(self, user_ids: List[str]) -> Dict[str, Credentials]:
+        """
+        Get credentials for every connected user among user_ids
+        One tokens query covers both the connection check and credential lookup;
+        users who are not connected (or whose refresh fails) are omitted
+        """
+        connected = {}
+        for user_id, row in self.get_calendar_connections(user_ids).items():
+            creds = self._get_cached_credentials(user_id) or self._credentials_from_row(user_id, row)
+            if creds:
+                connected[user_id] = creds
+        return connected
+    
+    def user_has_calendar_connected(self, user_id: str) -> bool:
+        """Check if user has connected their Google Calendar"""
+        return user_id in self.get_calendar_connections([user_id])
     
     def create_calendar_event(
         self,
@@ -107,18 +296,21 @@ class GoogleCalendarService:
         end_datetime: str,    # ISO format: "2024-01-15T11:00:00"
         timezone: str = "Asia/Manila",
         attendees: Optional[list] = None,
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        credentials: Optional[Credentials] = None
     ) -> Optional[str]:
         """
         Create a Google Calendar event
         Returns the event ID if successful, None otherwise
+        Pass `credentials` (e.g. from get_connected_credentials) to skip the lookup
         """
-        creds = self.get_user_credentials(user_id)
+        creds = credentials or self.get_user_credentials(user_id)
         if not creds:
             return None
         
         try:
-            service = build('calendar', 'v3', credentials=creds)
+            service = self._get_service()
+            http = self._authorized_http(creds)
             
             event = {
                 'summary': summary,
@@ -142,7 +334,7 @@ class GoogleCalendarService:
             created_event = service.events().insert(
                 calendarId='primary',
                 body=event
-            ).execute()
+            ).execute(http=http)
             
             return created_event['id']
         
@@ -163,21 +355,23 @@ class GoogleCalendarService:
         end_datetime: Optional[str] = None,
         timezone: str = "Asia/Manila",
         attendees: Optional[list] = None,
-        location: Optional[str] = None
+        location: Optional[str] = None,
+        credentials: Optional[Credentials] = None
     ) -> bool:
         """Update an existing Google Calendar event"""
-        creds = self.get_user_credentials(user_id)
+        creds = credentials or self.get_user_credentials(user_id)
         if not creds:
             return False
         
         try:
-            service = build('calendar', 'v3', credentials=creds)
+            service = self._get_service()
+            http = self._authorized_http(creds)
             
             # Get existing event
             event = service.events().get(
                 calendarId='primary',
                 eventId=event_id
-            ).execute()
+            ).execute(http=http)
             
             # Update fields
             if summary:
@@ -203,7 +397,7 @@ class GoogleCalendarService:
                 calendarId='primary',
                 eventId=event_id,
                 body=event
-            ).execute()
+            ).execute(http=http)
             
             return True
         
@@ -214,19 +408,24 @@ class GoogleCalendarService:
             print(f"Unexpected error updating calendar event: {e}")
             return False
     
-    def delete_calendar_event(self, user_id: str, event_id: str) -> bool:
+    def delete_calendar_event(
+        self,
+        user_id: str,
+        event_id: str,
+        credentials: Optional[Credentials] = None
+    ) -> bool:
         """Delete a Google Calendar event"""
-        creds = self.get_user_credentials(user_id)
+        creds = credentials or self.get_user_credentials(user_id)
         if not creds:
             print(f"No credentials found for user {user_id}, cannot delete event {event_id}")
             return False
         
         try:
-            service = build('calendar', 'v3', credentials=creds)
+            service = self._get_service()
             service.events().delete(
                 calendarId='primary',
                 eventId=event_id
-            ).execute()
+            ).execute(http=self._authorized_http(creds))
             print(f"Successfully deleted calendar event {event_id} for user {user_id}")
             return True
         
@@ -271,6 +470,8 @@ class GoogleCalendarService:
             on_conflict="user_id"
         ).execute()
         
+        self.invalidate_credentials(user_id)
+        
         return len(response.data) > 0
     
     def revoke_tokens(self, user_id: str) -> bool:
@@ -307,6 +508,7 @@ class GoogleCalendarService:
         
         # Delete from database
         supabase.table("google_calendar_tokens").delete().eq("user_id", user_id).execute()
+        self.invalidate_credentials(user_id)
         return True
 
 
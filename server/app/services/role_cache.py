@@ -0,0 +1,78 @@
+"""
+Short-TTL cache of user roles and counselor course assignments
+Backs the request-scoped principal built by require_auth
+"""
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.services.supabase_service import get_supabase_client
+from config import Config
+
+
+class RoleInfo(NamedTuple):
+    """A user's role and, for counselors, the courses assigned to them"""
+    role: Optional[str]
+    courses: Tuple[str, ...]
+
+
+_lock = threading.Lock()
+# user_id -> (role info, loaded_at)
+_entries: Dict[str, Tuple[RoleInfo, float]] = {}
+
+
+def _load_role_info(user_id: str) -> RoleInfo:
+    supabase = get_supabase_client(use_service_role=True)
+
+    profile = (
+        supabase.table("profiles")
+        .select("role")
+        .eq("id", user_id)
+        .limit(1)
+        .execute()
+    )
+    role = profile.data[0].get("role") if profile.data else None
+
+    courses: Tuple[str, ...] = ()
+    if role == "counselor":
+        course_response = (
+            supabase.table("counselor_course_filters")
+            .select("course")
+            .eq("auth_user_id", user_id)
+            .execute()
+        )
+        courses = tuple(row["course"] for row in course_response.data or [])
+
+    return RoleInfo(role, courses)
+
+
+def get_role_info(user_id: str) -> RoleInfo:
+    """
+    Get a user's role and assigned courses
+
+    Entries live for ROLE_CACHE_TTL seconds; call invalidate_role_info() after
+    changing a user's role or course assignments in this process.
+    """
+    now = time.monotonic()
+    entry = _entries.get(user_id)
+    if entry is not None and now - entry[1] <= Config.ROLE_CACHE_TTL:
+        return entry[0]
+
+    info = _load_role_info(user_id)
+    with _lock:
+        _entries[user_id] = (info, now)
+        # drop expired entries so the cache stays bounded by active users
+        if len(_entries) > Config.ROLE_CACHE_MAX_ENTRIES:
+            cutoff = now - Config.ROLE_CACHE_TTL
+            for key in [k for k, (_, loaded_at) in _entries.items() if loaded_at < cutoff]:
+                del _entries[key]
+    return info
+
+
+def invalidate_role_info(user_id: Optional[str] = None) -> None:
+    """Forget cached role info for one user, or everyone when user_id is None"""
+    with _lock:
+        if user_id is None:
+            _entries.clear()
+        else:
+            _entries.pop(user_id, None)
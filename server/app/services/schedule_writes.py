@@ -0,0 +1,75 @@
+"""
+Schedule creation, duplication and updates
+Copies and renames run set-based in the database, with availability
+addressed by schedule ID
+"""
+from typing import Any, Dict, Optional
+
+from app.services.supabase_service import get_supabase_client
+
+SCHEDULE_NAME_TAKEN = "A schedule with this name already exists"
+
+_UNIQUE_VIOLATION = "23505"
+
+
+def _rpc_schedule(name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Call a schedule RPC; a taken name raises ValueError, other failures propagate"""
+    supabase = get_supabase_client(use_service_role=True)
+    try:
+        resp = supabase.rpc(name, params).execute()
+    except Exception as e:
+        if getattr(e, "code", None) == _UNIQUE_VIOLATION:
+            raise ValueError(SCHEDULE_NAME_TAKEN)
+        raise
+    return resp.data[0] if resp.data else None
+
+
+def create_counselor_schedule(
+    counselor_id: str,
+    name: str,
+    is_default: bool = False,
+    booking_buffer: Optional[int] = None,
+    source_id: Optional[str] = None,
+    source_name: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Create a schedule, copying the availability of a source schedule (by ID,
+    else by name) or seeding the default weekly hours
+
+    Returns the new counselor_schedules row, or None when the source does not
+    exist. Raises ValueError when the name is taken. The booking buffer
+    defaults to the source's.
+    """
+    # one round trip (see create_counselor_schedule migration)
+    return _rpc_schedule("create_counselor_schedule", {
+        "p_counselor_id": counselor_id,
+        "p_name": name,
+        "p_is_default": is_default,
+        "p_booking_buffer": booking_buffer,
+        "p_source_id": source_id,
+        "p_source_name": source_name,
+    })
+
+
+def update_counselor_schedule(
+    counselor_id: str,
+    schedule_id: str,
+    name: Optional[str] = None,
+    is_default: Optional[bool] = None,
+    booking_buffer: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Rename a schedule and/or change its default flag or booking buffer
+    (None = unchanged), relabelling its availability on rename
+
+    Returns the updated row, or None when the schedule does not exist.
+    Raises ValueError when the name is taken.
+    """
+    # one round trip (see update_counselor_schedule migration)
+    return _rpc_schedule("update_counselor_schedule", {
+        "p_counselor_id": counselor_id,
+        "p_schedule_id": schedule_id,
+        "p_name": name,
+        "p_is_default": is_default,
+        "p_booking_buffer": booking_buffer,
+    })
@@ -0,0 +1,199 @@
+"""
+Slot engine for appointment booking
+Computes free slots for one or many days from availability windows and bookings
+"""
+from bisect import bisect_right
+from datetime import datetime, date, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# candidate slots start every SLOT_STEP_MINUTES inside an availability window
+SLOT_STEP_MINUTES = 30
+
+# longest range a single request may ask for
+MAX_SLOT_RANGE_DAYS = 62
+
+Interval = Tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def time_to_minutes(t: time) -> int:
+    """Convert time to minutes from midnight"""
+    return t.hour * 60 + t.minute
+
+
+def minutes_to_time(minutes: int) -> time:
+    """Convert minutes from midnight to time"""
+    return time(hour=minutes // 60, minute=minutes % 60)
+
+
+def format_minutes(minutes: int) -> str:
+    """Minutes from midnight as HH:MM; 1440 is "24:00", Postgres' end of day"""
+    if not 0 <= minutes <= MINUTES_PER_DAY:
+        raise ValueError(f"Time out of range: {minutes} minutes")
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_time_string(time_str: str) -> time:
+    """Parse time string (HH:MM or HH:MM:SS) to time object"""
+    if len(time_str) == 5:
+        return datetime.strptime(time_str, "%H:%M").time()
+    return datetime.strptime(time_str, "%H:%M:%S").time()
+
+
+def format_time_12hr(t: time) -> str:
+    """Format time as 12-hour string"""
+    return t.strftime("%I:%M %p").lstrip("0")
+
+
+def time_string_to_minutes(time_str: str) -> int:
+    """Parse HH:MM or HH:MM:SS straight to minutes from midnight"""
+    return int(time_str[0:2]) * 60 + int(time_str[3:5])
+
+
+def to_db_day_of_week(d: date) -> int:
+    """Convert a date to our day_of_week format (0=Sunday, 6=Saturday)"""
+    return (d.weekday() + 1) % 7
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Sort and merge overlapping [start, end) intervals"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compute_free_slots(
+    windows: List[Interval],
+    booked: List[Interval],
+    duration: int,
+    buffer_before: int = 0,
+    buffer_after: int = 0,
+    not_after_minute: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    Compute free slots for a single day
+
+    Candidates start every SLOT_STEP_MINUTES in each window. A candidate is
+    free when [start - buffer_before, start + duration + buffer_after) does not
+    overlap any booking. Bookings are merged once so each check is a binary
+    search instead of a scan over every booking. Slots starting at or before
+    `not_after_minute` (booking notice cutoff for the first day) are dropped.
+    """
+    merged = merge_intervals(booked)
+    booked_starts = [start for start, _ in merged]
+    booked_ends = [end for _, end in merged]
+
+    slots = []
+    for window_start, window_end in sorted(windows):
+        current = window_start
+        while current + duration <= window_end:
+            if not_after_minute is None or current > not_after_minute:
+                span_start = current - buffer_before
+                span_end = current + duration + buffer_after
+
+                # first booking that ends after this span starts
+                idx = bisect_right(booked_ends, span_start)
+                if idx == len(merged) or booked_starts[idx] >= span_end:
+                    slot_start = minutes_to_time(current)
+                    slots.append({
+                        "startTime": slot_start.strftime("%H:%M"),
+                        # a window may end at 24:00, which time() cannot hold
+                        "endTime": format_minutes(current + duration),
+                        "displayTime": format_time_12hr(slot_start),
+                    })
+
+            current += SLOT_STEP_MINUTES
+
+    return slots
+
+
+def rows_to_windows(rows: List[Dict[str, Any]]) -> List[Interval]:
+    """Convert counselor_availability rows to minute windows (skips unavailable rows)"""
+    return [
+        (time_string_to_minutes(row["start_time"]), time_string_to_minutes(row["end_time"]))
+        for row in rows
+        if row.get("start_time") and row.get("end_time")
+    ]
+
+
+def compute_range_slots(
+    start_date: date,
+    end_date: date,
+    weekly_windows: Dict[int, List[Interval]],
+    override_windows: Dict[str, List[Interval]],
+    bookings: List[Dict[str, Any]],
+    event_type_id: str,
+    duration: int,
+    buffer_before: int,
+    buffer_after: int,
+    max_per_day: Optional[int],
+    booking_buffer_hours: int,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compute slots for every day in [start_date, end_date]
+
+    Args:
+        weekly_windows: day_of_week -> windows from weekly rows
+        override_windows: YYYY-MM-DD -> windows from override rows (an empty
+                          list means the date is overridden as unavailable)
+        bookings: pending/confirmed appointments in the range
+
+    Returns one entry per day with `availableSlots` and, when the day has no
+    slots for a known reason, a `message`.
+    """
+    now = now or datetime.now()
+    min_booking_time = now + timedelta(hours=booking_buffer_hours)
+    min_booking_date = min_booking_time.date()
+    min_booking_minute = min_booking_time.hour * 60 + min_booking_time.minute
+
+    # group bookings by date once for the whole range
+    booked_by_date: Dict[str, List[Interval]] = {}
+    event_type_counts: Dict[str, int] = {}
+    for apt in bookings:
+        d = apt["scheduled_date"]
+        booked_by_date.setdefault(d, []).append(
+            (time_string_to_minutes(apt["start_time"]), time_string_to_minutes(apt["end_time"]))
+        )
+        if apt.get("event_type_id") == event_type_id:
+            event_type_counts[d] = event_type_counts.get(d, 0) + 1
+
+    days = []
+    current = start_date
+    while current <= end_date:
+        date_str = current.isoformat()
+        day: Dict[str, Any] = {"date": date_str, "availableSlots": []}
+        days.append(day)
+
+        if current < min_booking_date:
+            day["message"] = f"Appointments must be booked at least {booking_buffer_hours} hours in advance"
+        else:
+            # an override for the date replaces the weekly schedule
+            if date_str in override_windows:
+                windows = override_windows[date_str]
+            else:
+                windows = weekly_windows.get(to_db_day_of_week(current), [])
+
+            if not windows:
+                day["message"] = "Counselor is not available on this date"
+            elif max_per_day and event_type_counts.get(date_str, 0) >= max_per_day:
+                day["message"] = "Maximum bookings reached for this event type today"
+            else:
+                day["availableSlots"] = compute_free_slots(
+                    windows,
+                    booked_by_date.get(date_str, []),
+                    duration,
+                    buffer_before,
+                    buffer_after,
+                    not_after_minute=min_booking_minute if current == min_booking_date else None,
+                )
+
+        current += timedelta(days=1)
+
+    return days
@@ -0,0 +1,145 @@
+"""
+Streaming export of student profiles for counselors
+Pages through students in keyset order and writes CSV or Parquet chunk by
+chunk, so memory use does not grow with the size of the cohort
+"""
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List
+
+from app.models.student import SECTION_PARTS, records_to_form
+from app.services.supabase_service import get_supabase_client
+
+# students rows fetched (and written) per chunk
+EXPORT_CHUNK_SIZE = 500
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# identity columns written before the form fields
+_ID_COLUMNS = {"auth_user_id": "studentAuthId"}
+
+FORM_COLUMNS: List[str] = list(dict.fromkeys(
+    f.column for section_part in SECTION_PARTS.values() for f in section_part.fields
+))
+FORM_KEYS: List[str] = [f.form_key for section_part in SECTION_PARTS.values() for f in section_part.fields]
+EXPORT_HEADER: List[str] = list(_ID_COLUMNS.values()) + FORM_KEYS
+
+_SELECT = ", ".join(["id", *_ID_COLUMNS, *FORM_COLUMNS])
+
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow dependency is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iter_student_chunks(courses: Iterable[str], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """Yield students in the given courses, converted to form format, chunk by chunk"""
+    courses = list(courses)
+    if not courses:
+        return
+
+    supabase = get_supabase_client(use_service_role=True)
+    last_id = None
+    while True:
+        query = supabase.table("students").select(_SELECT).in_("course", courses)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(chunk_size).execute().data or []
+        if not rows:
+            return
+
+        forms = records_to_form(rows)
+        for row, form in zip(rows, forms):
+            for column, key in _ID_COLUMNS.items():
+                form[key] = row.get(column)
+        yield forms
+
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def _cell(value: Any) -> Any:
+    """Flatten multi-select lists so every cell is a scalar"""
+    if isinstance(value, list):
+        return "; ".join(str(v) for v in value)
+    return value
+
+
+def _text_cell(value: Any) -> Any:
+    value = _cell(value)
+    return None if value is None else str(value)
+
+
+def stream_csv(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[str]:
+    """Write form rows as CSV, one yielded string per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    yield buffer.getvalue()
+
+    for forms in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for form in forms:
+            writer.writerow([_cell(form.get(key)) for key in EXPORT_HEADER])
+        yield buffer.getvalue()
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # parquet footers store absolute offsets, so report the total written
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def stream_parquet(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Write form rows as Parquet, one row group per chunk (requires pyarrow)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(key, pa.string()) for key in EXPORT_HEADER])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for forms in chunks:
+            columns = {key: [_text_cell(form.get(key)) for form in forms] for key in EXPORT_HEADER}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,116 @@
+"""
+Process-level map between a student's id_number, students.id and auth_user_id
+Warmed in bulk from a counselor's roster and invalidated on profile saves
+"""
+import threading
+import time as time_module
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from app.services.student_roster import get_student_roster
+from app.services.supabase_service import get_supabase_client
+from config import Config
+
+
+class StudentIds(NamedTuple):
+    """The three identifiers of one student"""
+    student_id: str
+    id_number: Optional[str]
+    auth_user_id: Optional[str]
+
+
+_lock = threading.Lock()
+_by_id_number: Dict[str, StudentIds] = {}
+_by_student_id: Dict[str, StudentIds] = {}
+_by_auth_id: Dict[str, StudentIds] = {}
+# student_id -> time the mapping was stored
+_stored_at: Dict[str, float] = {}
+
+
+def _forget(ids: StudentIds) -> None:
+    if ids.id_number and _by_id_number.get(ids.id_number) == ids:
+        del _by_id_number[ids.id_number]
+    if ids.auth_user_id and _by_auth_id.get(ids.auth_user_id) == ids:
+        del _by_auth_id[ids.auth_user_id]
+    _by_student_id.pop(ids.student_id, None)
+    _stored_at.pop(ids.student_id, None)
+
+
+def remember(entries: Iterable[StudentIds]) -> None:
+    """Store mappings, replacing any older entry for the same student"""
+    now = time_module.monotonic()
+    with _lock:
+        for ids in entries:
+            previous = _by_student_id.get(ids.student_id)
+            if previous is not None:
+                _forget(previous)
+            _by_student_id[ids.student_id] = ids
+            if ids.id_number:
+                _by_id_number[ids.id_number] = ids
+            if ids.auth_user_id:
+                _by_auth_id[ids.auth_user_id] = ids
+            _stored_at[ids.student_id] = now
+
+
+def _fresh(ids: Optional[StudentIds]) -> Optional[StudentIds]:
+    if ids is None:
+        return None
+    stored_at = _stored_at.get(ids.student_id)
+    if stored_at is None or time_module.monotonic() - stored_at > Config.STUDENT_ID_CACHE_TTL:
+        return None
+    return ids
+
+
+def warm_for_counselor(counselor_id: str, courses: Iterable[str]) -> None:
+    """Load mappings for every student on a counselor's roster"""
+    roster = get_student_roster(counselor_id, courses)
+    remember(
+        StudentIds(row["studentId"], row["idNumber"], row["studentAuthId"])
+        for row in roster.rows
+        if row.get("studentId")
+    )
+
+
+def resolve_id_number(
+    id_number: str,
+    counselor_id: Optional[str] = None,
+    courses: Optional[Iterable[str]] = None,
+) -> Optional[StudentIds]:
+    """
+    Resolve an id_number to a student's identifiers
+
+    Misses first warm the whole map from the counselor's (usually cached)
+    roster, then fall back to a single students lookup.
+    """
+    ids = _fresh(_by_id_number.get(id_number))
+    if ids is not None:
+        return ids
+
+    if counselor_id is not None and courses:
+        warm_for_counselor(counselor_id, courses)
+        ids = _fresh(_by_id_number.get(id_number))
+        if ids is not None:
+            return ids
+
+    supabase = get_supabase_client(use_service_role=True)
+    response = (
+        supabase.table("students")
+        .select("id, id_number, auth_user_id")
+        .eq("id_number", id_number)
+        .limit(1)
+        .execute()
+    )
+    if not response.data:
+        return None
+
+    row = response.data[0]
+    ids = StudentIds(row["id"], row.get("id_number"), row.get("auth_user_id"))
+    remember([ids])
+    return ids
+
+
+def invalidate_student(auth_user_id: str) -> None:
+    """Drop the mapping for a student whose profile was saved"""
+    with _lock:
+        ids = _by_auth_id.get(auth_user_id)
+        if ids is not None:
+            _forget(ids)
@@ -0,0 +1,123 @@
+"""
+Bulk status updates for a counselor's student_list rows
+Validates every change against the counselor's courses with one query and
+writes only the changed columns, one update per (column, value) pair
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+
+from app.services.student_roster import STATUS_FIELDS, on_student_status_updated
+from app.services.supabase_service import get_supabase_client
+
+# student_list status column -> allowed values
+STUDENT_LIST_STATUS_VALUES = {
+    "assessment": ["pending", "high risk", "low risk"],
+    "initial_interview": ["not started", "scheduled", "completed"],
+    "counseling_status": ["no record", "ongoing", "closed"],
+    "exit_interview": ["not started", "scheduled", "completed"],
+}
+
+MAX_BULK_CHANGES = 500
+
+# response key (e.g. counselingStatus) -> column, so either spelling is accepted
+_FIELD_ALIASES = {key: column for column, key in STATUS_FIELDS.items() if column in STUDENT_LIST_STATUS_VALUES}
+
+
+def _resolve_field(field: Any) -> Any:
+    return _FIELD_ALIASES.get(field, field)
+
+
+def apply_bulk_status_changes(courses: Iterable[str], changes: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Apply (studentAuthId, field, value) changes to student_list
+
+    Returns (per-change results in request order, number of rows written).
+    Each result has `status` "updated" or "error" with an `error` message.
+    Later changes to the same student and field win.
+    """
+    results: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, str, str, Any]] = []
+
+    for index, change in enumerate(changes):
+        change = change if isinstance(change, dict) else {}
+        student_auth_id = change.get("studentAuthId")
+        field = _resolve_field(change.get("field"))
+        value = change.get("value")
+        result = {"index": index, "studentAuthId": student_auth_id, "field": change.get("field")}
+        results.append(result)
+
+        if not student_auth_id or not isinstance(student_auth_id, str):
+            result.update(status="error", error="studentAuthId required")
+        elif field not in STUDENT_LIST_STATUS_VALUES:
+            result.update(status="error", error=f"Invalid field. Must be one of: {list(STUDENT_LIST_STATUS_VALUES)}")
+        elif value not in STUDENT_LIST_STATUS_VALUES[field]:
+            result.update(status="error", error=f"Invalid value. Must be one of: {STUDENT_LIST_STATUS_VALUES[field]}")
+        else:
+            valid.append((index, student_auth_id, field, value))
+
+    courses = list(courses)
+    student_ids = list(dict.fromkeys(student_auth_id for _, student_auth_id, _, _ in valid))
+    if not valid or not courses:
+        for index, _, _, _ in valid:
+            results[index].update(status="error", error="Student not in your assigned courses")
+        return results, 0
+
+    supabase = get_supabase_client(use_service_role=True)
+
+    # one query: which of these students are in the counselor's courses
+    current = supabase.table("student_list").select(
+        "id, student_id, students:students!student_list_student_id_fkey!inner(course)"
+    ).in_("student_id", student_ids).in_("students.course", courses).execute()
+
+    row_ids: Dict[str, str] = {row["student_id"]: row["id"] for row in current.data or []}
+
+    touched: Dict[str, Dict[str, Any]] = {}
+    for index, student_auth_id, field, value in valid:
+        if student_auth_id not in row_ids:
+            results[index].update(status="error", error="Student not in your assigned courses")
+            continue
+        touched.setdefault(student_auth_id, {})[field] = value
+
+    # one update per (column, value), so a row only ever gets the columns that
+    # changed and concurrent edits to its other statuses are kept
+    groups: Dict[Tuple[str, Any], List[str]] = defaultdict(list)
+    for student_auth_id, student_changes in touched.items():
+        for field, value in student_changes.items():
+            groups[(field, value)].append(student_auth_id)
+
+    failed: Dict[Tuple[str, str], str] = {}
+    for (field, value), group in groups.items():
+        try:
+            response = supabase.table("student_list").update({field: value}).in_(
+                "id", [row_ids[student_auth_id] for student_auth_id in group]
+            ).execute()
+            written = {row["id"] for row in response.data or []}
+            error = "Student not in your assigned courses"
+        except Exception as e:
+            written = set()
+            error = str(e)
+        for student_auth_id in group:
+            # a row deleted since it was read is reported, never re-created
+            if row_ids[student_auth_id] not in written:
+                failed[(student_auth_id, field)] = error
+
+    for index, student_auth_id, field, _ in valid:
+        if student_auth_id not in touched:
+            continue
+        error = failed.get((student_auth_id, field))
+        if error:
+            results[index].update(status="error", error=error)
+        else:
+            results[index]["status"] = "updated"
+
+    written_students = 0
+    for student_auth_id, student_changes in touched.items():
+        applied = {
+            field: value for field, value in student_changes.items()
+            if (student_auth_id, field) not in failed
+        }
+        if applied:
+            written_students += 1
+            on_student_status_updated(student_auth_id, applied)
+
+    return results, written_students
@@ -0,0 +1,141 @@
+"""
+Counselor notes listing and search
+Pages return titles and metadata in (created_at, id) keyset order, newest
+first; note bodies are fetched one at a time on demand
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.services.supabase_service import get_supabase_client
+
+NOTES_DEFAULT_PAGE_SIZE = 20
+NOTES_MAX_PAGE_SIZE = 100
+
+NOTE_METADATA_COLUMNS = "id, student_id, note_type, created_at, note_title"
+NOTE_COLUMNS = f"{NOTE_METADATA_COLUMNS}, content"
+
+# text search settings for the generated search_tsv column
+NOTES_SEARCH_CONFIG = "simple"
+
+
+def encode_note_cursor(created_at: str, note_id: str) -> str:
+    """Encode the keyset position of a note as an opaque cursor"""
+    raw = json.dumps([created_at, note_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_note_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor produced by encode_note_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, note_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # validate shapes so nothing unexpected reaches the filter string
+        datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        str(uuid.UUID(note_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    return created_at, note_id
+
+
+def note_keyset_filter(created_at: str, note_id: str) -> str:
+    """PostgREST or-filter for notes older than (created_at, id)"""
+    c, i = f'"{created_at}"', f'"{note_id}"'
+    return f"created_at.lt.{c},and(created_at.eq.{c},id.lt.{i})"
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    return max(1, min(limit or NOTES_DEFAULT_PAGE_SIZE, NOTES_MAX_PAGE_SIZE))
+
+
+def _page(rows: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Split a limit+1 fetch into (page, next cursor)"""
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and page:
+        next_cursor = encode_note_cursor(page[-1]["created_at"], page[-1]["id"])
+    return page, next_cursor
+
+
+def list_student_notes(
+    student_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a student's note metadata, optionally full-text filtered"""
+    supabase = get_supabase_client(use_service_role=True)
+
+    query = (
+        supabase.table("student_notes")
+        .select(NOTE_METADATA_COLUMNS)
+        .eq("student_id", student_id)
+    )
+    if search:
+        # filter() rather than text_search(), which ends the builder chain
+        query = query.filter("search_tsv", f"wfts({NOTES_SEARCH_CONFIG})", search)
+    if cursor:
+        query = query.or_(note_keyset_filter(*decode_note_cursor(cursor)))
+
+    rows = (
+        query.order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(limit + 1)
+        .execute()
+        .data or []
+    )
+    return _page(rows, limit)
+
+
+def get_student_note(student_id: str, note_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch one note including its content"""
+    supabase = get_supabase_client(use_service_role=True)
+    response = (
+        supabase.table("student_notes")
+        .select(NOTE_COLUMNS)
+        .eq("id", note_id)
+        .eq("student_id", student_id)
+        .limit(1)
+        .execute()
+    )
+    return response.data[0] if response.data else None
+
+
+def search_counselor_notes(
+    courses: Iterable[str],
+    search: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Full-text search over every note of the students in the given courses"""
+    courses = list(courses)
+    if not courses:
+        return [], None
+
+    before_created_at, before_id = decode_note_cursor(cursor) if cursor else (None, None)
+
+    supabase = get_supabase_client(use_service_role=True)
+    rows = supabase.rpc("search_counselor_notes", {
+        "p_courses": courses,
+        "p_query": search,
+        "p_limit": limit + 1,
+        "p_before_created_at": before_created_at,
+        "p_before_id": before_id,
+    }).execute().data or []
+
+    page, next_cursor = _page(rows, limit)
+    return [
+        {
+            "id": row["id"],
+            "student_id": row["student_id"],
+            "note_type": row["note_type"],
+            "note_title": row["note_title"],
+            "created_at": row["created_at"],
+            "idNumber": row.get("id_number"),
+            "studentName": f"{row.get('given_name') or ''} {row.get('family_name') or ''}".strip(),
+        }
+        for row in page
+    ], next_cursor
@@ -0,0 +1,315 @@
+"""
+In-memory student roster per counselor
+Holds the counselor's student_list rows (inner-joined with students on the
+assigned courses) with sorted views for keyset pagination and a prefix /
+trigram index over names and ID numbers for search-as-you-type
+"""
+import base64
+import json
+import threading
+import time as time_module
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.services.supabase_service import get_supabase_client
+from config import Config
+
+# rows fetched per request while loading a roster
+ROSTER_LOAD_CHUNK_SIZE = 1000
+
+ROSTER_DEFAULT_PAGE_SIZE = 50
+ROSTER_MAX_PAGE_SIZE = 200
+
+# students columns that feed the roster; a profile save touching any of
+# these drops the affected rosters
+ROSTER_STUDENT_COLUMNS = ("id", "id_number", "given_name", "family_name", "course")
+
+STUDENT_LIST_SELECT = (
+    "id, student_id, year_level, assessment, initial_interview, counseling_status, exit_interview, "
+    f"students:students!student_list_student_id_fkey!inner({', '.join(ROSTER_STUDENT_COLUMNS)})"
+)
+
+# student_list columns exposed in roster rows -> response keys
+STATUS_FIELDS = {
+    "year_level": "yearLevel",
+    "assessment": "assessment",
+    "initial_interview": "initialInterview",
+    "counseling_status": "counselingStatus",
+    "exit_interview": "exitInterview",
+}
+
+
+def _text_key(value: Any) -> str:
+    return "" if value is None else str(value).lower()
+
+
+# sort name -> key built from a roster row
+SORT_KEYS = {
+    "name": lambda row: (_text_key(row["familyName"]), _text_key(row["givenName"])),
+    "idNumber": lambda row: (_text_key(row["idNumber"]),),
+    "course": lambda row: (_text_key(row["course"]), _text_key(row["familyName"]), _text_key(row["givenName"])),
+    "yearLevel": lambda row: (_text_key(row["yearLevel"]), _text_key(row["familyName"]), _text_key(row["givenName"])),
+}
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _format_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    student = row["students"]
+    formatted = {
+        "idNumber": student.get("id_number"),
+        "studentName": f"{student.get('given_name','')} {student.get('family_name','')}",
+        "course": student.get("course"),
+        "studentAuthId": row.get("student_id"),
+        # internal fields, stripped from API responses
+        "listId": row["id"],
+        "studentId": student.get("id"),
+        "givenName": student.get("given_name"),
+        "familyName": student.get("family_name"),
+    }
+    for column, key in STATUS_FIELDS.items():
+        formatted[key] = row.get(column)
+    return formatted
+
+
+PUBLIC_ROW_KEYS = (
+    "idNumber", "studentName", "course", "yearLevel", "assessment",
+    "initialInterview", "counselingStatus", "exitInterview", "studentAuthId",
+)
+
+
+def public_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Roster row in the /student-list response shape"""
+    return {key: row.get(key) for key in PUBLIC_ROW_KEYS}
+
+
+class StudentRoster:
+    """One counselor's students with sort views and a search index"""
+
+    def __init__(self, counselor_id: str, courses: Tuple[str, ...], rows: List[Dict[str, Any]]):
+        self.counselor_id = counselor_id
+        self.courses = set(courses)
+        self.loaded_at = time_module.monotonic()
+        self.rows = rows
+        self.by_auth_id = {row["studentAuthId"]: row for row in rows}
+        self._lock = threading.Lock()
+        self._sorted: Dict[str, Tuple[List[Tuple[Tuple, Any]], List[int]]] = {}
+        self._build_search_index()
+
+    def is_expired(self, ttl_seconds: float) -> bool:
+        return time_module.monotonic() - self.loaded_at > ttl_seconds
+
+    def _build_search_index(self) -> None:
+        # trigram -> row positions, and sorted (token, position) for prefixes
+        trigrams: Dict[str, Set[int]] = {}
+        tokens: List[Tuple[str, int]] = []
+        texts: List[str] = []
+        for pos, row in enumerate(self.rows):
+            parts = [_text_key(row["givenName"]), _text_key(row["familyName"]), _text_key(row["idNumber"])]
+            text = " ".join(p for p in parts if p)
+            texts.append(text)
+            for token in set(text.split()):
+                tokens.append((token, pos))
+            for gram in _trigrams(text):
+                trigrams.setdefault(gram, set()).add(pos)
+        tokens.sort()
+        self._trigrams = trigrams
+        self._tokens = tokens
+        self._token_keys = [token for token, _ in tokens]
+        self._texts = texts
+
+    def search(self, query: str) -> Set[int]:
+        """Positions of rows whose name or ID number matches the query"""
+        query = " ".join(query.lower().split())
+        if len(query) < 3:
+            # short queries match word prefixes
+            start = bisect_left(self._token_keys, query)
+            end = bisect_right(self._token_keys, query + "\uffff")
+            return {pos for _, pos in self._tokens[start:end]}
+
+        grams = sorted(_trigrams(query), key=lambda g: len(self._trigrams.get(g, ())))
+        candidates = set(self._trigrams.get(grams[0], ()))
+        for gram in grams[1:]:
+            candidates &= self._trigrams.get(gram, set())
+            if not candidates:
+                break
+        # trigrams can match out of order, confirm the substring
+        return {pos for pos in candidates if query in self._texts[pos]}
+
+    def sorted_view(self, sort: str) -> Tuple[List[Tuple[Tuple, Any]], List[int]]:
+        """(sort keys, row positions) ordered by the sort key then list ID"""
+        view = self._sorted.get(sort)
+        if view is None:
+            with self._lock:
+                view = self._sorted.get(sort)
+                if view is None:
+                    key_fn = SORT_KEYS[sort]
+                    pairs = sorted(
+                        ((key_fn(row), row["listId"]), pos) for pos, row in enumerate(self.rows)
+                    )
+                    view = ([k for k, _ in pairs], [pos for _, pos in pairs])
+                    self._sorted[sort] = view
+        return view
+
+    def update_status(self, student_auth_id: str, changes: Dict[str, Any]) -> None:
+        """Apply student_list column changes to a cached row"""
+        row = self.by_auth_id.get(student_auth_id)
+        if row is None:
+            return
+        with self._lock:
+            for column, value in changes.items():
+                if column in STATUS_FIELDS:
+                    row[STATUS_FIELDS[column]] = value
+            # yearLevel is a sort key
+            if "year_level" in changes:
+                self._sorted.pop("yearLevel", None)
+
+
+def encode_roster_cursor(sort_key: Tuple, list_id: Any) -> str:
+    """Encode a roster keyset position as an opaque cursor"""
+    raw = json.dumps([list(sort_key), list_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_roster_cursor(cursor: str) -> Tuple[Tuple, Any]:
+    """Decode a cursor produced by encode_roster_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key, list_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(sort_key, list) or not all(isinstance(v, str) for v in sort_key):
+            raise ValueError
+        return tuple(sort_key), list_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def page_roster(
+    roster: StudentRoster,
+    sort: str = "name",
+    descending: bool = False,
+    query: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = ROSTER_DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of a roster
+
+    Returns (rows, next cursor). The cursor encodes the last row's
+    (sort key, list ID), so pages stay stable while rows are updated.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Invalid sort. Must be one of: {list(SORT_KEYS)}")
+
+    keys, positions = roster.sorted_view(sort)
+    matches = roster.search(query) if query and query.strip() else None
+
+    if cursor:
+        after = decode_roster_cursor(cursor)
+        try:
+            index = bisect_left(keys, after) - 1 if descending else bisect_right(keys, after)
+        except TypeError:
+            raise ValueError("Invalid cursor")
+    else:
+        index = len(keys) - 1 if descending else 0
+
+    step = -1 if descending else 1
+    page: List[Dict[str, Any]] = []
+    last_key = None
+    while 0 <= index < len(keys) and len(page) < limit:
+        pos = positions[index]
+        if matches is None or pos in matches:
+            page.append(public_row(roster.rows[pos]))
+            last_key = keys[index]
+        index += step
+
+    # only hand out a cursor when another match remains past this page
+    next_cursor = None
+    if last_key is not None:
+        while 0 <= index < len(keys):
+            if matches is None or positions[index] in matches:
+                next_cursor = encode_roster_cursor(*last_key)
+                break
+            index += step
+
+    return page, next_cursor
+
+
+def _load_roster(counselor_id: str, courses: Tuple[str, ...]) -> StudentRoster:
+    """Read a counselor's student_list rows, keyset-paged by list ID"""
+    supabase = get_supabase_client(use_service_role=True)
+    rows: List[Dict[str, Any]] = []
+    if courses:
+        last_id = None
+        while True:
+            # !inner makes the course filter drop parent rows, not just the embed
+            query = supabase.table("student_list").select(STUDENT_LIST_SELECT).in_(
+                "students.course", list(courses)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            chunk = query.order("id").limit(ROSTER_LOAD_CHUNK_SIZE).execute().data or []
+            rows.extend(_format_row(row) for row in chunk if row.get("students"))
+            if len(chunk) < ROSTER_LOAD_CHUNK_SIZE:
+                break
+            last_id = chunk[-1]["id"]
+    return StudentRoster(counselor_id, courses, rows)
+
+
+_rosters: Dict[str, StudentRoster] = {}
+_load_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+# bumped on every invalidation so a load that raced a write is not cached
+_generations: Dict[str, int] = {}
+
+
+def get_student_roster(counselor_id: str, courses: Iterable[str]) -> StudentRoster:
+    """
+    Get the cached roster for a counselor's assigned courses
+
+    Rosters are dropped when a student's profile or list status changes in
+    this process; STUDENT_ROSTER_TTL bounds staleness for other workers.
+    """
+    courses = tuple(sorted(courses))
+    ttl = Config.STUDENT_ROSTER_TTL
+    roster = _rosters.get(counselor_id)
+    if roster is not None and not roster.is_expired(ttl) and roster.courses == set(courses):
+        return roster
+
+    with _locks_guard:
+        lock = _load_locks.setdefault(counselor_id, threading.Lock())
+
+    # one loader per counselor, concurrent requests wait for its result
+    with lock:
+        roster = _rosters.get(counselor_id)
+        if roster is None or roster.is_expired(ttl) or roster.courses != set(courses):
+            generation = _generations.get(counselor_id, 0)
+            roster = _load_roster(counselor_id, courses)
+            if _generations.get(counselor_id, 0) == generation:
+                _rosters[counselor_id] = roster
+        return roster
+
+
+def _invalidate(counselor_ids: Iterable[str]) -> None:
+    with _locks_guard:
+        for counselor_id in counselor_ids:
+            _generations[counselor_id] = _generations.get(counselor_id, 0) + 1
+            _rosters.pop(counselor_id, None)
+
+
+def on_student_profile_saved(student_auth_id: str, db_data: Dict[str, Any]) -> None:
+    """Drop rosters affected by a students row change (name, ID number or course)"""
+    if not any(column in db_data for column in ROSTER_STUDENT_COLUMNS):
+        return
+    new_course = db_data.get("course")
+    _invalidate([
+        counselor_id for counselor_id, roster in list(_rosters.items())
+        if student_auth_id in roster.by_auth_id or (new_course and new_course in roster.courses)
+    ])
+
+
+def on_student_status_updated(student_auth_id: str, changes: Dict[str, Any]) -> None:
+    """Apply student_list status changes to every cached roster holding the student"""
+    for roster in list(_rosters.values()):
+        roster.update_status(student_auth_id, changes)
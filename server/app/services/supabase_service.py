@@ -1,25 +1,156 @@
 """Supabase service for database operations"""
-from supabase import create_client, Client
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+from supabase import create_client, Client, ClientOptions
+from app.utils.request_metrics import InstrumentedTransport
 from config import Config
 
 
+# per-process client registry
+# one Client (and one pooled HTTP/2 transport) is shared by every request
+# handled in this process; entries are keyed by API key and rebuilt after a fork
+_registry_lock = threading.Lock()
+_clients: Dict[str, Client] = {}
+_http_client: Optional[httpx.Client] = None
+_registry_pid: Optional[int] = None
+_stats = {"created": 0, "hits": 0}
+
+
+def _build_http_client() -> httpx.Client:
+    """
+    Create the shared HTTP/2 client used by PostgREST, auth and storage
+    The transport records every call against the request being handled
+    (Server-Timing); httpx ignores http2/limits on the client once a
+    transport is given, so they are set on the inner transport.
+    """
+    return httpx.Client(
+        timeout=httpx.Timeout(Config.SUPABASE_HTTP_TIMEOUT),
+        transport=InstrumentedTransport(httpx.HTTPTransport(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=Config.SUPABASE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.SUPABASE_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=Config.SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )),
+    )
+
+
+def _reset_if_forked() -> None:
+    """Drop clients inherited from a parent process (gunicorn pre-fork)"""
+    global _http_client, _registry_pid
+    pid = os.getpid()
+    if _registry_pid == pid:
+        return
+    # sockets belong to the parent, never reuse them in a forked worker
+    _clients.clear()
+    _http_client = None
+    _registry_pid = pid
+
+
 def get_supabase_client(use_service_role: bool = True) -> Client:
     """
     Get Supabase client
-    
+
     Args:
         use_service_role: If True, use service role key (bypasses RLS)
                           If False, use anon key (respects RLS)
+
+    The client is created once per process and reused, so every call shares
+    the same keep-alive connection pool to PostgREST.
     """
     url = Config.SUPABASE_URL
     key = Config.SUPABASE_SERVICE_ROLE_KEY if use_service_role else None
-    
+
     if not url:
         raise ValueError("SUPABASE_URL not configured")
-    
+
     if use_service_role and not key:
         raise ValueError("SUPABASE_SERVICE_ROLE_KEY not configured for service role")
-    
+
     # use service role key for backend operations
     # RLS is still enforced through auth_user_id filtering
-    return create_client(url, Config.SUPABASE_SERVICE_ROLE_KEY)
+    api_key = Config.SUPABASE_SERVICE_ROLE_KEY
+
+    # fast path: no lock once the client exists in this process
+    client = _clients.get(api_key)
+    if client is not None and _registry_pid == os.getpid():
+        _stats["hits"] += 1
+        return client
+
+    global _http_client
+    with _registry_lock:
+        _reset_if_forked()
+        client = _clients.get(api_key)
+        if client is None:
+            if _http_client is None:
+                _http_client = _build_http_client()
+            client = create_client(
+                url,
+                api_key,
+                options=ClientOptions(
+                    httpx_client=_http_client,
+                    auto_refresh_token=False,
+                    persist_session=False,
+                ),
+            )
+            # touch lazily-created sub-clients while holding the lock so
+            # concurrent threads never race to build them
+            client.postgrest
+            _clients[api_key] = client
+            _stats["created"] += 1
+        else:
+            _stats["hits"] += 1
+        return client
+
+
+def is_missing_rpc(error: Exception) -> bool:
+    """
+    True when PostgREST rejected an RPC because the function does not exist
+    (PGRST202, e.g. its migration has not been applied yet). Any other error
+    may have come after the function ran, so it must not trigger a fallback.
+    """
+    return getattr(error, "code", None) == "PGRST202"
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Report registry and connection pool statistics for this process"""
+    stats: Dict[str, Any] = {
+        "pid": os.getpid(),
+        "clients": len(_clients) if _registry_pid == os.getpid() else 0,
+        "clientsCreated": _stats["created"],
+        "registryHits": _stats["hits"],
+        "maxConnections": Config.SUPABASE_HTTP_MAX_CONNECTIONS,
+        "maxKeepalive": Config.SUPABASE_HTTP_MAX_KEEPALIVE,
+        "openConnections": None,
+        "idleConnections": None,
+    }
+
+    # httpcore does not expose a public stats API, so read the pool defensively
+    try:
+        transport = _http_client._transport if _http_client else None
+        pool = getattr(transport, "wrapped", transport)._pool if transport else None
+        if pool is not None:
+            connections = list(pool.connections)
+            stats["openConnections"] = len(connections)
+            stats["idleConnections"] = sum(1 for c in connections if c.is_idle())
+    except Exception:
+        pass
+
+    return stats
+
+
+def close_supabase_clients() -> None:
+    """Close the shared HTTP pool and forget every cached client"""
+    global _http_client
+    with _registry_lock:
+        if _http_client is not None and _registry_pid == os.getpid():
+            try:
+                _http_client.close()
+            except Exception:
+                pass
+        _http_client = None
+        _clients.clear()
@@ -1,43 +1,214 @@
 """Authentication utilities for verifying Supabase JWT tokens"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from flask import request, jsonify
-from typing import Optional
+from flask import g, request, jsonify
+from typing import Any, Dict, Optional, Tuple
 import jwt
+from app.services.role_cache import RoleInfo, get_role_info
+from config import Config
 
+# algorithms Supabase signs access tokens with
+# HS256 uses the project's JWT secret, the asymmetric ones the published JWKS
+SYMMETRIC_ALGORITHMS = ["HS256"]
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
 
-def get_user_id_from_token() -> Optional[str]:
-    """Extract and decode JWT token from Authorization header, return user ID"""
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens and memoizes the claims
+
+    Signing keys come from SUPABASE_JWT_SECRET (legacy HS256 projects) or the
+    project's JWKS, fetched once and cached. An unknown `kid` forces a JWKS
+    refetch, so key rotation is picked up without a restart.
+
+    Verified claims are kept in a bounded LRU keyed by a SHA-256 digest of
+    the token until the token's `exp`, so a repeat request costs one lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claims: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._jwks_client: Optional[jwt.PyJWKClient] = None
+
+    def _get_jwks_client(self) -> jwt.PyJWKClient:
+        if self._jwks_client is None:
+            if not Config.SUPABASE_URL:
+                raise jwt.InvalidTokenError("SUPABASE_URL not configured for JWKS")
+            with self._lock:
+                if self._jwks_client is None:
+                    self._jwks_client = jwt.PyJWKClient(
+                        f"{Config.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json",
+                        cache_jwk_set=True,
+                        lifespan=Config.SUPABASE_JWKS_TTL,
+                    )
+        return self._jwks_client
+
+    def _signing_key(self, token: str) -> Tuple[Any, list]:
+        """Resolve the key and allowed algorithms for a token"""
+        alg = jwt.get_unverified_header(token).get("alg")
+        if alg in SYMMETRIC_ALGORITHMS:
+            if not Config.SUPABASE_JWT_SECRET:
+                raise jwt.InvalidTokenError("SUPABASE_JWT_SECRET not configured for HS256 tokens")
+            return Config.SUPABASE_JWT_SECRET, SYMMETRIC_ALGORITHMS
+        if alg in ASYMMETRIC_ALGORITHMS:
+            return self._get_jwks_client().get_signing_key_from_jwt(token).key, ASYMMETRIC_ALGORITHMS
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {alg}")
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        key, algorithms = self._signing_key(token)
+        issuer = f"{Config.SUPABASE_URL.rstrip('/')}/auth/v1" if Config.SUPABASE_URL else None
+        return jwt.decode(
+            token,
+            key,
+            algorithms=algorithms,
+            audience=Config.SUPABASE_JWT_AUDIENCE,
+            issuer=issuer,
+            options={"require": ["exp", "sub"]},
+        )
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the verified claims for a token (raises jwt.InvalidTokenError)"""
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        with self._lock:
+            cached = self._claims.get(digest)
+            if cached is not None:
+                claims, expires_at = cached
+                if expires_at > now:
+                    self._claims.move_to_end(digest)
+                    return claims
+                del self._claims[digest]
+
+        claims = self._decode(token)
+
+        with self._lock:
+            self._claims[digest] = (claims, float(claims["exp"]))
+            self._claims.move_to_end(digest)
+            while len(self._claims) > Config.AUTH_CLAIMS_CACHE_SIZE:
+                self._claims.popitem(last=False)
+
+        return claims
+
+    def clear(self) -> None:
+        """Forget memoized claims"""
+        with self._lock:
+            self._claims.clear()
+
+
+_verifier = TokenVerifier()
+
+
+def get_token_verifier() -> TokenVerifier:
+    """Get the process-wide token verifier"""
+    return _verifier
+
+
+def get_token_claims() -> Optional[Dict[str, Any]]:
+    """Verify the Bearer token from the Authorization header and return its claims"""
     auth_header = request.headers.get("Authorization")
-    
+
     if not auth_header or not auth_header.startswith("Bearer "):
         return None
-    
+
     token = auth_header.split(" ")[1]
-    
+
     try:
-        # decode JWT token without verification (Supabase already verified it)
-        # the 'sub' claim contains the user ID
-        decoded = jwt.decode(
-            token,
-            options={"verify_signature": False}  # trust Supabase-issued tokens
-        )
-        
-        return decoded.get("sub")  # 'sub' contains the user ID
+        return _verifier.verify(token)
     except Exception as e:
-        print(f"Token decode error: {e}")
+        print(f"Token verification error: {e}")
         return None
 
 
+def get_user_id_from_token() -> Optional[str]:
+    """Verify JWT token from Authorization header, return user ID"""
+    claims = get_token_claims()
+    # the 'sub' claim contains the user ID
+    return claims.get("sub") if claims else None
+
+
+class Principal:
+    """
+    The authenticated caller for the current request
+
+    Role and assigned courses are resolved from the role cache on first use
+    and then kept for the rest of the request.
+    """
+
+    def __init__(self, user_id: str, claims: Dict[str, Any]):
+        self.user_id = user_id
+        self.claims = claims
+        self._role_info: Optional[RoleInfo] = None
+
+    def _get_role_info(self) -> RoleInfo:
+        if self._role_info is None:
+            self._role_info = get_role_info(self.user_id)
+        return self._role_info
+
+    @property
+    def role(self) -> Optional[str]:
+        return self._get_role_info().role
+
+    @property
+    def courses(self) -> Tuple[str, ...]:
+        """Courses assigned to a counselor (empty for other roles)"""
+        return self._get_role_info().courses
+
+    def has_role(self, *roles: str) -> bool:
+        return self.role in roles
+
+
+def get_current_principal() -> Optional[Principal]:
+    """Get the principal set by require_auth for this request"""
+    return g.get("principal")
+
+
 def require_auth(f):
     """Decorator to require authentication for Flask routes"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_id = get_user_id_from_token()
-        
+        claims = get_token_claims()
+        # the 'sub' claim contains the user ID
+        user_id = claims.get("sub") if claims else None
+
         if not user_id:
             return jsonify({"error": "Unauthorized", "message": "Missing or invalid token"}), 401
-        
+
+        g.principal = Principal(user_id, claims)
+
         # pass user_id to the route handler
         return f(user_id=user_id, *args, **kwargs)
-    
+
     return decorated_function
+
+
+def require_role(*roles: str):
+    """
+    Decorator to restrict a route to users with one of the given roles
+
+    Apply below @require_auth, which sets up the request principal.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            principal = get_current_principal()
+
+            if principal is None:
+                return jsonify({"error": "Unauthorized", "message": "Missing or invalid token"}), 401
+
+            try:
+                allowed = principal.has_role(*roles)
+            except Exception as e:
+                return jsonify({"error": str(e)}), 500
+
+            if not allowed:
+                return jsonify({"error": "Forbidden", "message": f"Requires role: {', '.join(roles)}"}), 403
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
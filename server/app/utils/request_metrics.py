@@ -0,0 +1,293 @@
+"""
+Per-request counts and timings of outbound calls
+
+Every PostgREST, auth, storage and Google API call made while a request is
+handled is recorded against that request and summed per service in a
+`Server-Timing` response header, e.g.
+
+    Server-Timing: postgrest;dur=18.4;desc="3 calls", auth_admin;dur=6.1;desc="1 call", app;dur=31.0
+
+Supabase calls are recorded by the transport under the shared httpx client,
+so nothing that uses `get_supabase_client` has to change. Google calls are
+recorded where they are made, with `track_call`.
+
+With REQUEST_METRICS_DEBUG on, a request sent with `X-Debug-Timing: 1` also
+gets every call listed under "debugTiming" in its JSON body.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from flask import Flask, Response, request
+from config import Config
+
+DEBUG_HEADER = "X-Debug-Timing"
+
+# calls listed in the debug block; totals always count every call
+MAX_DEBUG_CALLS = 200
+
+
+class CallRecord(NamedTuple):
+    """One outbound call made while handling a request"""
+    service: str
+    method: str
+    target: str
+    status: Optional[int]
+    duration_ms: float
+
+
+class RequestMetrics:
+    """Calls recorded for one request; thread-safe, worker threads may record too"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.calls: List[CallRecord] = []
+
+    def record(self, service: str, method: str, target: str, status: Optional[int], duration_ms: float) -> None:
+        with self._lock:
+            self.calls.append(CallRecord(service, method, target, status, duration_ms))
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """service -> {"calls": n, "ms": summed duration}, in first-call order"""
+        with self._lock:
+            calls = list(self.calls)
+        totals: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            entry = totals.setdefault(call.service, {"calls": 0, "ms": 0.0})
+            entry["calls"] += 1
+            entry["ms"] += call.duration_ms
+        return totals
+
+    def server_timing(self) -> str:
+        """The Server-Timing header value; `app` is the whole request"""
+        parts = []
+        for service, entry in self.totals().items():
+            noun = "call" if entry["calls"] == 1 else "calls"
+            parts.append(f'{service};dur={entry["ms"]:.1f};desc="{entry["calls"]} {noun}"')
+        parts.append(f"app;dur={self.elapsed_ms():.1f}")
+        return ", ".join(parts)
+
+    def debug_block(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self.calls)
+        return {
+            "totalMs": round(self.elapsed_ms(), 2),
+            "roundTrips": len(calls),
+            "byService": {
+                service: {"calls": entry["calls"], "ms": round(entry["ms"], 2)}
+                for service, entry in self.totals().items()
+            },
+            "calls": [
+                {
+                    "service": call.service,
+                    "method": call.method,
+                    "target": call.target,
+                    "status": call.status,
+                    "ms": round(call.duration_ms, 2),
+                }
+                for call in calls[:MAX_DEBUG_CALLS]
+            ],
+        }
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def current_request_metrics() -> Optional[RequestMetrics]:
+    """The collector of the request being handled, None outside a request"""
+    return _current.get()
+
+
+def bind_request_metrics(fn: Callable) -> Callable:
+    """
+    Wrap fn so calls it makes on a worker thread count toward the current request
+    Thread pools do not inherit context variables, so wrap before submitting.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return fn
+
+    @wraps(fn)
+    def bound(*args, **kwargs):
+        token = _current.set(metrics)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return bound
+
+
+@contextmanager
+def track_call(service: str, method: str, target: str) -> Iterator[None]:
+    """Time a block as one outbound call of the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    status = None
+    try:
+        yield
+        status = 200
+    except Exception as e:
+        status = getattr(getattr(e, "resp", None), "status", None)
+        raise
+    finally:
+        metrics.record(service, method, target, status, (time.perf_counter() - started) * 1000)
+
+
+def classify_supabase_path(path: str) -> str:
+    """Service name of a Supabase API path"""
+    if path.startswith("/rest/"):
+        return "postgrest"
+    if path.startswith("/auth/v1/admin"):
+        return "auth_admin"
+    if path.startswith("/auth/"):
+        return "auth"
+    if path.startswith("/storage/"):
+        return "storage"
+    return "supabase"
+
+
+class _TimedStream(httpx.SyncByteStream):
+    """Response body that records the call once it has been read and closed"""
+
+    def __init__(self, stream: httpx.SyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """
+    httpx transport that records every Supabase call against the current request
+    The duration runs until the response body is closed, so it includes the
+    download; calls made outside a request pass straight through.
+    """
+
+    def __init__(self, wrapped: httpx.BaseTransport):
+        self.wrapped = wrapped
+
+    def handle_request(self, http_request: httpx.Request) -> httpx.Response:
+        metrics = _current.get()
+        if metrics is None:
+            return self.wrapped.handle_request(http_request)
+
+        path = http_request.url.path
+        service = classify_supabase_path(path)
+        target = path
+        if http_request.url.query:
+            target = f"{path}?{http_request.url.query.decode('ascii', 'replace')}"
+        started = time.perf_counter()
+        try:
+            response = self.wrapped.handle_request(http_request)
+        except Exception:
+            metrics.record(service, http_request.method, target, None, (time.perf_counter() - started) * 1000)
+            raise
+
+        status = response.status_code
+        response.stream = _TimedStream(response.stream, lambda: metrics.record(
+            service, http_request.method, target, status, (time.perf_counter() - started) * 1000
+        ))
+        return response
+
+    def close(self) -> None:
+        self.wrapped.close()
+
+
+def google_target(uri: str) -> str:
+    """Host and path of a Google API URL, query string dropped (it can carry tokens)"""
+    parts = urlsplit(uri)
+    return f"{parts.netloc}{parts.path}"
+
+
+class InstrumentedHttp:
+    """
+    httplib2-compatible wrapper that records Google API calls
+    Wraps the AuthorizedHttp handed to `execute(http=...)`; anything other
+    than `request` is forwarded untouched.
+    """
+
+    def __init__(self, http):
+        self._http = http
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return self._http.request(uri, method, *args, **kwargs)
+        started = time.perf_counter()
+        status = None
+        try:
+            response, content = self._http.request(uri, method, *args, **kwargs)
+            status = response.status
+            return response, content
+        finally:
+            metrics.record("google", method, google_target(uri), status, (time.perf_counter() - started) * 1000)
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
+
+def _wants_debug_block() -> bool:
+    if not Config.REQUEST_METRICS_DEBUG:
+        return False
+    value = request.headers.get(DEBUG_HEADER, "")
+    return value.lower() in ("1", "true", "yes")
+
+
+def init_request_metrics(app: Flask) -> None:
+    """
+    Collect calls for every request and report them on the response
+    Streamed responses report the calls made before the body started.
+    """
+    if not Config.REQUEST_METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        request.environ["app.request_metrics.token"] = _current.set(RequestMetrics())
+
+    @app.after_request
+    def report_request_metrics(response: Response) -> Response:
+        metrics = _current.get()
+        if metrics is None:
+            return response
+        response.headers["Server-Timing"] = metrics.server_timing()
+
+        if _wants_debug_block() and response.is_json and not response.is_streamed:
+            body = response.get_json(silent=True)
+            if isinstance(body, dict):
+                body["debugTiming"] = metrics.debug_block()
+                response.set_data(json.dumps(body))
+        return response
+
+    @app.teardown_request
+    def end_request_metrics(exc=None):
+        token = request.environ.pop("app.request_metrics.token", None)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # set in a different context (e.g. a copied one); just clear it
+                _current.set(None)
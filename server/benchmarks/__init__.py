@@ -0,0 +1,9 @@
+"""
+Endpoint benchmarks
+Boots the Flask app against an in-memory Supabase stand-in seeded with a
+term's worth of data and records latency and database round trips per route.
+Run from server/ with `python -m benchmarks`.
+
+`python -m benchmarks.student_model_check` compares the generated student
+transforms and the completeness checkers with the hand-written originals.
+"""
@@ -0,0 +1,61 @@
+"""
+python -m benchmarks [--iterations N] [--only PREFIX ...] [--update-baseline]
+
+Exits with status 1 when a scenario regresses against benchmarks/baseline.json
+"""
+import argparse
+import os
+import sys
+
+from benchmarks.runner import (
+    BASELINE_PATH,
+    LATENCY_SLACK_MS,
+    LATENCY_TOLERANCE,
+    compare,
+    format_report,
+    load_baseline,
+    run,
+    save_baseline,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Endpoint benchmarks against a fake Supabase")
+    parser.add_argument("--iterations", type=int, default=20, help="warm requests per scenario (default 20)")
+    parser.add_argument("--only", nargs="*", help="scenario name prefixes to run, e.g. appointments. counselors.notes")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with or update")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=LATENCY_TOLERANCE, help="allowed p50 growth factor")
+    parser.add_argument("--slack-ms", type=float, default=LATENCY_SLACK_MS, help="allowed p50 growth on top of the factor")
+    args = parser.parse_args(argv)
+
+    results = run(iterations=args.iterations, only=args.only)
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+
+    print(format_report(results, baseline))
+
+    if args.update_baseline:
+        if args.only:
+            # keep the scenarios that were not run
+            results = {**baseline, **results}
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.slack_ms)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,623 @@
+"""
+In-memory stand-in for the Supabase REST and auth APIs
+Serves the subset of PostgREST the app uses (select with embeds, filters,
+or/and trees, ordering, limits, exact counts, single-object responses,
+insert/upsert/update/delete and the app's RPCs) plus the auth admin user
+lookup, over a real local HTTP socket so the unmodified supabase client
+talks to it. Every request is recorded so callers can count round trips.
+"""
+import json
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# query parameters that are not row filters
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+# (parent table, embedded table) -> (parent column, embedded column, to_one)
+RELATIONSHIPS: Dict[Tuple[str, str], Tuple[str, str, bool]] = {
+    ("appointments", "event_types"): ("event_type_id", "id", True),
+    ("student_list", "students"): ("student_id", "auth_user_id", True),
+    ("event_types", "counselor_schedules"): ("schedule_id", "id", True),
+}
+
+# (table, tsvector column) -> text columns it is generated from
+TSV_SOURCES: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("student_notes", "search_tsv"): ("note_title", "content"),
+}
+
+# tables whose rows get created_at / updated_at on insert
+TIMESTAMPED_TABLES = {
+    "appointments", "student_notes", "counselor_schedules", "event_types",
+    "students", "student_list", "calendar_sync_jobs", "profiles",
+}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class PostgrestError(Exception):
+    """An error returned to the client as a PostgREST JSON error body"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": details, "hint": None}
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# ---- parsing ------------------------------------------------------------
+
+
+def split_top(text: str, sep: str = ",") -> List[str]:
+    """Split on `sep` outside parentheses and double quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == sep and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    if current or parts:
+        parts.append("".join(current))
+    return parts
+
+
+def unquote_value(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"')
+    return value
+
+
+class SelectItem:
+    """One entry of a select list: a column, `*`, or an embedded resource"""
+
+    def __init__(self, name: str, alias: Optional[str] = None, children: Optional[List["SelectItem"]] = None,
+                 inner: bool = False):
+        self.name = name
+        self.alias = alias or name
+        self.children = children
+        self.inner = inner
+
+    @property
+    def is_embed(self) -> bool:
+        return self.children is not None
+
+
+def parse_select(text: Optional[str]) -> List[SelectItem]:
+    items = []
+    for token in split_top(text or "*"):
+        token = token.strip()
+        if not token:
+            continue
+        alias = None
+        head = token.split("(", 1)[0]
+        if ":" in head and "::" not in head:
+            alias, token = token.split(":", 1)
+        if "(" in token:
+            head, rest = token.split("(", 1)
+            name, *hints = head.split("!")
+            items.append(SelectItem(name, alias, parse_select(rest[:-1]), inner="inner" in hints))
+        else:
+            items.append(SelectItem(token.split("::", 1)[0], alias))
+    return items
+
+
+class Condition:
+    """A single column filter, e.g. `status.eq.pending` or `id.in.(a,b)`"""
+
+    def __init__(self, column: str, operator: str, value: str):
+        self.negate = False
+        if operator.startswith("not."):
+            self.negate = True
+            operator = operator[4:]
+        self.column = column
+        self.config = None
+        if "(" in operator:
+            operator, config = operator.split("(", 1)
+            self.config = config.rstrip(")")
+        self.operator = operator
+        self.raw = value
+        self.value = unquote_value(value)
+        self.values = [unquote_value(v) for v in split_top(value[1:-1])] if operator == "in" else None
+
+    def matches(self, table: str, row: Dict[str, Any]) -> bool:
+        result = self._matches(table, row)
+        return not result if self.negate else result
+
+    def _matches(self, table: str, row: Dict[str, Any]) -> bool:
+        op = self.operator
+        if op.endswith("fts"):
+            sources = TSV_SOURCES.get((table, self.column), (self.column,))
+            text = " ".join(str(row.get(column) or "") for column in sources)
+            return text_matches(text, self.value, op)
+
+        current = row.get(self.column)
+        if op == "is":
+            target = {"null": None, "true": True, "false": False}[self.value.lower()]
+            return current is target if target is None else current == target
+        if current is None:
+            return False
+        if op == "in":
+            return any(compare_key(current) == coerce(current, v) for v in self.values)
+        if op in ("like", "ilike"):
+            pattern = "^" + re.escape(self.value).replace(r"\*", ".*").replace("%", ".*") + "$"
+            return re.match(pattern, str(current), re.IGNORECASE if op == "ilike" else 0) is not None
+
+        left, right = compare_key(current), coerce(current, self.value)
+        if op == "eq":
+            return left == right
+        if op == "neq":
+            return left != right
+        if op == "gt":
+            return left > right
+        if op == "gte":
+            return left >= right
+        if op == "lt":
+            return left < right
+        if op == "lte":
+            return left <= right
+        raise PostgrestError(400, "PGRST100", f"unsupported operator: {op}")
+
+
+class Logic:
+    """An or/and tree of conditions"""
+
+    def __init__(self, kind: str, children: List[Any], negate: bool = False):
+        self.kind = kind
+        self.children = children
+        self.negate = negate
+
+    def matches(self, table: str, row: Dict[str, Any]) -> bool:
+        test = any if self.kind == "or" else all
+        result = test(child.matches(table, row) for child in self.children)
+        return not result if self.negate else result
+
+
+def parse_logic(kind: str, body: str, negate: bool = False) -> Logic:
+    """Parse the inside of `or=(...)` / `and(...)`"""
+    children: List[Any] = []
+    for part in split_top(body):
+        part = part.strip()
+        nested = re.match(r"^(not\.)?(and|or)\((.*)\)$", part, re.S)
+        if nested:
+            children.append(parse_logic(nested.group(2), nested.group(3), bool(nested.group(1))))
+            continue
+        column, rest = part.split(".", 1)
+        operator, value = split_operator(rest)
+        children.append(Condition(column, operator, value))
+    return Logic(kind, children, negate)
+
+
+def split_operator(text: str) -> Tuple[str, str]:
+    """`not.eq.x` -> ("not.eq", "x"); `wfts(simple).x` -> ("wfts(simple)", "x")"""
+    prefix = ""
+    if text.startswith("not."):
+        prefix, text = "not.", text[4:]
+    operator, value = text.split(".", 1)
+    return prefix + operator, value
+
+
+def compare_key(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return float(value)
+    return str(value)
+
+
+def coerce(current: Any, text: str) -> Any:
+    """Convert a filter string to the type of the stored value"""
+    if isinstance(current, bool):
+        return text.lower()
+    if isinstance(current, (int, float)):
+        try:
+            return float(text)
+        except ValueError:
+            return text
+    return text
+
+
+def text_matches(text: str, query: str, operator: str) -> bool:
+    """Approximate to_tsvector('simple') @@ *_to_tsquery: every term present, `-term` absent"""
+    words = set(_WORD.findall(text.lower()))
+    if operator == "fts":
+        query = re.sub(r"[&|!():]", " ", query)
+    required, excluded = [], []
+    for term in query.lower().replace('"', " ").split():
+        if term == "or":
+            continue
+        if term.startswith("-") and operator == "wfts":
+            excluded.extend(_WORD.findall(term))
+        else:
+            required.extend(_WORD.findall(term))
+    return all(word in words for word in required) and not any(word in words for word in excluded)
+
+
+def sort_rows(rows: List[Dict[str, Any]], order: Optional[str]) -> List[Dict[str, Any]]:
+    if not order:
+        return rows
+    rows = list(rows)
+    for term in reversed(split_top(order)):
+        column, *flags = term.split(".")
+        descending = "desc" in flags
+        nulls_first = "nullsfirst" in flags or (descending and "nullslast" not in flags)
+        present = [row for row in rows if row.get(column) is not None]
+        missing = [row for row in rows if row.get(column) is None]
+        present.sort(key=lambda row: compare_key(row[column]), reverse=descending)
+        rows = missing + present if nulls_first else present + missing
+    return rows
+
+
+# ---- storage --------------------------------------------------------------
+
+
+class FakeDatabase:
+    """Tables of plain dict rows with lazily built equality indexes"""
+
+    def __init__(self):
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.auth_users: Dict[str, Dict[str, Any]] = {}
+        self.rpcs: Dict[str, Callable[["FakeDatabase", Dict[str, Any]], Any]] = {}
+        self.lock = threading.RLock()
+        self._indexes: Dict[Tuple[str, str], Dict[Any, List[Dict[str, Any]]]] = {}
+        self.insert_hooks: Dict[str, Callable[["FakeDatabase", Dict[str, Any]], None]] = {}
+
+    def table(self, name: str) -> List[Dict[str, Any]]:
+        return self.tables.setdefault(name, [])
+
+    def touched(self, name: str, columns: Optional[Iterable[str]] = None) -> None:
+        """Drop the indexes of a table (or of some of its columns) after a write"""
+        columns = None if columns is None else set(columns)
+        for key in [key for key in self._indexes if key[0] == name and (columns is None or key[1] in columns)]:
+            del self._indexes[key]
+
+    def update_row(self, name: str, row: Dict[str, Any], changes: Dict[str, Any]) -> None:
+        """Apply changes to a stored row, dropping only the indexes they affect"""
+        changed = [column for column, value in changes.items() if row.get(column) != value]
+        row.update(changes)
+        if changed:
+            self.touched(name, changed)
+
+    def _index(self, name: str, column: str) -> Dict[Any, List[Dict[str, Any]]]:
+        index = self._indexes.get((name, column))
+        if index is None:
+            index = {}
+            for row in self.table(name):
+                value = row.get(column)
+                if value is not None:
+                    index.setdefault(compare_key(value), []).append(row)
+            self._indexes[(name, column)] = index
+        return index
+
+    def candidates(self, name: str, conditions: List[Condition]) -> Iterable[Dict[str, Any]]:
+        """Narrow a scan with the first plain eq/in condition"""
+        for condition in conditions:
+            if condition.negate or condition.operator not in ("eq", "in"):
+                continue
+            index = self._index(name, condition.column)
+            values = condition.values if condition.operator == "in" else [condition.value]
+            sample = next(iter(index), None)
+            found: List[Dict[str, Any]] = []
+            for value in dict.fromkeys(values):
+                key = float(value) if isinstance(sample, float) and _is_number(value) else value
+                found.extend(index.get(key, ()))
+            return found
+        return self.table(name)
+
+    def insert(self, name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        row.setdefault("id", str(uuid.uuid4()))
+        if name in TIMESTAMPED_TABLES:
+            row.setdefault("created_at", now_iso())
+            row.setdefault("updated_at", row["created_at"])
+        hook = self.insert_hooks.get(name)
+        if hook is not None:
+            hook(self, row)
+        self.table(name).append(row)
+        for (table, column), index in self._indexes.items():
+            if table == name and row.get(column) is not None:
+                index.setdefault(compare_key(row[column]), []).append(row)
+        return row
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+class ParsedQuery:
+    """Filters, embeds and modifiers of one table request"""
+
+    def __init__(self, params: List[Tuple[str, str]]):
+        self.select = None
+        self.order = None
+        self.limit = None
+        self.offset = 0
+        self.on_conflict = None
+        self.conditions: List[Condition] = []
+        self.logic: List[Logic] = []
+        # embed alias -> conditions on the embedded rows
+        self.embedded: Dict[str, List[Condition]] = {}
+
+        for key, value in params:
+            if key == "select":
+                self.select = value
+            elif key == "order":
+                self.order = value
+            elif key == "limit":
+                self.limit = int(value)
+            elif key == "offset":
+                self.offset = int(value)
+            elif key == "on_conflict":
+                self.on_conflict = value
+            elif key in RESERVED_PARAMS:
+                continue
+            elif key in ("or", "and", "not.or", "not.and"):
+                kind = key.split(".")[-1]
+                self.logic.append(parse_logic(kind, value[1:-1], key.startswith("not.")))
+            elif "." in key and not key.startswith('"'):
+                alias, column = key.split(".", 1)
+                operator, raw = split_operator(value)
+                self.embedded.setdefault(alias, []).append(Condition(column, operator, raw))
+            else:
+                operator, raw = split_operator(value)
+                self.conditions.append(Condition(unquote_value(key), operator, raw))
+
+    def matches(self, table: str, row: Dict[str, Any]) -> bool:
+        return all(c.matches(table, row) for c in self.conditions) and all(
+            logic.matches(table, row) for logic in self.logic
+        )
+
+
+class FakePostgrest:
+    """Evaluates PostgREST requests against a FakeDatabase"""
+
+    def __init__(self, db: FakeDatabase):
+        self.db = db
+
+    def _embed(self, table: str, row: Dict[str, Any], item: SelectItem, query: ParsedQuery) -> Tuple[bool, Any]:
+        """(keep parent row, embedded value)"""
+        relation = RELATIONSHIPS.get((table, item.name))
+        if relation is None:
+            raise PostgrestError(400, "PGRST200", f"Could not find a relationship between '{table}' and '{item.name}'")
+        local, foreign, to_one = relation
+        conditions = query.embedded.get(item.alias, [])
+        key = row.get(local)
+        children = [] if key is None else [
+            child for child in self.db.candidates(item.name, [Condition(foreign, "eq", str(key))])
+            if all(c.matches(item.name, child) for c in conditions)
+        ]
+        projected = [self._project(item.name, child, item.children, ParsedQuery([])) for child in children]
+        projected = [value for keep, value in projected if keep]
+        if to_one:
+            value = projected[0] if projected else None
+            return (value is not None or not item.inner), value
+        return (bool(projected) or not item.inner), projected
+
+    def _project(self, table: str, row: Dict[str, Any], items: List[SelectItem], query: ParsedQuery) -> Tuple[bool, Dict[str, Any]]:
+        out: Dict[str, Any] = {}
+        for item in items:
+            if item.is_embed:
+                keep, value = self._embed(table, row, item, query)
+                if not keep:
+                    return False, out
+                out[item.alias] = value
+            elif item.name == "*":
+                out.update(row)
+            else:
+                out[item.alias] = row.get(item.name)
+        return True, out
+
+    def select(self, table: str, query: ParsedQuery) -> Tuple[List[Dict[str, Any]], int]:
+        """(page of projected rows, total matching count)"""
+        items = parse_select(query.select)
+        rows = [row for row in self.db.candidates(table, query.conditions) if query.matches(table, row)]
+        projected = []
+        # order on base columns before projection so aliases do not matter
+        for row in sort_rows(rows, query.order):
+            keep, value = self._project(table, row, items, query)
+            if keep:
+                projected.append(value)
+        total = len(projected)
+        end = None if query.limit is None else query.offset + query.limit
+        return projected[query.offset:end], total
+
+    def insert(self, table: str, body: Any, query: ParsedQuery, upsert: bool) -> List[Dict[str, Any]]:
+        rows = body if isinstance(body, list) else [body]
+        conflict = [c.strip() for c in (query.on_conflict or "id").split(",")]
+        written = []
+        for row in rows:
+            existing = None
+            if upsert and all(row.get(c) is not None for c in conflict):
+                existing = next((
+                    current for current in self.db.candidates(
+                        table, [Condition(c, "eq", str(row[c])) for c in conflict]
+                    )
+                    if all(compare_key(current.get(c)) == compare_key(row[c]) for c in conflict)
+                ), None)
+            if existing is not None:
+                if table in TIMESTAMPED_TABLES:
+                    row = {**row, "updated_at": now_iso()}
+                self.db.update_row(table, existing, row)
+                written.append(existing)
+            else:
+                written.append(self.db.insert(table, row))
+        return [dict(row) for row in written]
+
+    def update(self, table: str, body: Dict[str, Any], query: ParsedQuery) -> List[Dict[str, Any]]:
+        rows = [row for row in self.db.candidates(table, query.conditions) if query.matches(table, row)]
+        for row in rows:
+            self.db.update_row(table, row, body)
+        return [dict(row) for row in rows]
+
+    def delete(self, table: str, query: ParsedQuery) -> List[Dict[str, Any]]:
+        doomed = {id(row) for row in self.db.candidates(table, query.conditions) if query.matches(table, row)}
+        kept, removed = [], []
+        for row in self.db.table(table):
+            (removed if id(row) in doomed else kept).append(row)
+        self.db.tables[table] = kept
+        if removed:
+            self.db.touched(table)
+        return [dict(row) for row in removed]
+
+
+# ---- HTTP -----------------------------------------------------------------
+
+
+class RequestLog:
+    """Thread-safe record of the requests the fake has served"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entries: List[Tuple[str, str]] = []
+
+    def add(self, method: str, target: str) -> None:
+        with self._lock:
+            self.entries.append((method, target))
+
+    def drain(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            entries, self.entries = self.entries, []
+        return entries
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body go out in separate writes; Nagle would hold the body
+    # back for the client's delayed ACK (~40 ms per round trip)
+    disable_nagle_algorithm = True
+    server: "FakeSupabaseServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = b"" if body is None else json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _body(self) -> Any:
+        return json.loads(self._raw_body) if self._raw_body else None
+
+    def _dispatch(self) -> None:
+        # always drain the body, leftovers would corrupt the next keep-alive request
+        length = int(self.headers.get("Content-Length") or 0)
+        self._raw_body = self.rfile.read(length) if length else b""
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        path = unquote(url.path)
+        self.server.log.add(self.command, path)
+
+        try:
+            with self.server.db.lock:
+                if path.startswith("/rest/v1/rpc/"):
+                    self._rpc(path[len("/rest/v1/rpc/"):], params)
+                elif path.startswith("/rest/v1/"):
+                    self._table(path[len("/rest/v1/"):], params)
+                elif path.startswith("/auth/v1/admin/users/"):
+                    self._auth_user(path.rsplit("/", 1)[-1])
+                else:
+                    raise PostgrestError(404, "PGRST404", f"unknown path {path}")
+        except PostgrestError as e:
+            self._send(e.status, e.body)
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def _table(self, table: str, params: List[Tuple[str, str]]) -> None:
+        api = self.server.api
+        query = ParsedQuery(params)
+        prefer = self.headers.get("Prefer", "")
+        wants_object = "vnd.pgrst.object" in self.headers.get("Accept", "")
+        headers: Dict[str, str] = {}
+
+        if self.command in ("GET", "HEAD"):
+            rows, total = api.select(table, query)
+            status = 200
+            if "count=" in prefer:
+                end = query.offset + len(rows) - 1
+                headers["Content-Range"] = f"{query.offset}-{end}/{total}" if rows else f"*/{total}"
+        elif self.command == "POST":
+            rows = api.insert(table, self._body(), query, upsert="resolution=merge-duplicates" in prefer)
+            status = 201
+        elif self.command == "PATCH":
+            rows = api.update(table, self._body() or {}, query)
+            status = 200
+        else:
+            rows = api.delete(table, query)
+            status = 200
+
+        if self.command != "GET" and "return=minimal" in prefer:
+            self._send(204 if status == 200 else status, None, headers)
+            return
+        if wants_object:
+            if len(rows) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(rows)} rows",
+                )
+            self._send(status, rows[0], headers)
+            return
+        self._send(status, rows, headers)
+
+    def _rpc(self, name: str, params: List[Tuple[str, str]]) -> None:
+        handler = self.server.db.rpcs.get(name)
+        if handler is None:
+            raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name}")
+        body = self._body() if self.command == "POST" else dict(params)
+        self._send(200, handler(self.server.db, body or {}))
+
+    def _auth_user(self, user_id: str) -> None:
+        user = self.server.db.auth_users.get(user_id)
+        if user is None:
+            self._send(404, {"code": 404, "error_code": "user_not_found", "msg": "User not found"})
+            return
+        self._send(200, user)
+
+
+class FakeSupabaseServer(ThreadingHTTPServer):
+    """Local HTTP server answering as SUPABASE_URL"""
+
+    daemon_threads = True
+
+    def __init__(self, db: FakeDatabase, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.db = db
+        self.api = FakePostgrest(db)
+        self.log = RequestLog()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeSupabaseServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="fake-supabase", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
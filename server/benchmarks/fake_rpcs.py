@@ -0,0 +1,195 @@
+"""
+Python versions of the app's Postgres functions for the fake PostgREST
+Each handler takes the JSON body of POST /rest/v1/rpc/<name> and returns
+what the SQL function in supabase/migrations returns
+"""
+from typing import Any, Dict, List
+
+from benchmarks.fake_postgrest import Condition, FakeDatabase, PostgrestError, text_matches
+
+
+def _rows(db: FakeDatabase, table: str, **equals: Any) -> List[Dict[str, Any]]:
+    conditions = [Condition(column, "eq", str(value)) for column, value in equals.items()]
+    return [
+        row for row in db.candidates(table, conditions)
+        if all(str(row.get(column)) == str(value) for column, value in equals.items())
+    ]
+
+
+def _minutes(value: str) -> int:
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def get_user_avatars(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    users = (db.auth_users.get(user_id) for user_id in params.get("user_ids") or [])
+    return [
+        {"user_id": user["id"], "avatar_url": (user.get("user_metadata") or {}).get("avatar_url")}
+        for user in users if user is not None
+    ]
+
+
+def get_student_activity_stats(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    date_from, date_to, today = params.get("p_date_from"), params.get("p_date_to"), params["p_today"]
+    counts = dict.fromkeys(("completed", "pending", "upcoming", "cancelled", "no_show", "total"), 0)
+    for apt in _rows(db, "appointments", student_id=params["p_student_id"]):
+        if (date_from and apt["scheduled_date"] < date_from) or (date_to and apt["scheduled_date"] > date_to):
+            continue
+        counts["total"] += 1
+        if apt["status"] in counts:
+            counts[apt["status"]] += 1
+        if apt["status"] == "confirmed" and apt["scheduled_date"] >= today:
+            counts["upcoming"] += 1
+    return [counts]
+
+
+def get_counselor_busy_dates(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    totals: Dict[str, List[int]] = {}
+    for apt in _rows(db, "appointments", counselor_id=params["p_counselor_id"]):
+        if apt["status"] not in ("pending", "confirmed"):
+            continue
+        if not params["p_from"] <= apt["scheduled_date"] <= params["p_to"]:
+            continue
+        day = totals.setdefault(apt["scheduled_date"], [0, 0])
+        day[0] += 1
+        day[1] += _minutes(apt["end_time"]) - _minutes(apt["start_time"])
+    return [
+        {"scheduled_date": d, "booked": booked, "booked_minutes": minutes}
+        for d, (booked, minutes) in sorted(totals.items())
+    ]
+
+
+def search_counselor_notes(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    courses = set(params.get("p_courses") or [])
+    students = {row["id"]: row for row in db.table("students") if row.get("course") in courses}
+    before = (params.get("p_before_created_at"), params.get("p_before_id"))
+    found = []
+    for note in db.table("student_notes"):
+        student = students.get(note["student_id"])
+        if student is None:
+            continue
+        if before[0] is not None and (note["created_at"], note["id"]) >= before:
+            continue
+        if not text_matches(f"{note.get('note_title') or ''} {note.get('content') or ''}", params["p_query"], "wfts"):
+            continue
+        found.append({
+            "id": note["id"],
+            "student_id": note["student_id"],
+            "note_type": note["note_type"],
+            "note_title": note["note_title"],
+            "created_at": note["created_at"],
+            "id_number": student.get("id_number"),
+            "given_name": student.get("given_name"),
+            "family_name": student.get("family_name"),
+        })
+    found.sort(key=lambda row: (row["created_at"], row["id"]), reverse=True)
+    return found[:min(max(int(params.get("p_limit") or 50), 1), 200)]
+
+
+def save_counselor_availability(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    from app.services.availability_writes import AVAILABILITY_CONTENT_COLUMNS, diff_availability
+
+    counselor_id, schedule_name = params["p_counselor_id"], params["p_schedule_name"]
+    stored = _rows(db, "counselor_availability", counselor_id=counselor_id, schedule_name=schedule_name)
+    inserts, updates, deletes = diff_availability(
+        [{"id": row["id"], **{c: row.get(c) for c in AVAILABILITY_CONTENT_COLUMNS}} for row in stored],
+        params.get("p_rows") or [],
+    )
+
+    by_id = {row["id"]: row for row in stored}
+    for row_id, changes in updates:
+        db.update_row("counselor_availability", by_id[row_id], changes)
+    if deletes:
+        doomed = set(deletes)
+        db.tables["counselor_availability"] = [row for row in db.table("counselor_availability") if row["id"] not in doomed]
+        db.touched("counselor_availability")
+    for row in inserts:
+        db.insert("counselor_availability", {"counselor_id": counselor_id, "schedule_name": schedule_name, **row})
+    return [{"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}]
+
+
+def _copy_availability(db: FakeDatabase, counselor_id: str, schedule: Dict[str, Any], source_id: str) -> None:
+    for row in _rows(db, "counselor_availability", schedule_id=source_id):
+        copy = {key: value for key, value in row.items() if key not in ("id", "schedule_id", "schedule_name")}
+        db.insert("counselor_availability", {**copy, "schedule_id": schedule["id"], "schedule_name": schedule["name"]})
+
+
+def create_counselor_schedule(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    counselor_id = params["p_counselor_id"]
+    schedules = _rows(db, "counselor_schedules", counselor_id=counselor_id)
+    source = None
+    if params.get("p_source_id") or params.get("p_source_name"):
+        source = next((
+            s for s in schedules
+            if s["id"] == params.get("p_source_id")
+            or (not params.get("p_source_id") and s["name"] == params.get("p_source_name"))
+        ), None)
+        if source is None:
+            return []
+    if any(s["name"] == params["p_name"] for s in schedules):
+        raise PostgrestError(409, "23505", "A schedule with this name already exists")
+
+    buffer = params.get("p_booking_buffer")
+    schedule = db.insert("counselor_schedules", {
+        "counselor_id": counselor_id,
+        "name": params["p_name"],
+        "is_default": bool(params.get("p_is_default")),
+        "booking_buffer": buffer if buffer is not None else (source or {}).get("booking_buffer", 24),
+    })
+    if source is not None:
+        _copy_availability(db, counselor_id, schedule, source["id"])
+    else:
+        for day in range(7):
+            weekday = 1 <= day <= 5
+            db.insert("counselor_availability", {
+                "counselor_id": counselor_id, "schedule_id": schedule["id"], "schedule_name": schedule["name"],
+                "type": "weekly", "day_of_week": day, "specific_date": None,
+                "start_time": "09:00:00" if weekday else None, "end_time": "17:00:00" if weekday else None,
+            })
+    return [dict(schedule)]
+
+
+def update_counselor_schedule(db: FakeDatabase, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    counselor_id, schedule_id, name = params["p_counselor_id"], params["p_schedule_id"], params.get("p_name")
+    schedules = _rows(db, "counselor_schedules", counselor_id=counselor_id)
+    if name is not None and any(s["name"] == name and s["id"] != schedule_id for s in schedules):
+        raise PostgrestError(409, "23505", "A schedule with this name already exists")
+    schedule = next((s for s in schedules if s["id"] == schedule_id), None)
+    if schedule is None:
+        return []
+    changes = {
+        column: params[key]
+        for key, column in (("p_name", "name"), ("p_is_default", "is_default"), ("p_booking_buffer", "booking_buffer"))
+        if params.get(key) is not None
+    }
+    db.update_row("counselor_schedules", schedule, changes)
+    if name is not None:
+        for row in _rows(db, "counselor_availability", schedule_id=schedule_id):
+            db.update_row("counselor_availability", row, {"schedule_name": name})
+    return [dict(schedule)]
+
+
+RPCS = {
+    "get_user_avatars": get_user_avatars,
+    "get_student_activity_stats": get_student_activity_stats,
+    "get_counselor_busy_dates": get_counselor_busy_dates,
+    "search_counselor_notes": search_counselor_notes,
+    "save_counselor_availability": save_counselor_availability,
+    "create_counselor_schedule": create_counselor_schedule,
+    "update_counselor_schedule": update_counselor_schedule,
+}
+
+
+def set_schedule_id(db: FakeDatabase, row: Dict[str, Any]) -> None:
+    """Mirror of the counselor_availability_set_schedule_id trigger"""
+    if row.get("schedule_id") is None:
+        schedule = next(iter(_rows(
+            db, "counselor_schedules", counselor_id=row.get("counselor_id"), name=row.get("schedule_name")
+        )), None)
+        row["schedule_id"] = schedule["id"] if schedule else None
+
+
+def install(db: FakeDatabase) -> None:
+    """Register the RPCs and insert triggers on a database"""
+    db.rpcs.update(RPCS)
+    db.insert_hooks["counselor_availability"] = set_schedule_id
@@ -0,0 +1,198 @@
+"""
+Runs the scenarios against the Flask app and compares them with a baseline
+
+For every scenario the process caches are cleared and one cold request is
+made, then `iterations` warm requests. Round trips are the requests the fake
+Supabase server received while the app handled the request, and must agree
+with the app's own Server-Timing count; latency is the wall time of the Flask
+test client call, response body included.
+"""
+import json
+import os
+import re
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.fake_postgrest import FakeDatabase, FakeSupabaseServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+JWT_SECRET = "benchmark-jwt-secret-benchmark-jwt-secret"
+
+# a warm p50 may grow to baseline * LATENCY_TOLERANCE + LATENCY_SLACK_MS
+LATENCY_TOLERANCE = 1.5
+LATENCY_SLACK_MS = 5.0
+
+
+def configure_environment(url: str) -> None:
+    """Point Config at the fake server; must run before `app` or `config` is imported"""
+    os.environ.update({
+        "SUPABASE_URL": url,
+        "SUPABASE_SERVICE_ROLE_KEY": "benchmark-service-role-key",
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        # calendar sync stays off, no Google calls or worker threads
+        "GOOGLE_CLIENT_ID": "",
+        "GOOGLE_CLIENT_SECRET": "",
+        "ENCRYPTION_KEY": "",
+    })
+
+
+def mint_token(user_id: str, url: str) -> str:
+    """An HS256 access token shaped like the ones Supabase issues"""
+    import jwt
+
+    return jwt.encode({
+        "sub": user_id,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "iss": f"{url.rstrip('/')}/auth/v1",
+        "exp": int(time.time()) + 24 * 3600,
+    }, JWT_SECRET, algorithm="HS256")
+
+
+def clear_process_caches() -> None:
+    """Forget everything the app caches in-process, so the next request is cold"""
+    from app.services import activity_stats, availability_index, busy_dates, student_ids, student_roster
+    from app.services.role_cache import invalidate_role_info
+    from app.utils.auth import get_token_verifier
+
+    invalidate_role_info()
+    get_token_verifier().clear()
+    availability_index._indexes.clear()
+    busy_dates._entries.clear()
+    activity_stats._entries.clear()
+    student_roster._rosters.clear()
+    with student_ids._lock:
+        for mapping in (student_ids._by_id_number, student_ids._by_student_id,
+                        student_ids._by_auth_id, student_ids._stored_at):
+            mapping.clear()
+
+
+def server_timing_calls(header: str) -> int:
+    """Outbound calls counted in a Server-Timing header (the desc="N calls" parts)"""
+    return sum(int(n) for n in re.findall(r'desc="(\d+) calls?"', header))
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run(iterations: int = 20, only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Seed a fake Supabase, boot the app against it and measure every scenario
+
+    Returns scenario name -> {coldRoundTrips, warmRoundTrips, p50Ms, p95Ms}.
+    Raises AssertionError when a scenario answers with an unexpected status.
+    """
+    server = FakeSupabaseServer(FakeDatabase()).start()
+    configure_environment(server.url)
+    try:
+        from benchmarks.scenarios import COUNSELOR, SCENARIOS, STUDENT
+        from benchmarks.seed import seed_database
+
+        db = server.db
+        fixtures = seed_database(db)
+
+        from app import app
+
+        client = app.test_client()
+        tokens = {
+            STUDENT: mint_token(fixtures.student_auth_id, server.url),
+            COUNSELOR: mint_token(fixtures.counselor_id, server.url),
+        }
+
+        def request(scenario) -> Dict[str, Any]:
+            call = scenario.build(db, fixtures)
+            headers = {"Authorization": f"Bearer {tokens[scenario.actor]}"} if scenario.actor else {}
+            server.log.drain()
+            started = time.perf_counter()
+            response = client.open(call.path, method=call.method, json=call.json, headers=headers)
+            body = response.get_data()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            response.close()
+            round_trips = len(server.log.drain())
+            if response.status_code != scenario.expect:
+                raise AssertionError(
+                    f"{scenario.name}: {call.method} {call.path} answered {response.status_code}, "
+                    f"expected {scenario.expect}: {body[:300]!r}"
+                )
+            # streamed bodies (no Content-Length) make calls after the header is sent
+            counted = server_timing_calls(response.headers.get("Server-Timing", ""))
+            streamed = "Content-Length" not in response.headers
+            if counted > round_trips or (counted < round_trips and not streamed):
+                raise AssertionError(
+                    f"{scenario.name}: Server-Timing counted {counted} calls, the server saw {round_trips}"
+                )
+            return {"ms": elapsed_ms, "roundTrips": round_trips}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for scenario in SCENARIOS:
+            if only and not any(scenario.name.startswith(prefix) for prefix in only):
+                continue
+            clear_process_caches()
+            cold = request(scenario)
+            warm = [request(scenario) for _ in range(iterations)]
+            latencies = [sample["ms"] for sample in warm]
+            results[scenario.name] = {
+                "coldRoundTrips": cold["roundTrips"],
+                "warmRoundTrips": max(sample["roundTrips"] for sample in warm),
+                "p50Ms": round(statistics.median(latencies), 2),
+                "p95Ms": round(_percentile(latencies, 0.95), 2),
+            }
+        return results
+    finally:
+        server.stop()
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["scenarios"]
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], path: str = BASELINE_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump({"scenarios": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = LATENCY_TOLERANCE,
+    slack_ms: float = LATENCY_SLACK_MS,
+) -> List[str]:
+    """
+    List the regressions of `results` against `baseline`
+
+    Round trips may never grow. The warm p50 may grow to
+    baseline * tolerance + slack_ms; p95 is reported but not gated, it is
+    too noisy at benchmark iteration counts.
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for key in ("coldRoundTrips", "warmRoundTrips"):
+            if result[key] > expected[key]:
+                regressions.append(f"{name}: {key} {expected[key]} -> {result[key]}")
+        limit = expected["p50Ms"] * tolerance + slack_ms
+        if result["p50Ms"] > limit:
+            regressions.append(f"{name}: p50Ms {expected['p50Ms']} -> {result['p50Ms']} (limit {limit:.2f})")
+    return regressions
+
+
+def format_report(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    baseline = baseline or {}
+    width = max(len(name) for name in results) if results else 10
+    lines = [f"{'scenario':<{width}}  {'cold rt':>7}  {'warm rt':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'base p50':>8}"]
+    for name, result in results.items():
+        expected = baseline.get(name)
+        base = f"{expected['p50Ms']:>8.2f}" if expected else f"{'new':>8}"
+        lines.append(
+            f"{name:<{width}}  {result['coldRoundTrips']:>7}  {result['warmRoundTrips']:>7}  "
+            f"{result['p50Ms']:>8.2f}  {result['p95Ms']:>8.2f}  {base}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,240 @@
+"""
+One benchmark scenario per route (and per notable variant of a route) in the
+appointments, students, counselors, availability and activity blueprints
+Scenarios that delete or transition rows create what they consume directly in
+the fake database first, so every iteration does the same work
+"""
+from datetime import timedelta
+from typing import Any, Callable, NamedTuple, Optional
+
+from benchmarks.fake_postgrest import FakeDatabase
+from benchmarks.seed import Fixtures
+
+STUDENT = "student"
+COUNSELOR = "counselor"
+
+
+class Call(NamedTuple):
+    """The request a scenario issues"""
+    method: str
+    path: str
+    json: Optional[Any] = None
+
+
+class Scenario(NamedTuple):
+    """A named request, who sends it and the status it must answer with"""
+    name: str
+    actor: Optional[str]
+    build: Callable[[FakeDatabase, Fixtures], Call]
+    expect: int = 200
+
+
+def _get(path: str) -> Callable[[FakeDatabase, Fixtures], Call]:
+    """GET of a path template formatted with the fixtures"""
+    return lambda db, fx: Call("GET", path.format(**fx._asdict()))
+
+
+# ---- appointments ---------------------------------------------------------
+
+
+def _book(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("POST", "/api/appointments", {
+        "eventTypeId": fx.instant_event_type_id,
+        "counselorId": fx.counselor_id,
+        "scheduledDate": fx.slot_date.isoformat(),
+        "startTime": "15:00",
+        "studentNotes": "Benchmark booking",
+    })
+
+
+def _pending_appointment(db: FakeDatabase, fx: Fixtures) -> str:
+    return db.insert("appointments", {
+        "student_id": fx.student_auth_id, "counselor_id": fx.counselor_id,
+        "event_type_id": fx.event_type_id, "scheduled_date": fx.slot_date.isoformat(),
+        "start_time": "10:00:00", "end_time": "11:00:00", "status": "pending",
+        "location_type": "in_person",
+    })["id"]
+
+
+def _confirm(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("PUT", f"/api/appointments/{_pending_appointment(db, fx)}/status", {
+        "status": "confirmed", "counselorNotes": "See you then",
+    })
+
+
+def _cancel(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("PUT", f"/api/appointments/{_pending_appointment(db, fx)}/status", {
+        "status": "cancelled", "reason": "Schedule conflict",
+    })
+
+
+def _slot_range(db: FakeDatabase, fx: Fixtures) -> Call:
+    start = fx.slot_date
+    return Call("GET", (
+        f"/api/appointments/available-slots?counselorId={fx.counselor_id}&eventTypeId={fx.event_type_id}"
+        f"&from={start.isoformat()}&to={(start + timedelta(days=27)).isoformat()}"
+    ))
+
+
+APPOINTMENT_SCENARIOS = [
+    Scenario("appointments.list_student", STUDENT, _get("/api/appointments?role=student")),
+    Scenario("appointments.list_counselor_term", COUNSELOR, _get(
+        "/api/appointments?role=counselor&from={term_start}&to={term_end}"
+    )),
+    Scenario("appointments.list_counselor_page", COUNSELOR, _get("/api/appointments?role=counselor&limit=50")),
+    Scenario("appointments.list_counselor_fields", COUNSELOR, _get(
+        "/api/appointments?role=counselor&limit=50&fields=id,scheduledDate,startTime,status,studentInfo"
+    )),
+    Scenario("appointments.create", STUDENT, _book, 201),
+    Scenario("appointments.get", STUDENT, _get("/api/appointments/{appointment_id}")),
+    Scenario("appointments.calendar_sync", STUDENT, _get("/api/appointments/{appointment_id}/calendar-sync")),
+    Scenario("appointments.confirm", COUNSELOR, _confirm),
+    Scenario("appointments.cancel_by_student", STUDENT, _cancel),
+    Scenario("appointments.available_slots_day", STUDENT, _get(
+        "/api/appointments/available-slots?counselorId={counselor_id}&eventTypeId={instant_event_type_id}&date={slot_date}"
+    )),
+    Scenario("appointments.available_slots_range", STUDENT, _slot_range),
+    Scenario("appointments.counselor_upcoming", STUDENT, _get("/api/appointments/counselor/{counselor_id}/upcoming")),
+]
+
+
+# ---- students -------------------------------------------------------------
+
+
+def _save_section(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("POST", "/api/students/section", {
+        "sectionIndex": 0,
+        "partIndex": 1,
+        "formData": {
+            "nickname": "Benj", "age": "19", "sex": "Male", "citizenship": "Filipino",
+            "dateOfBirth": "2007-03-14", "placeOfBirth": "Iligan City",
+            "civilStatus": "Single", "otherCivilStatus": "",
+        },
+    })
+
+
+STUDENT_SCENARIOS = [
+    Scenario("students.onboarding_status", STUDENT, _get("/api/students/profile/onboarding-status")),
+    Scenario("students.profile_exists", STUDENT, _get("/api/students/profile/exists")),
+    Scenario("students.profile_progress", STUDENT, _get("/api/students/profile/progress")),
+    Scenario("students.section_get", STUDENT, _get("/api/students/section?section=2&part=1")),
+    Scenario("students.section_save", STUDENT, _save_section),
+    Scenario("students.profile", STUDENT, _get("/api/students/profile")),
+    Scenario("students.profile_summary", STUDENT, _get("/api/students/profile/summary")),
+    Scenario("students.completion_status", STUDENT, _get("/api/students/profile/completion-status")),
+    Scenario("students.list_status", STUDENT, _get("/api/students/profile/status")),
+]
+
+
+# ---- counselors -----------------------------------------------------------
+
+
+def _bulk_statuses(db: FakeDatabase, fx: Fixtures) -> Call:
+    students = [row["auth_user_id"] for row in db.table("students") if row["course"] == fx.course][:50]
+    return Call("PUT", "/api/counselors/student-list/bulk", {"changes": [
+        {"studentAuthId": auth_id, "field": "counselingStatus", "value": "ongoing"} for auth_id in students
+    ]})
+
+
+def _add_note(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("POST", f"/api/counselors/student/{fx.id_number}/notes", {
+        "note_title": "Benchmark note", "note_type": "regular", "content": "Talked about exam stress.",
+    })
+
+
+def _edit_note(db: FakeDatabase, fx: Fixtures) -> Call:
+    return Call("PUT", f"/api/counselors/student/{fx.id_number}/notes/{fx.note_id}", {
+        "note_title": "Adjustment and sleep", "note_type": "progress", "content": "Sleeping better this week.",
+    })
+
+
+def _delete_note(db: FakeDatabase, fx: Fixtures) -> Call:
+    note = db.insert("student_notes", {
+        "student_id": fx.student_id, "note_title": "Scratch", "note_type": "regular", "content": "To delete",
+    })
+    return Call("DELETE", f"/api/counselors/student/{fx.id_number}/notes/{note['id']}")
+
+
+COUNSELOR_SCENARIOS = [
+    Scenario("counselors.assigned", STUDENT, _get("/api/counselors/assigned")),
+    Scenario("counselors.student_list_all", COUNSELOR, _get("/api/counselors/student-list")),
+    Scenario("counselors.student_list_page", COUNSELOR, _get("/api/counselors/student-list?limit=50&sort=course")),
+    Scenario("counselors.student_list_search", COUNSELOR, _get("/api/counselors/student-list?limit=50&q=dela")),
+    Scenario("counselors.export_csv", COUNSELOR, _get("/api/counselors/students/export")),
+    Scenario("counselors.student_list_bulk", COUNSELOR, _bulk_statuses),
+    Scenario("counselors.assessment", COUNSELOR, lambda db, fx: Call(
+        "PUT", f"/api/counselors/student/{fx.student_auth_id}/assessment", {"assessment": "low risk"}
+    )),
+    Scenario("counselors.counseling_status", COUNSELOR, lambda db, fx: Call(
+        "PUT", f"/api/counselors/student/{fx.student_auth_id}/counseling_status", {"counseling_status": "ongoing"}
+    )),
+    Scenario("counselors.notes_all", COUNSELOR, _get("/api/counselors/student/{id_number}/notes")),
+    Scenario("counselors.notes_page", COUNSELOR, _get("/api/counselors/student/{id_number}/notes?limit=20")),
+    Scenario("counselors.notes_student_search", COUNSELOR, _get("/api/counselors/student/{id_number}/notes?q=stress")),
+    Scenario("counselors.note_detail", COUNSELOR, _get("/api/counselors/student/{id_number}/notes/{note_id}")),
+    Scenario("counselors.notes_search", COUNSELOR, _get("/api/counselors/notes/search?q=anxiety%20family")),
+    Scenario("counselors.note_add", COUNSELOR, _add_note, 201),
+    Scenario("counselors.note_update", COUNSELOR, _edit_note),
+    Scenario("counselors.note_delete", COUNSELOR, _delete_note),
+    Scenario("counselors.student_profile", COUNSELOR, _get("/api/counselors/student/{student_auth_id}/profile")),
+    Scenario("counselors.student_email", COUNSELOR, _get("/api/counselors/student/{student_auth_id}/email")),
+    Scenario("counselors.student_exists", COUNSELOR, _get("/api/counselors/student/{student_auth_id}/exists")),
+    Scenario("counselors.student_completion", COUNSELOR, _get(
+        "/api/counselors/student/{student_auth_id}/completion-status"
+    )),
+]
+
+
+# ---- availability ---------------------------------------------------------
+
+
+def _save_availability(db: FakeDatabase, fx: Fixtures) -> Call:
+    weekly = [
+        {"dayOfWeek": day, "startTime": start, "endTime": end}
+        for day in range(1, 6)
+        for start, end in (("09:00", "12:00"), ("13:00", "17:00"))
+    ]
+    return Call("PUT", "/api/availability", {
+        "scheduleName": "Working hours",
+        "weekly": weekly,
+        "overrides": [{"date": (fx.slot_date + timedelta(days=60)).isoformat(), "startTime": None, "endTime": None}],
+    })
+
+
+def _delete_slot(db: FakeDatabase, fx: Fixtures) -> Call:
+    slot = db.insert("counselor_availability", {
+        "counselor_id": fx.counselor_id, "schedule_name": "Exam week", "type": "weekly",
+        "day_of_week": 6, "specific_date": None, "start_time": "08:00:00", "end_time": "10:00:00",
+    })
+    return Call("DELETE", f"/api/availability/{slot['id']}")
+
+
+AVAILABILITY_SCENARIOS = [
+    Scenario("availability.get", COUNSELOR, _get("/api/availability")),
+    Scenario("availability.save", COUNSELOR, _save_availability),
+    Scenario("availability.add_weekly", COUNSELOR, lambda db, fx: Call("POST", "/api/availability/weekly", {
+        "scheduleName": "Exam week", "dayOfWeek": 6, "startTime": "08:00", "endTime": "10:00",
+    }), 201),
+    Scenario("availability.add_override", COUNSELOR, lambda db, fx: Call("POST", "/api/availability/override", {
+        "date": (fx.slot_date + timedelta(days=45)).isoformat(), "startTime": "13:00", "endTime": "15:00",
+    }), 201),
+    Scenario("availability.delete_slot", COUNSELOR, _delete_slot),
+    Scenario("availability.public", None, _get("/api/availability/public/{counselor_id}")),
+]
+
+
+# ---- activity -------------------------------------------------------------
+
+ACTIVITY_SCENARIOS = [
+    Scenario("activity.stats", STUDENT, _get("/api/activity/stats")),
+    Scenario("activity.stats_range", STUDENT, _get("/api/activity/stats?from={term_start}&to={term_end}")),
+]
+
+
+SCENARIOS = (
+    APPOINTMENT_SCENARIOS
+    + STUDENT_SCENARIOS
+    + COUNSELOR_SCENARIOS
+    + AVAILABILITY_SCENARIOS
+    + ACTIVITY_SCENARIOS
+)
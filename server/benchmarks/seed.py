@@ -0,0 +1,299 @@
+"""
+Deterministic seed data for the benchmark database
+One term of a mid-sized guidance office: thousands of students spread over a
+dozen courses, a couple of counselors per course and an 18-week term of
+appointments centred on today
+"""
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from benchmarks.fake_postgrest import FakeDatabase
+from benchmarks.fake_rpcs import install
+
+COURSES = (
+    "BS Computer Science", "BS Information Technology", "BS Civil Engineering",
+    "BS Electrical Engineering", "BS Mechanical Engineering", "BS Chemistry",
+    "BS Biology", "BS Mathematics", "BS Psychology", "BS Accountancy",
+    "BA English", "BS Nursing",
+)
+
+COUNSELORS_PER_COURSE = 2
+STUDENTS = 3000
+APPOINTMENTS = 12000
+NOTES = 6000
+TERM_WEEKS = 18
+
+# notes on the fixture student, enough for several pages
+FIXTURE_STUDENT_NOTES = 45
+
+GIVEN_NAMES = (
+    "Angelo", "Bea", "Carlo", "Dianne", "Enrico", "Faith", "Gabriel", "Hannah", "Ivan", "Jasmine",
+    "Kenneth", "Lara", "Miguel", "Nicole", "Oscar", "Patricia", "Rafael", "Sofia", "Tristan", "Valerie",
+)
+FAMILY_NAMES = (
+    "Abad", "Bautista", "Castillo", "Dela Cruz", "Espinosa", "Fernandez", "Garcia", "Hernandez",
+    "Ilagan", "Jimenez", "Lopez", "Mendoza", "Navarro", "Ocampo", "Pascual", "Quimpo", "Reyes",
+    "Santos", "Tan", "Villanueva",
+)
+NOTE_WORDS = (
+    "anxiety", "academic", "family", "stress", "adjustment", "motivation", "grades", "sleep",
+    "financial", "referral", "follow-up", "progress", "career", "relationships", "attendance",
+    "scholarship", "wellbeing", "exam", "homesick", "peer",
+)
+
+# (name, duration, requires_approval, category)
+EVENT_TYPES = (
+    ("Initial interview", 60, True, "interview"),
+    ("Counseling session", 60, True, "counseling"),
+    ("Quick consultation", 30, False, "consultation"),
+)
+
+WORKING_HOURS = (("09:00:00", "12:00:00"), ("13:00:00", "17:00:00"))
+
+
+class Fixtures(NamedTuple):
+    """IDs the scenarios address: one counselor and one of their students"""
+    counselor_id: str
+    course: str
+    student_auth_id: str
+    student_id: str
+    id_number: str
+    event_type_id: str
+    instant_event_type_id: str
+    appointment_id: str
+    note_id: str
+    slot_date: date
+    term_start: date
+    term_end: date
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(day: date, rng: random.Random) -> str:
+    moment = datetime.combine(day, time(8), tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(9 * 3600))
+    return moment.isoformat(timespec="microseconds")
+
+
+def _form_value(column: str, converter: Any, rng: random.Random) -> Any:
+    from app.models.student import CHOICE, MEDICAL, MULTI_SELECT, STATUS
+
+    if converter in (STATUS, CHOICE):
+        return rng.random() < 0.5
+    if converter is MULTI_SELECT:
+        return rng.sample(["Option A", "Option B", "Option C", "Option D"], rng.randint(1, 3))
+    if converter is MEDICAL:
+        return None
+    return f"{column.replace('_', ' ')} {rng.randint(1, 99)}"
+
+
+def _student_row(index: int, auth_id: str, course: str, rng: random.Random) -> Dict[str, Any]:
+    from app.models.student import STUDENT_FORM_FIELDS
+
+    row: Dict[str, Any] = {}
+    for _, fields in STUDENT_FORM_FIELDS.values():
+        for field in fields:
+            row[field.column] = _form_value(field.column, field.converter, rng)
+    row.update({
+        "id": _uuid(rng),
+        "auth_user_id": auth_id,
+        "id_number": f"2024-{index:04d}",
+        "course": course,
+        "given_name": rng.choice(GIVEN_NAMES),
+        "family_name": rng.choice(FAMILY_NAMES),
+        "middle_initial": chr(65 + rng.randrange(26)),
+        "academic_year": "2026-2027",
+    })
+    for flag in (
+        "is_personal_data_complete", "is_family_data_complete", "is_academic_data_complete",
+        "is_distance_learning_data_complete", "is_psychosocial_data_complete", "is_needs_assessment_data_complete",
+    ):
+        row[flag] = rng.random() < 0.8
+    return row
+
+
+def _next_weekday(day: date, skip: set) -> date:
+    while day.weekday() >= 5 or day.isoformat() in skip:
+        day += timedelta(days=1)
+    return day
+
+
+def seed_database(db: FakeDatabase, seed: int = 2026, today: Optional[date] = None) -> Fixtures:
+    """
+    Fill an empty FakeDatabase and register its RPCs
+
+    Student columns come from the app's form field tables, so app.models must
+    be importable (the environment configured) before this is called.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    term_start = today - timedelta(weeks=TERM_WEEKS // 2, days=today.weekday())
+    term_end = term_start + timedelta(weeks=TERM_WEEKS, days=-1)
+
+    install(db)
+    tables = db.tables
+
+    def auth_user(user_id: str, email: str) -> None:
+        db.auth_users[user_id] = {
+            "id": user_id,
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "app_metadata": {"provider": "google"},
+            "user_metadata": {"avatar_url": f"https://avatars.example.test/{user_id}.png"},
+            "created_at": "2026-06-01T00:00:00+00:00",
+        }
+
+    # counselors, their schedules, availability and event types
+    counselors: Dict[str, List[str]] = {course: [] for course in COURSES}
+    event_types: Dict[str, List[Dict[str, Any]]] = {}
+    skipped_dates: Dict[str, set] = {}
+    for c_index in range(len(COURSES) * COUNSELORS_PER_COURSE):
+        course = COURSES[c_index // COUNSELORS_PER_COURSE]
+        counselor_id = _uuid(rng)
+        counselors[course].append(counselor_id)
+        auth_user(counselor_id, f"counselor{c_index}@g.msuiit.edu.ph")
+        tables.setdefault("profiles", []).append({
+            "id": counselor_id, "role": "counselor", "first_name": rng.choice(GIVEN_NAMES),
+            "onboarding_completed": True,
+        })
+        tables.setdefault("counselor_course_filters", []).append({
+            "id": _uuid(rng), "auth_user_id": counselor_id, "course": course,
+        })
+
+        schedules = []
+        for name, is_default, hours in (
+            ("Working hours", True, WORKING_HOURS),
+            ("Exam week", False, (("08:00:00", "12:00:00"),)),
+        ):
+            schedule = {
+                "id": _uuid(rng), "counselor_id": counselor_id, "name": name,
+                "is_default": is_default, "booking_buffer": 24,
+            }
+            tables.setdefault("counselor_schedules", []).append(schedule)
+            schedules.append(schedule)
+            for day_of_week in range(1, 6):
+                for start, end in hours:
+                    tables.setdefault("counselor_availability", []).append({
+                        "id": _uuid(rng), "counselor_id": counselor_id, "schedule_id": schedule["id"],
+                        "schedule_name": name, "type": "weekly", "day_of_week": day_of_week,
+                        "specific_date": None, "start_time": start, "end_time": end,
+                    })
+
+        # a past and a couple of upcoming days off on the default schedule
+        days_off = {(today + timedelta(days=offset)).isoformat() for offset in (-10, rng.randint(3, 20), rng.randint(21, 40))}
+        skipped_dates[counselor_id] = days_off
+        for day_off in sorted(days_off):
+            tables["counselor_availability"].append({
+                "id": _uuid(rng), "counselor_id": counselor_id, "schedule_id": schedules[0]["id"],
+                "schedule_name": "Working hours", "type": "override", "day_of_week": None,
+                "specific_date": day_off, "start_time": None, "end_time": None,
+            })
+
+        event_types[counselor_id] = []
+        for e_index, (name, duration, requires_approval, category) in enumerate(EVENT_TYPES):
+            event_type = {
+                "id": _uuid(rng), "counselor_id": counselor_id, "name": name, "duration": duration,
+                "color": "#3b82f6", "category": category, "description": f"{name} with the guidance office",
+                "location_type": "in_person", "location_details": "Guidance Office, 2nd floor",
+                "requires_approval": requires_approval, "is_active": True,
+                "buffer_before": 0, "buffer_after": 10 if duration == 60 else 0,
+                "schedule_id": schedules[1]["id"] if e_index == 1 else None,
+                "max_bookings_per_day": 6 if e_index == 0 else None,
+            }
+            tables.setdefault("event_types", []).append(event_type)
+            event_types[counselor_id].append(event_type)
+
+    # students, their list rows, profiles and emails
+    students = []
+    for s_index in range(STUDENTS):
+        course = COURSES[s_index % len(COURSES)]
+        auth_id = _uuid(rng)
+        student = _student_row(s_index, auth_id, course, rng)
+        students.append(student)
+        tables.setdefault("students", []).append(student)
+        email = f"student{s_index}@g.msuiit.edu.ph"
+        auth_user(auth_id, email)
+        tables.setdefault("students_with_email", []).append({"auth_user_id": auth_id, "email": email})
+        tables.setdefault("profiles", []).append({
+            "id": auth_id, "role": "student", "first_name": student["given_name"],
+            "onboarding_completed": rng.random() < 0.9, "student_profile_id": student["id"],
+        })
+        tables.setdefault("student_list", []).append({
+            "id": _uuid(rng), "student_id": auth_id, "year_level": str(rng.randint(1, 4)),
+            "assessment": rng.choice(["pending", "high risk", "low risk"]),
+            "initial_interview": rng.choice(["not started", "scheduled", "completed"]),
+            "counseling_status": rng.choice(["no record", "ongoing", "closed"]),
+            "exit_interview": rng.choice(["not started", "scheduled", "completed"]),
+        })
+
+    # a term of appointments; each student books with a counselor of their course
+    fixture_student = students[0]
+    fixture_counselor = counselors[fixture_student["course"]][0]
+    term_days = [term_start + timedelta(days=d) for d in range((term_end - term_start).days + 1)]
+    term_days = [d for d in term_days if d.weekday() < 5]
+    for a_index in range(APPOINTMENTS):
+        student = students[a_index % STUDENTS]
+        counselor_id = counselors[student["course"]][0 if student is fixture_student else rng.randrange(COUNSELORS_PER_COURSE)]
+        event_type = rng.choice(event_types[counselor_id])
+        day = rng.choice(term_days)
+        window_start, window_end = rng.choice(WORKING_HOURS)
+        start_minutes = int(window_start[:2]) * 60 + 30 * rng.randrange(
+            (int(window_end[:2]) - int(window_start[:2])) * 2 - event_type["duration"] // 30 + 1
+        )
+        end_minutes = start_minutes + event_type["duration"]
+        if day < today:
+            status = rng.choices(["completed", "cancelled", "no_show", "confirmed"], [70, 12, 8, 10])[0]
+        else:
+            status = rng.choices(["confirmed", "pending", "cancelled"], [60, 30, 10])[0]
+        created_at = _timestamp(max(term_start, day - timedelta(days=rng.randint(1, 14))), rng)
+        tables.setdefault("appointments", []).append({
+            "id": _uuid(rng), "student_id": student["auth_user_id"], "counselor_id": counselor_id,
+            "event_type_id": event_type["id"], "scheduled_date": day.isoformat(),
+            "start_time": f"{start_minutes // 60:02d}:{start_minutes % 60:02d}:00",
+            "end_time": f"{end_minutes // 60:02d}:{end_minutes % 60:02d}:00",
+            "status": status, "student_notes": "Would like to talk about my classes",
+            "counselor_notes": None, "location_type": event_type["location_type"],
+            "location_details": event_type["location_details"], "cancellation_reason": None,
+            "created_at": created_at, "updated_at": created_at,
+            "confirmed_at": created_at if status in ("confirmed", "completed") else None,
+            "cancelled_at": created_at if status == "cancelled" else None,
+            "completed_at": _timestamp(day, rng) if status == "completed" else None,
+            "last_calendar_sync_at": None,
+        })
+
+    # counselor notes, with a long history on the fixture student
+    for n_index in range(NOTES + FIXTURE_STUDENT_NOTES):
+        student = fixture_student if n_index < FIXTURE_STUDENT_NOTES else rng.choice(students)
+        words = rng.sample(NOTE_WORDS, 6)
+        tables.setdefault("student_notes", []).append({
+            "id": _uuid(rng), "student_id": student["id"],
+            "note_type": rng.choice(["regular", "progress", "closure"]),
+            "note_title": f"{words[0].capitalize()} and {words[1]}",
+            "content": f"Discussed {words[2]}, {words[3]} and {words[4]}. Plan: {words[5]} check-in next week.",
+            "created_at": _timestamp(rng.choice([d for d in term_days if d <= today] or [today]), rng),
+        })
+
+    fixture_appointment = next(
+        apt for apt in tables["appointments"]
+        if apt["student_id"] == fixture_student["auth_user_id"] and apt["counselor_id"] == fixture_counselor
+    )
+    fixture_note = next(note for note in tables["student_notes"] if note["student_id"] == fixture_student["id"])
+
+    return Fixtures(
+        counselor_id=fixture_counselor,
+        course=fixture_student["course"],
+        student_auth_id=fixture_student["auth_user_id"],
+        student_id=fixture_student["id"],
+        id_number=fixture_student["id_number"],
+        event_type_id=event_types[fixture_counselor][0]["id"],
+        instant_event_type_id=event_types[fixture_counselor][2]["id"],
+        appointment_id=fixture_appointment["id"],
+        note_id=fixture_note["id"],
+        slot_date=_next_weekday(today + timedelta(days=2), skipped_dates[fixture_counselor]),
+        term_start=term_start,
+        term_end=term_end,
+    )
@@ -0,0 +1,118 @@
+"""
+python -m benchmarks.student_model_check [--record MODULE_PATH]
+
+Checks that app/models/student.py still gives the answers of the hand-written
+transforms and completeness checkers it replaced. Every transform_* /
+transform_from_* function and every check_*_complete checker is run over a
+fixed corpus of students rows (seeded rows plus, for each column, the row with
+that column emptied or set to "Others") and its output is compared with
+benchmarks/student_model_golden.json.
+
+The golden file was recorded from the last hand-written version:
+    git show befaef5^:server/app/models/student.py > /tmp/student_before.py
+    python -m benchmarks.student_model_check --record /tmp/student_before.py
+
+Exits with status 1 when any function's output differs.
+"""
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import sys
+from types import ModuleType
+from typing import Any, Dict, List
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "student_model_golden.json")
+
+CHECKERS = (
+    "check_personal_data_complete",
+    "check_family_data_complete",
+    "check_academic_data_complete",
+    "check_distance_learning_data_complete",
+    "check_psychosocial_data_complete",
+    "check_needs_assessment_data_complete",
+)
+
+# values every column is set to in turn, on top of a complete row
+EMPTY_VARIANTS = (None, "", [], ["Others"], ["Option A", "Others"], "Existing", "None", True, False)
+
+
+def build_corpus(rows: int = 40, seed: int = 2026) -> List[Dict[str, Any]]:
+    """Seeded students rows over every form column, plus one-column variants"""
+    from app.models.student import STUDENT_FORM_FIELDS
+    from benchmarks.seed import _form_value
+
+    rng = random.Random(seed)
+    fields = [field for _, part_fields in STUDENT_FORM_FIELDS.values() for field in part_fields]
+    corpus = [
+        {field.column: _form_value(field.column, field.converter, rng) for field in fields}
+        for _ in range(rows)
+    ]
+    base = corpus[0]
+    for column in sorted({field.column for field in fields}):
+        for value in EMPTY_VARIANTS:
+            corpus.append({**base, column: value})
+    return corpus
+
+
+def _digest(outputs: List[Any]) -> str:
+    encoded = json.dumps(outputs, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def fingerprint(module: ModuleType, corpus: List[Dict[str, Any]]) -> Dict[str, str]:
+    """function name -> digest of its outputs over the corpus"""
+    names = sorted(
+        name for name in dir(module)
+        if name.startswith("transform_from_") or name in CHECKERS
+    )
+    result = {}
+    for name in names:
+        func = getattr(module, name)
+        result[name] = _digest([func(record) for record in corpus])
+        if name.startswith("transform_from_"):
+            # feed what the form would send back into the forward transform
+            to_db = getattr(module, "transform_" + name[len("transform_from_"):])
+            result[to_db.__name__] = _digest([to_db(func(record)) for record in corpus])
+    return result
+
+
+def _load_module(path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location("student_model_recorded", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.student_model_check")
+    parser.add_argument("--record", metavar="MODULE_PATH", help="write the golden file from this student.py instead")
+    parser.add_argument("--golden", default=GOLDEN_PATH)
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus()
+
+    if args.record:
+        with open(args.golden, "w") as f:
+            json.dump(fingerprint(_load_module(args.record), corpus), f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Golden outputs written to {args.golden}")
+        return 0
+
+    from app.models import student
+
+    with open(args.golden) as f:
+        golden = json.load(f)
+    current = fingerprint(student, corpus)
+
+    failures = [name for name in sorted(golden) if current.get(name) != golden[name]]
+    for name in failures:
+        print(f"  {name}: {'missing' if name not in current else 'output differs'}")
+    print(f"{len(golden) - len(failures)}/{len(golden)} functions match over {len(corpus)} records")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
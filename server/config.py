@@ -10,9 +10,47 @@ class Config:
 
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+    # Access token verification
+    # HS256 projects set the JWT secret; asymmetric keys are read from the JWKS
+    SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+    SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    SUPABASE_JWKS_TTL = int(os.getenv("SUPABASE_JWKS_TTL", "600"))
+    AUTH_CLAIMS_CACHE_SIZE = int(os.getenv("AUTH_CLAIMS_CACHE_SIZE", "4096"))
+
+    # Supabase HTTP connection pool (shared per worker process)
+    SUPABASE_HTTP_MAX_CONNECTIONS = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "20"))
+    SUPABASE_HTTP_MAX_KEEPALIVE = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "10"))
+    SUPABASE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "30"))
+    SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", "30"))
+
+    # Per-request outbound call metrics (Server-Timing header)
+    # the debug block is added to JSON bodies of requests sent with X-Debug-Timing: 1
+    REQUEST_METRICS_ENABLED = os.getenv("REQUEST_METRICS_ENABLED", "True").lower() in ["true", "1", "t"]
+    REQUEST_METRICS_DEBUG = os.getenv("REQUEST_METRICS_DEBUG", "False").lower() in ["true", "1", "t"]
+
+    # In-process caches (seconds)
+    AVAILABILITY_INDEX_TTL = float(os.getenv("AVAILABILITY_INDEX_TTL", "120"))
+    BUSY_DATES_TTL = float(os.getenv("BUSY_DATES_TTL", "60"))
+    ACTIVITY_STATS_TTL = float(os.getenv("ACTIVITY_STATS_TTL", "300"))
+    STUDENT_ROSTER_TTL = float(os.getenv("STUDENT_ROSTER_TTL", "300"))
+    STUDENT_ID_CACHE_TTL = float(os.getenv("STUDENT_ID_CACHE_TTL", "600"))
+    ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", "60"))
+    ROLE_CACHE_MAX_ENTRIES = int(os.getenv("ROLE_CACHE_MAX_ENTRIES", "10000"))
     
     # Google Calendar OAuth
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
     GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:5000/api/calendar/oauth/callback")
-    ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")  # Fernet encryption key for tokens
\ No newline at end of file
+    ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY")  # Fernet encryption key for tokens
+
+    # Cached Google OAuth credentials (seconds)
+    GOOGLE_CREDENTIALS_REFRESH_MARGIN = float(os.getenv("GOOGLE_CREDENTIALS_REFRESH_MARGIN", "300"))
+    GOOGLE_CREDENTIALS_REFRESH_INTERVAL = float(os.getenv("GOOGLE_CREDENTIALS_REFRESH_INTERVAL", "60"))
+    GOOGLE_CREDENTIALS_IDLE_TTL = float(os.getenv("GOOGLE_CREDENTIALS_IDLE_TTL", "3600"))
+
+    # Background calendar sync (outbox worker pool)
+    CALENDAR_SYNC_WORKERS = int(os.getenv("CALENDAR_SYNC_WORKERS", "2"))
+    CALENDAR_SYNC_MAX_ATTEMPTS = int(os.getenv("CALENDAR_SYNC_MAX_ATTEMPTS", "5"))
+    CALENDAR_SYNC_RETRY_BASE_SECONDS = float(os.getenv("CALENDAR_SYNC_RETRY_BASE_SECONDS", "30"))
+    CALENDAR_SYNC_SWEEP_SECONDS = float(os.getenv("CALENDAR_SYNC_SWEEP_SECONDS", "15"))
\ No newline at end of file
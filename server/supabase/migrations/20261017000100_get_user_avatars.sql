@@ -0,0 +1,16 @@
+-- Bulk avatar lookup used by GET /api/appointments
+-- Replaces one auth.admin.get_user_by_id call per appointment row
+create or replace function public.get_user_avatars(user_ids uuid[])
+returns table (user_id uuid, avatar_url text)
+language sql
+stable
+security definer
+set search_path = public, auth
+as $$
+    select u.id as user_id, u.raw_user_meta_data ->> 'avatar_url' as avatar_url
+    from auth.users u
+    where u.id = any(user_ids);
+$$;
+
+revoke all on function public.get_user_avatars(uuid[]) from public, anon, authenticated;
+grant execute on function public.get_user_avatars(uuid[]) to service_role;
@@ -0,0 +1,7 @@
+-- Keyset pagination for GET /api/appointments
+-- Rows are ordered by (scheduled_date, start_time, id) per student or counselor
+create index if not exists appointments_student_keyset_idx
+    on public.appointments (student_id, scheduled_date, start_time, id);
+
+create index if not exists appointments_counselor_keyset_idx
+    on public.appointments (counselor_id, scheduled_date, start_time, id);
@@ -0,0 +1,19 @@
+-- Outbox for background Google Calendar sync
+-- One row per appointment; a newer action replaces a job that has not run yet
+create table if not exists public.calendar_sync_jobs (
+    appointment_id uuid primary key references public.appointments (id) on delete cascade,
+    action text not null check (action in ('create', 'confirmed', 'cancelled', 'completed')),
+    status text not null default 'pending' check (status in ('pending', 'processing', 'done', 'failed')),
+    attempts integer not null default 0,
+    last_error text,
+    run_token uuid not null default gen_random_uuid(),
+    next_attempt_at timestamptz not null default now(),
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+
+-- sweeper scans due retries and stale claims
+create index if not exists calendar_sync_jobs_due_idx
+    on public.calendar_sync_jobs (status, next_attempt_at);
+
+alter table public.calendar_sync_jobs enable row level security;
@@ -0,0 +1,48 @@
+-- One student record per auth user, so a concurrent first save of
+-- POST /api/students/section fails with a unique violation (and is retried
+-- as an update) instead of creating a second record
+-- Existing duplicates are left alone: the index is skipped with a notice
+-- listing them, to be merged by hand and this migration re-run
+do $$
+declare
+    v_duplicates text;
+begin
+    select string_agg(auth_user_id::text, ', ')
+    into v_duplicates
+    from (
+        select auth_user_id
+        from public.students
+        where auth_user_id is not null
+        group by auth_user_id
+        having count(*) > 1
+    ) d;
+
+    if v_duplicates is not null then
+        raise notice 'students_auth_user_id_key not created, duplicate students rows for auth users: %', v_duplicates;
+    else
+        create unique index if not exists students_auth_user_id_key
+            on public.students (auth_user_id);
+    end if;
+end;
+$$;
+
+-- Link the profile to a newly created student record in the same statement,
+-- replacing the follow-up profiles update the API used to issue
+create or replace function public.link_student_profile()
+returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    update public.profiles
+    set student_profile_id = new.id
+    where id = new.auth_user_id;
+    return new;
+end;
+$$;
+
+drop trigger if exists students_link_profile on public.students;
+create trigger students_link_profile
+    after insert on public.students
+    for each row execute function public.link_student_profile();
@@ -0,0 +1,37 @@
+-- Grouped counts for GET /api/activity/stats
+-- One scan of a student's appointments (appointments_student_keyset_idx)
+-- instead of shipping every row to the API
+create or replace function public.get_student_activity_stats(
+    p_student_id uuid,
+    p_today date,
+    p_date_from date default null,
+    p_date_to date default null
+)
+returns table (
+    completed bigint,
+    pending bigint,
+    upcoming bigint,
+    cancelled bigint,
+    no_show bigint,
+    total bigint
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+    select
+        count(*) filter (where status = 'completed'),
+        count(*) filter (where status = 'pending'),
+        count(*) filter (where status = 'confirmed' and scheduled_date >= p_today),
+        count(*) filter (where status = 'cancelled'),
+        count(*) filter (where status = 'no_show'),
+        count(*)
+    from public.appointments
+    where student_id = p_student_id
+      and (p_date_from is null or scheduled_date >= p_date_from)
+      and (p_date_to is null or scheduled_date <= p_date_to);
+$$;
+
+revoke all on function public.get_student_activity_stats(uuid, date, date, date) from public, anon, authenticated;
+grant execute on function public.get_student_activity_stats(uuid, date, date, date) to service_role;
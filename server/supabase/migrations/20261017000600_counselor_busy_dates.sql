@@ -0,0 +1,31 @@
+-- Per-day booking counts for GET /api/appointments/counselor/<id>/upcoming
+-- Grouped over a bounded window using appointments_counselor_keyset_idx
+create or replace function public.get_counselor_busy_dates(
+    p_counselor_id uuid,
+    p_from date,
+    p_to date
+)
+returns table (
+    scheduled_date date,
+    booked bigint,
+    booked_minutes bigint
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+    select
+        a.scheduled_date,
+        count(*),
+        coalesce(sum(extract(epoch from (a.end_time - a.start_time)) / 60), 0)::bigint
+    from public.appointments a
+    where a.counselor_id = p_counselor_id
+      and a.scheduled_date between p_from and p_to
+      and a.status in ('pending', 'confirmed')
+    group by a.scheduled_date
+    order by a.scheduled_date;
+$$;
+
+revoke all on function public.get_counselor_busy_dates(uuid, date, date) from public, anon, authenticated;
+grant execute on function public.get_counselor_busy_dates(uuid, date, date) to service_role;
@@ -0,0 +1,63 @@
+-- Keyset pagination and full-text search for counselor notes
+-- Titles weigh more than bodies; 'simple' keeps names and Filipino terms unstemmed
+alter table public.student_notes
+    add column if not exists search_tsv tsvector
+    generated always as (
+        setweight(to_tsvector('simple', coalesce(note_title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+    ) stored;
+
+create index if not exists student_notes_search_tsv_idx
+    on public.student_notes using gin (search_tsv);
+
+-- newest-first pages per student: (created_at, id) desc
+create index if not exists student_notes_student_keyset_idx
+    on public.student_notes (student_id, created_at desc, id desc);
+
+-- Search every note of the students in a counselor's courses
+-- Returns metadata only, newest first, after an optional (created_at, id) cursor
+create or replace function public.search_counselor_notes(
+    p_courses text[],
+    p_query text,
+    p_limit integer default 50,
+    p_before_created_at timestamptz default null,
+    p_before_id uuid default null
+)
+returns table (
+    id uuid,
+    student_id uuid,
+    note_type text,
+    note_title text,
+    created_at timestamptz,
+    id_number text,
+    given_name text,
+    family_name text
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+    select
+        n.id,
+        n.student_id,
+        n.note_type::text,
+        n.note_title::text,
+        n.created_at,
+        s.id_number::text,
+        s.given_name::text,
+        s.family_name::text
+    from public.student_notes n
+    join public.students s on s.id = n.student_id
+    where s.course = any(p_courses)
+      and n.search_tsv @@ websearch_to_tsquery('simple', p_query)
+      and (
+          p_before_created_at is null
+          or (n.created_at, n.id) < (p_before_created_at, p_before_id)
+      )
+    order by n.created_at desc, n.id desc
+    limit least(greatest(p_limit, 1), 200);
+$$;
+
+revoke all on function public.search_counselor_notes(text[], text, integer, timestamptz, uuid) from public, anon, authenticated;
+grant execute on function public.search_counselor_notes(text[], text, integer, timestamptz, uuid) to service_role;
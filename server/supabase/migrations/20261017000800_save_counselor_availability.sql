@@ -0,0 +1,129 @@
+-- Diff-based replacement of one schedule's availability for PUT /api/availability
+-- Runs as a single statement, so slot readers see either the old or the new
+-- schedule and never a half-written one
+create or replace function public.save_counselor_availability(
+    p_counselor_id uuid,
+    p_schedule_name text,
+    p_rows jsonb
+)
+returns table (
+    inserted integer,
+    updated integer,
+    deleted integer
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_inserted integer;
+    v_updated integer;
+    v_deleted integer;
+begin
+    -- concurrent saves of the same schedule would both insert the same rows
+    perform pg_advisory_xact_lock(hashtextextended(p_counselor_id::text || ':' || p_schedule_name, 0));
+
+    with wanted as (
+        -- with ordinality cannot be combined with a column definition list
+        -- directly, only through rows from (...)
+        select *
+        from rows from (
+            jsonb_to_recordset(p_rows) as (
+                id uuid,
+                type text,
+                day_of_week integer,
+                specific_date date,
+                start_time time,
+                end_time time
+            )
+        ) with ordinality as w(id, type, day_of_week, specific_date, start_time, end_time, pos)
+    ),
+    stored as (
+        select a.id, a.type, a.day_of_week, a.specific_date, a.start_time, a.end_time
+        from public.counselor_availability a
+        where a.counselor_id = p_counselor_id
+          and a.schedule_name = p_schedule_name
+    ),
+    -- rows sent back with the id from GET keep that row
+    by_id as (
+        select distinct on (s.id) w.pos, s.id
+        from wanted w
+        join stored s on s.id = w.id
+        order by s.id, w.pos
+    ),
+    -- everything else pairs up with an identical stored row, one to one
+    wanted_rest as (
+        select w.*, row_number() over (
+            partition by w.type, w.day_of_week, w.specific_date, w.start_time, w.end_time
+            order by w.pos
+        ) as rn
+        from wanted w
+        where w.pos not in (select pos from by_id)
+    ),
+    stored_rest as (
+        select s.*, row_number() over (
+            partition by s.type, s.day_of_week, s.specific_date, s.start_time, s.end_time
+            order by s.id
+        ) as rn
+        from stored s
+        where s.id not in (select id from by_id)
+    ),
+    by_content as (
+        select w.pos, s.id
+        from wanted_rest w
+        join stored_rest s
+          on s.type = w.type
+         and s.day_of_week is not distinct from w.day_of_week
+         and s.specific_date is not distinct from w.specific_date
+         and s.start_time is not distinct from w.start_time
+         and s.end_time is not distinct from w.end_time
+         and s.rn = w.rn
+    ),
+    matched as (
+        select pos, id from by_id
+        union all
+        select pos, id from by_content
+    ),
+    upd as (
+        update public.counselor_availability a
+        set type = w.type,
+            day_of_week = w.day_of_week,
+            specific_date = w.specific_date,
+            start_time = w.start_time,
+            end_time = w.end_time
+        from by_id b
+        join wanted w on w.pos = b.pos
+        where a.id = b.id
+          and (a.type, a.day_of_week, a.specific_date, a.start_time, a.end_time)
+              is distinct from (w.type, w.day_of_week, w.specific_date, w.start_time, w.end_time)
+        returning a.id
+    ),
+    del as (
+        delete from public.counselor_availability a
+        using stored s
+        where a.id = s.id
+          and s.id not in (select id from matched)
+        returning a.id
+    ),
+    ins as (
+        insert into public.counselor_availability (
+            counselor_id, schedule_name, type, day_of_week, specific_date, start_time, end_time
+        )
+        select p_counselor_id, p_schedule_name, w.type, w.day_of_week, w.specific_date, w.start_time, w.end_time
+        from wanted w
+        where w.pos not in (select pos from matched)
+        order by w.pos
+        returning id
+    )
+    select
+        (select count(*) from ins)::integer,
+        (select count(*) from upd)::integer,
+        (select count(*) from del)::integer
+    into v_inserted, v_updated, v_deleted;
+
+    return query select v_inserted, v_updated, v_deleted;
+end;
+$$;
+
+revoke all on function public.save_counselor_availability(uuid, text, jsonb) from public, anon, authenticated;
+grant execute on function public.save_counselor_availability(uuid, text, jsonb) to service_role;
@@ -0,0 +1,164 @@
+-- Key counselor_availability by schedule ID and move schedule copy / rename
+-- into set-based functions for /api/schedules
+
+alter table public.counselor_availability
+    add column if not exists schedule_id uuid references public.counselor_schedules (id) on delete cascade;
+
+update public.counselor_availability a
+set schedule_id = s.id
+from public.counselor_schedules s
+where a.schedule_id is null
+  and s.counselor_id = a.counselor_id
+  and s.name = a.schedule_name;
+
+create index if not exists counselor_availability_schedule_idx
+    on public.counselor_availability (schedule_id);
+
+-- Writers that still address a schedule by name get its ID filled in
+create or replace function public.counselor_availability_set_schedule_id()
+returns trigger
+language plpgsql
+set search_path = public
+as $$
+begin
+    if new.schedule_id is null then
+        select s.id into new.schedule_id
+        from public.counselor_schedules s
+        where s.counselor_id = new.counselor_id
+          and s.name = new.schedule_name;
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists counselor_availability_set_schedule_id on public.counselor_availability;
+create trigger counselor_availability_set_schedule_id
+    before insert on public.counselor_availability
+    for each row execute function public.counselor_availability_set_schedule_id();
+
+
+-- Create a schedule, copying another schedule's availability in one
+-- INSERT ... SELECT, or seeding Mon-Fri 09:00-17:00 when there is no source.
+-- The source is looked up by ID, else by name. Returns no row when a
+-- requested source does not exist; a taken name raises unique_violation.
+create or replace function public.create_counselor_schedule(
+    p_counselor_id uuid,
+    p_name text,
+    p_is_default boolean default false,
+    p_booking_buffer integer default null,
+    p_source_id uuid default null,
+    p_source_name text default null
+)
+returns setof public.counselor_schedules
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_source public.counselor_schedules;
+    v_schedule public.counselor_schedules;
+begin
+    if p_source_id is not null or p_source_name is not null then
+        select * into v_source
+        from public.counselor_schedules s
+        where s.counselor_id = p_counselor_id
+          and (s.id = p_source_id or (p_source_id is null and s.name = p_source_name))
+        limit 1;
+
+        if v_source.id is null then
+            return;
+        end if;
+    end if;
+
+    if exists (
+        select 1 from public.counselor_schedules s
+        where s.counselor_id = p_counselor_id and s.name = p_name
+    ) then
+        raise exception 'A schedule with this name already exists' using errcode = 'unique_violation';
+    end if;
+
+    insert into public.counselor_schedules (counselor_id, name, is_default, booking_buffer)
+    values (
+        p_counselor_id,
+        p_name,
+        coalesce(p_is_default, false),
+        coalesce(p_booking_buffer, v_source.booking_buffer, 24)
+    )
+    returning * into v_schedule;
+
+    if v_source.id is not null then
+        insert into public.counselor_availability (
+            counselor_id, schedule_id, schedule_name, type, day_of_week, specific_date, start_time, end_time
+        )
+        select p_counselor_id, v_schedule.id, v_schedule.name, a.type, a.day_of_week, a.specific_date, a.start_time, a.end_time
+        from public.counselor_availability a
+        where a.schedule_id = v_source.id;
+    else
+        insert into public.counselor_availability (
+            counselor_id, schedule_id, schedule_name, type, day_of_week, specific_date, start_time, end_time
+        )
+        select
+            p_counselor_id, v_schedule.id, v_schedule.name, 'weekly', d, null,
+            case when d between 1 and 5 then time '09:00' end,
+            case when d between 1 and 5 then time '17:00' end
+        from generate_series(0, 6) as d;
+    end if;
+
+    return next v_schedule;
+end;
+$$;
+
+revoke all on function public.create_counselor_schedule(uuid, text, boolean, integer, uuid, text) from public, anon, authenticated;
+grant execute on function public.create_counselor_schedule(uuid, text, boolean, integer, uuid, text) to service_role;
+
+
+-- Update a schedule's name, default flag or booking buffer (null = unchanged).
+-- A rename relabels its availability through the schedule_id index. Returns
+-- no row when the schedule does not exist; a taken name raises unique_violation.
+create or replace function public.update_counselor_schedule(
+    p_counselor_id uuid,
+    p_schedule_id uuid,
+    p_name text default null,
+    p_is_default boolean default null,
+    p_booking_buffer integer default null
+)
+returns setof public.counselor_schedules
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_schedule public.counselor_schedules;
+begin
+    if p_name is not null and exists (
+        select 1 from public.counselor_schedules s
+        where s.counselor_id = p_counselor_id and s.name = p_name and s.id <> p_schedule_id
+    ) then
+        raise exception 'A schedule with this name already exists' using errcode = 'unique_violation';
+    end if;
+
+    update public.counselor_schedules s
+    set name = coalesce(p_name, s.name),
+        is_default = coalesce(p_is_default, s.is_default),
+        booking_buffer = coalesce(p_booking_buffer, s.booking_buffer)
+    where s.id = p_schedule_id
+      and s.counselor_id = p_counselor_id
+    returning s.* into v_schedule;
+
+    if v_schedule.id is null then
+        return;
+    end if;
+
+    if p_name is not null then
+        update public.counselor_availability a
+        set schedule_name = p_name
+        where a.schedule_id = p_schedule_id
+          and a.schedule_name is distinct from p_name;
+    end if;
+
+    return next v_schedule;
+end;
+$$;
+
+revoke all on function public.update_counselor_schedule(uuid, uuid, text, boolean, integer) from public, anon, authenticated;
+grant execute on function public.update_counselor_schedule(uuid, uuid, text, boolean, integer) to service_role;
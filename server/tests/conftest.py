@@ -0,0 +1,55 @@
+"""
+Unit tests for the pure parts of the server
+Config is read from the environment at import, so the settings are pinned
+here before any app module loads; nothing talks to Supabase or Google.
+"""
+import os
+
+os.environ.update({
+    "SUPABASE_URL": "https://project.supabase.test",
+    "SUPABASE_SERVICE_ROLE_KEY": "test-service-role-key",
+    "SUPABASE_JWT_SECRET": "test-jwt-secret-test-jwt-secret-test",
+    # calendar sync stays off, no worker threads
+    "GOOGLE_CLIENT_ID": "",
+    "GOOGLE_CLIENT_SECRET": "",
+    "ENCRYPTION_KEY": "",
+})
+
+
+class FakeQuery:
+    """Records a PostgREST builder chain; execute() answers from the owning FakeSupabase"""
+
+    def __init__(self, client: "FakeSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def execute(self):
+        self.client.executed.append(self)
+        return self.client.respond(self)
+
+
+class FakeResponse:
+    def __init__(self, data=None, count=None):
+        self.data = data
+        self.count = count
+
+
+class FakeSupabase:
+    """
+    Stand-in for the supabase client in unit tests
+    `respond(query)` returns the FakeResponse for an executed query.
+    """
+
+    def __init__(self, respond=None):
+        self.respond = respond or (lambda query: FakeResponse([]))
+        self.executed = []
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
@@ -0,0 +1,161 @@
+"""Access token verification, the claims cache and role checks"""
+import time
+
+import jwt
+import pytest
+from flask import Flask, jsonify
+
+from app.services.role_cache import RoleInfo
+from app.utils import auth
+from app.utils.auth import TokenVerifier, get_current_principal, require_auth, require_role
+from config import Config
+
+USER_ID = "5a1d2c3e-0000-4000-8000-000000000001"
+
+
+def make_token(**overrides) -> str:
+    claims = {
+        "sub": USER_ID,
+        "aud": "authenticated",
+        "iss": f"{Config.SUPABASE_URL}/auth/v1",
+        "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    claims = {key: value for key, value in claims.items() if value is not None}
+    return jwt.encode(claims, Config.SUPABASE_JWT_SECRET, algorithm="HS256")
+
+
+@pytest.fixture
+def verifier():
+    return TokenVerifier()
+
+
+# ---- TokenVerifier --------------------------------------------------------
+
+
+def test_verify_returns_claims(verifier):
+    assert verifier.verify(make_token())["sub"] == USER_ID
+
+
+@pytest.mark.parametrize("token", [
+    make_token(exp=int(time.time()) - 10),
+    make_token(aud="anon"),
+    make_token(iss="https://elsewhere.test/auth/v1"),
+    make_token(sub=None),
+    make_token(exp=None),
+    jwt.encode({"sub": USER_ID, "aud": "authenticated", "exp": int(time.time()) + 60}, "other-secret-other-secret-other-secret", algorithm="HS256"),
+    jwt.encode({"sub": USER_ID, "aud": "authenticated", "exp": int(time.time()) + 60}, None, algorithm="none"),
+    "not.a.token",
+    "",
+])
+def test_verify_rejects_invalid_tokens(verifier, token):
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+
+
+def test_verify_requires_secret_for_hs256(verifier, monkeypatch):
+    token = make_token()
+    monkeypatch.setattr(Config, "SUPABASE_JWT_SECRET", None)
+    with pytest.raises(jwt.InvalidTokenError, match="SUPABASE_JWT_SECRET"):
+        verifier.verify(token)
+
+
+def test_verify_caches_claims_until_expiry(verifier, monkeypatch):
+    decoded = []
+    original = verifier._decode
+    monkeypatch.setattr(verifier, "_decode", lambda token: decoded.append(token) or original(token))
+
+    token = make_token()
+    verifier.verify(token)
+    verifier.verify(token)
+    assert len(decoded) == 1
+
+    verifier.clear()
+    verifier.verify(token)
+    assert len(decoded) == 2
+
+
+def test_verify_redecodes_once_cached_claims_expire(verifier, monkeypatch):
+    decoded = []
+    original = verifier._decode
+    monkeypatch.setattr(verifier, "_decode", lambda token: decoded.append(token) or original(token))
+
+    expires_at = int(time.time()) + 60
+    token = make_token(exp=expires_at)
+    verifier.verify(token)
+    # the cache compares against time.time(); past `exp` the entry is dropped
+    monkeypatch.setattr(auth.time, "time", lambda: expires_at + 1)
+    verifier.verify(token)
+    assert len(decoded) == 2
+
+
+def test_claims_cache_is_bounded(verifier, monkeypatch):
+    monkeypatch.setattr(Config, "AUTH_CLAIMS_CACHE_SIZE", 2)
+    tokens = [make_token(jti=str(i)) for i in range(3)]
+    for token in tokens:
+        verifier.verify(token)
+    assert len(verifier._claims) == 2
+
+
+# ---- require_auth / require_role ------------------------------------------
+
+
+@pytest.fixture
+def client(monkeypatch):
+    roles = {}
+    monkeypatch.setattr(auth, "get_role_info", lambda user_id: roles[user_id])
+    auth.get_token_verifier().clear()
+
+    app = Flask(__name__)
+
+    @app.route("/counselor-only")
+    @require_auth
+    @require_role("counselor")
+    def counselor_only(user_id):
+        return jsonify({"user": user_id, "courses": list(get_current_principal().courses)})
+
+    @app.route("/staff")
+    @require_auth
+    @require_role("counselor", "admin")
+    def staff(user_id):
+        return jsonify({"user": user_id})
+
+    test_client = app.test_client()
+    test_client.roles = roles
+    return test_client
+
+
+def _get(client, path, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return client.get(path, headers=headers)
+
+
+def test_require_auth_rejects_missing_and_invalid_tokens(client):
+    assert _get(client, "/counselor-only").status_code == 401
+    assert _get(client, "/counselor-only", "garbage").status_code == 401
+    assert _get(client, "/counselor-only", make_token(exp=int(time.time()) - 10)).status_code == 401
+
+
+def test_require_role_allows_matching_role(client):
+    client.roles[USER_ID] = RoleInfo("counselor", ("BSIT", "BSCS"))
+    response = _get(client, "/counselor-only", make_token())
+    assert response.status_code == 200
+    assert response.get_json() == {"user": USER_ID, "courses": ["BSIT", "BSCS"]}
+
+
+def test_require_role_accepts_any_listed_role(client):
+    client.roles[USER_ID] = RoleInfo("admin", ())
+    assert _get(client, "/staff", make_token()).status_code == 200
+
+
+@pytest.mark.parametrize("role", ["student", None])
+def test_require_role_forbids_other_roles(client, role):
+    client.roles[USER_ID] = RoleInfo(role, ())
+    response = _get(client, "/counselor-only", make_token())
+    assert response.status_code == 403
+    assert response.get_json()["message"] == "Requires role: counselor"
+
+
+def test_require_role_reports_lookup_failure(client):
+    # no role entry: the lookup raises
+    assert _get(client, "/counselor-only", make_token()).status_code == 500
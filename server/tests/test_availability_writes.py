@@ -0,0 +1,124 @@
+"""Availability PUT body parsing and the diff that turns it into writes"""
+import pytest
+
+from app.services.availability_writes import build_availability_rows, diff_availability
+
+A = "00000000-0000-4000-8000-00000000000a"
+B = "00000000-0000-4000-8000-00000000000b"
+C = "00000000-0000-4000-8000-00000000000c"
+
+
+def weekly(day, start, end, row_id=None):
+    return {"id": row_id, "type": "weekly", "day_of_week": day, "specific_date": None,
+            "start_time": start, "end_time": end}
+
+
+def stored(row_id, day, start, end):
+    return weekly(day, start, end, row_id)
+
+
+# ---- build_availability_rows ----------------------------------------------
+
+
+def test_build_rows_normalizes_times_and_ids():
+    rows = build_availability_rows(
+        [{"dayOfWeek": 1, "startTime": "09:00", "endTime": "17:00:00", "id": A},
+         {"dayOfWeek": 0, "startTime": None, "endTime": ""}],
+        [{"date": "2026-10-19", "startTime": "13:00", "endTime": "17:00", "id": "tmp-1"}],
+    )
+    assert rows == [
+        weekly(1, "09:00:00", "17:00:00", A),
+        weekly(0, None, None),
+        {"id": None, "type": "override", "day_of_week": None, "specific_date": "2026-10-19",
+         "start_time": "13:00:00", "end_time": "17:00:00"},
+    ]
+
+
+def test_build_rows_empty_body():
+    assert build_availability_rows([], []) == []
+
+
+@pytest.mark.parametrize("weekly_rows, overrides, message", [
+    ([{"dayOfWeek": 7}], [], "Invalid day of week"),
+    ([{"dayOfWeek": True}], [], "Invalid day of week"),
+    ([{"dayOfWeek": "1"}], [], "Invalid day of week"),
+    ([{"dayOfWeek": 1, "startTime": "9am"}], [], "Invalid time"),
+    ([], [{"date": "2026-02-30"}], "Invalid date"),
+    ([], [{}], "Invalid date"),
+])
+def test_build_rows_rejects_bad_input(weekly_rows, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        build_availability_rows(weekly_rows, overrides)
+
+
+# ---- diff_availability ----------------------------------------------------
+
+
+def test_diff_of_nothing():
+    assert diff_availability([], []) == ([], [], [])
+
+
+def test_diff_inserts_everything_into_empty_schedule():
+    inserts, updates, deletes = diff_availability([], [weekly(1, "09:00:00", "12:00:00")])
+    assert inserts == [{"type": "weekly", "day_of_week": 1, "specific_date": None,
+                        "start_time": "09:00:00", "end_time": "12:00:00"}]
+    assert (updates, deletes) == ([], [])
+
+
+def test_diff_deletes_everything_when_emptied():
+    assert diff_availability([stored(A, 1, "09:00:00", "12:00:00")], []) == ([], [], [A])
+
+
+def test_diff_unchanged_schedule_writes_nothing():
+    rows = [stored(A, 1, "09:00:00", "12:00:00"), stored(B, 2, "09:00:00", "12:00:00")]
+    # resubmitted without ids (pairs by content) and with ids (pairs by id)
+    assert diff_availability(rows, [dict(r, id=None) for r in rows]) == ([], [], [])
+    assert diff_availability(rows, rows) == ([], [], [])
+
+
+def test_diff_updates_row_sent_back_with_its_id():
+    inserts, updates, deletes = diff_availability(
+        [stored(A, 1, "09:00:00", "12:00:00")],
+        [weekly(1, "10:00:00", "12:00:00", A)],
+    )
+    assert (inserts, deletes) == ([], [])
+    assert updates == [(A, {"start_time": "10:00:00"})]
+
+
+def test_diff_pairs_duplicate_rows_one_to_one():
+    rows = [stored(A, 1, "09:00:00", "12:00:00"), stored(B, 1, "09:00:00", "12:00:00")]
+    # three identical wanted rows: two keep the stored ones, one is inserted
+    wanted = [weekly(1, "09:00:00", "12:00:00")] * 3
+    inserts, updates, deletes = diff_availability(rows, wanted)
+    assert len(inserts) == 1 and updates == [] and deletes == []
+
+    # one wanted row: the first stored duplicate is kept, the other deleted
+    assert diff_availability(rows, wanted[:1]) == ([], [], [B])
+
+
+def test_diff_repeated_id_is_claimed_once():
+    rows = [stored(A, 1, "09:00:00", "12:00:00")]
+    wanted = [weekly(1, "09:00:00", "12:00:00", A), weekly(1, "13:00:00", "17:00:00", A)]
+    inserts, updates, deletes = diff_availability(rows, wanted)
+    assert [row["start_time"] for row in inserts] == ["13:00:00"]
+    assert (updates, deletes) == ([], [])
+
+
+def test_diff_unknown_id_is_treated_as_new_content():
+    rows = [stored(A, 1, "09:00:00", "12:00:00"), stored(B, 2, "09:00:00", "12:00:00")]
+    inserts, updates, deletes = diff_availability(rows, [weekly(1, "09:00:00", "12:00:00", C)])
+    assert (inserts, updates, deletes) == ([], [], [B])
+
+
+def test_diff_id_match_wins_over_content_match():
+    rows = [stored(A, 1, "09:00:00", "12:00:00"), stored(B, 2, "09:00:00", "12:00:00")]
+    # B is rewritten to A's content by id; A is no longer wanted
+    inserts, updates, deletes = diff_availability(rows, [weekly(1, "09:00:00", "12:00:00", B)])
+    assert inserts == []
+    assert updates == [(B, {"day_of_week": 1})]
+    assert deletes == [A]
+
+
+def test_diff_unavailable_day_rows_pair_on_null_times():
+    rows = [stored(A, 0, None, None)]
+    assert diff_availability(rows, [weekly(0, None, None)]) == ([], [], [])
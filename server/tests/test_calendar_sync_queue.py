@@ -0,0 +1,153 @@
+"""Calendar sync outbox: retry backoff, job claiming and recording outcomes"""
+from datetime import datetime
+
+import pytest
+
+from app.services import calendar_sync_queue
+from app.services.calendar_sync_queue import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_PROCESSING,
+    CalendarSyncQueue,
+)
+from conftest import FakeResponse, FakeSupabase
+
+APPOINTMENT_ID = "6b82e6c9-d82f-40f1-8236-74a6864fa3f3"
+RUN_TOKEN = "run-token-1"
+CLAIMED_TOKEN = "run-token-2"
+
+
+@pytest.fixture
+def sync_queue():
+    return CalendarSyncQueue(workers=1, max_attempts=3, retry_base_seconds=30, sweep_seconds=60)
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    client = FakeSupabase()
+    monkeypatch.setattr(calendar_sync_queue, "get_supabase_client", lambda use_service_role=False: client)
+    return client
+
+
+def _job(attempts=0, action="create"):
+    return {"appointment_id": APPOINTMENT_ID, "run_token": CLAIMED_TOKEN, "attempts": attempts, "action": action}
+
+
+def _answer_claim_with(supabase, job):
+    """The claim update returns `job`; the outcome update returns nothing"""
+    supabase.respond = lambda query: FakeResponse([job] if len(supabase.executed) == 1 and job else [])
+
+
+def _call(query, name):
+    return [args for call, args, _ in query.calls if call == name]
+
+
+# ---- retry_delay ----------------------------------------------------------
+
+
+def test_retry_delay_doubles_per_attempt(sync_queue, monkeypatch):
+    monkeypatch.setattr(calendar_sync_queue.random, "uniform", lambda low, high: 0)
+    assert [sync_queue.retry_delay(n) for n in (1, 2, 3, 4)] == [30, 60, 120, 240]
+
+
+def test_retry_delay_jitter_is_at_most_one_base_interval(sync_queue, monkeypatch):
+    monkeypatch.setattr(calendar_sync_queue.random, "uniform", lambda low, high: high)
+    assert sync_queue.retry_delay(1) == 60
+
+    monkeypatch.undo()
+    for attempts in (1, 2, 5):
+        base = 30 * 2 ** (attempts - 1)
+        assert base <= sync_queue.retry_delay(attempts) <= base + 30
+
+
+# ---- _claim ---------------------------------------------------------------
+
+
+def test_claim_only_takes_the_current_unfinished_job(sync_queue, supabase):
+    supabase.respond = lambda query: FakeResponse([_job()])
+    assert sync_queue._claim(APPOINTMENT_ID, RUN_TOKEN) == _job()
+
+    [query] = supabase.executed
+    assert query.table == "calendar_sync_jobs"
+    [(update,)] = _call(query, "update")
+    assert update["status"] == STATUS_PROCESSING
+    # a fresh token, so a stale worker cannot record over this run
+    assert update["run_token"] != RUN_TOKEN
+    assert _call(query, "eq") == [("appointment_id", APPOINTMENT_ID), ("run_token", RUN_TOKEN)]
+    assert _call(query, "in_") == [("status", [STATUS_PENDING, STATUS_PROCESSING])]
+
+
+def test_claim_of_superseded_job_returns_none(sync_queue, supabase):
+    assert sync_queue._claim(APPOINTMENT_ID, RUN_TOKEN) is None
+
+
+# ---- _run_job -------------------------------------------------------------
+
+
+@pytest.fixture
+def sync_result(monkeypatch):
+    """Set `sync_result.errors` (or an exception) for the stubbed calendar sync"""
+    class Result:
+        errors = []
+        calls = []
+
+    def sync(appointment_id, action, final_attempt=False):
+        Result.calls.append((appointment_id, action, final_attempt))
+        if isinstance(Result.errors, Exception):
+            raise Result.errors
+        return Result.errors
+
+    monkeypatch.setattr(calendar_sync_queue, "sync_appointment_calendar", sync)
+    return Result
+
+
+def _outcome(supabase):
+    claim, outcome = supabase.executed
+    # recorded against the token this run claimed, never the one it was queued with
+    assert _call(outcome, "eq") == [("appointment_id", APPOINTMENT_ID), ("run_token", CLAIMED_TOKEN)]
+    [(update,)] = _call(outcome, "update")
+    return update
+
+
+def test_run_job_marks_success_done(sync_queue, supabase, sync_result):
+    _answer_claim_with(supabase, _job(attempts=0, action="confirmed"))
+    sync_queue._run_job(APPOINTMENT_ID, RUN_TOKEN)
+
+    assert sync_result.calls == [(APPOINTMENT_ID, "confirmed", False)]
+    update = _outcome(supabase)
+    assert (update["status"], update["attempts"], update["last_error"]) == (STATUS_DONE, 1, None)
+
+
+def test_run_job_schedules_retry_with_backoff(sync_queue, supabase, sync_result, monkeypatch):
+    monkeypatch.setattr(calendar_sync_queue.random, "uniform", lambda low, high: 0)
+    sync_result.errors = ["student event: 503"]
+    _answer_claim_with(supabase, _job(attempts=1))
+
+    before = datetime.now(calendar_sync_queue.timezone.utc)
+    sync_queue._run_job(APPOINTMENT_ID, RUN_TOKEN)
+
+    update = _outcome(supabase)
+    assert (update["status"], update["attempts"], update["last_error"]) == (STATUS_PENDING, 2, "student event: 503")
+    wait = (datetime.fromisoformat(update["next_attempt_at"]) - before).total_seconds()
+    assert 60 <= wait < 65
+
+
+def test_run_job_gives_up_on_final_attempt(sync_queue, supabase, sync_result):
+    sync_result.errors = RuntimeError("token revoked")
+    _answer_claim_with(supabase, _job(attempts=2))
+    sync_queue._run_job(APPOINTMENT_ID, RUN_TOKEN)
+
+    assert sync_result.calls == [(APPOINTMENT_ID, "create", True)]
+    update = _outcome(supabase)
+    assert update["status"] == STATUS_FAILED
+    assert update["last_error"] == "RuntimeError: token revoked"
+    assert "next_attempt_at" not in update
+
+
+def test_run_job_skips_job_it_could_not_claim(sync_queue, supabase, sync_result):
+    _answer_claim_with(supabase, None)
+    sync_queue._run_job(APPOINTMENT_ID, RUN_TOKEN)
+
+    assert sync_result.calls == []
+    assert len(supabase.executed) == 1
@@ -0,0 +1,158 @@
+"""Keyset cursors of the appointment list, the counselor roster and student notes"""
+import base64
+import json
+
+import pytest
+
+from app.routes.appointments import decode_appointment_cursor, encode_appointment_cursor
+from app.services.student_notes import (
+    _page,
+    decode_note_cursor,
+    encode_note_cursor,
+    note_keyset_filter,
+)
+from app.services.student_roster import (
+    StudentRoster,
+    _format_row,
+    decode_roster_cursor,
+    encode_roster_cursor,
+    page_roster,
+)
+
+APPOINTMENT_ID = "6b82e6c9-d82f-40f1-8236-74a6864fa3f3"
+NOTE_ID = "0f8fad5b-d9cb-469f-a165-70867728950e"
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+MALFORMED = ["", "not-base64!!", "bm90IGpzb24", _raw_cursor({"a": 1}), _raw_cursor([1, 2, 3, 4])]
+
+
+# ---- appointments ---------------------------------------------------------
+
+
+def test_appointment_cursor_round_trips():
+    cursor = encode_appointment_cursor("2026-10-17", "09:30:00", APPOINTMENT_ID)
+    assert "=" not in cursor
+    assert decode_appointment_cursor(cursor) == ("2026-10-17", "09:30:00", APPOINTMENT_ID)
+
+
+def test_appointment_cursor_accepts_midnight_start():
+    cursor = encode_appointment_cursor("2026-12-31", "00:00", APPOINTMENT_ID)
+    assert decode_appointment_cursor(cursor) == ("2026-12-31", "00:00", APPOINTMENT_ID)
+
+
+@pytest.mark.parametrize("cursor", MALFORMED + [
+    _raw_cursor(["2026-02-30", "09:00:00", APPOINTMENT_ID]),
+    _raw_cursor(["2026-10-17", "25:00:00", APPOINTMENT_ID]),
+    _raw_cursor(["2026-10-17", "09:00:00", "not-a-uuid"]),
+    # anything that could break out of the or() filter string
+    _raw_cursor(["2026-10-17", "09:00:00", f'{APPOINTMENT_ID}"),id.gt.("']),
+])
+def test_appointment_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_appointment_cursor(cursor)
+
+
+# ---- roster ---------------------------------------------------------------
+
+
+def test_roster_cursor_round_trips():
+    cursor = encode_roster_cursor(("dela cruz", "juan"), 42)
+    assert decode_roster_cursor(cursor) == (("dela cruz", "juan"), 42)
+
+
+def test_roster_cursor_keeps_empty_sort_key():
+    assert decode_roster_cursor(encode_roster_cursor((), "id-1")) == ((), "id-1")
+
+
+@pytest.mark.parametrize("cursor", MALFORMED + [
+    _raw_cursor(["dela cruz", 42]),
+    _raw_cursor([["dela cruz", 3], 42]),
+])
+def test_roster_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_roster_cursor(cursor)
+
+
+def _roster(names):
+    rows = [
+        _format_row({
+            "id": list_id,
+            "student_id": f"auth-{list_id}",
+            "year_level": "1",
+            "students": {"id": f"s-{list_id}", "id_number": f"2024-{list_id:04d}",
+                         "given_name": given, "family_name": family, "course": "BSIT"},
+        })
+        for list_id, (given, family) in enumerate(names, start=1)
+    ]
+    return StudentRoster("counselor", ("BSIT",), rows)
+
+
+def _walk(roster, **kwargs):
+    seen, cursor = [], None
+    while True:
+        page, cursor = page_roster(roster, cursor=cursor, limit=2, **kwargs)
+        seen.extend(row["idNumber"] for row in page)
+        if cursor is None:
+            return seen
+
+
+def test_roster_pages_through_duplicate_names_once():
+    # identical sort keys are ordered by list ID, so pages never skip or repeat
+    roster = _roster([("Ana", "Reyes")] * 5 + [("Ben", "Abad")])
+    forward = _walk(roster)
+    assert forward == ["2024-0006", "2024-0001", "2024-0002", "2024-0003", "2024-0004", "2024-0005"]
+    assert _walk(roster, descending=True) == forward[::-1]
+
+
+def test_roster_pages_empty_roster():
+    assert page_roster(_roster([]), limit=2) == ([], None)
+
+
+def test_roster_cursor_of_another_id_type_is_rejected():
+    cursor = encode_roster_cursor(("reyes", "ana"), "not-an-int")
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        page_roster(_roster([("Ana", "Reyes"), ("Ana", "Reyes")]), cursor=cursor)
+
+
+# ---- notes ----------------------------------------------------------------
+
+
+def test_note_cursor_round_trips():
+    created_at = "2026-10-17T08:15:00.123456+00:00"
+    assert decode_note_cursor(encode_note_cursor(created_at, NOTE_ID)) == (created_at, NOTE_ID)
+
+
+def test_note_cursor_accepts_zulu_timestamps():
+    created_at = "2026-10-17T00:00:00Z"
+    assert decode_note_cursor(encode_note_cursor(created_at, NOTE_ID)) == (created_at, NOTE_ID)
+
+
+@pytest.mark.parametrize("cursor", MALFORMED + [
+    _raw_cursor(["yesterday", NOTE_ID]),
+    _raw_cursor(["2026-10-17T08:15:00+00:00", "42"]),
+])
+def test_note_cursor_rejects_malformed(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_note_cursor(cursor)
+
+
+def test_note_keyset_filter_quotes_values():
+    assert note_keyset_filter("2026-10-17T08:15:00+00:00", NOTE_ID) == (
+        'created_at.lt."2026-10-17T08:15:00+00:00",'
+        f'and(created_at.eq."2026-10-17T08:15:00+00:00",id.lt."{NOTE_ID}")'
+    )
+
+
+def test_page_hands_out_cursor_only_when_rows_remain():
+    rows = [{"id": NOTE_ID, "created_at": f"2026-10-{day:02d}T00:00:00+00:00"} for day in (3, 2, 1)]
+
+    page, cursor = _page(rows, 2)
+    assert page == rows[:2]
+    assert decode_note_cursor(cursor) == (rows[1]["created_at"], NOTE_ID)
+
+    assert _page(rows, 3) == (rows, None)
+    assert _page([], 20) == ([], None)
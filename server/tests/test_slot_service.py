@@ -0,0 +1,204 @@
+"""Slot engine: interval merging, single-day slots and date ranges"""
+import os
+import time
+from datetime import date, datetime
+
+import pytest
+
+from app.services.slot_service import (
+    compute_free_slots,
+    compute_range_slots,
+    format_minutes,
+    merge_intervals,
+    rows_to_windows,
+)
+
+EVENT_TYPE_ID = "event-type"
+
+
+def _starts(slots):
+    return [slot["startTime"] for slot in slots]
+
+
+# ---- merge_intervals ------------------------------------------------------
+
+
+def test_merge_intervals_empty():
+    assert merge_intervals([]) == []
+
+
+def test_merge_intervals_sorts_and_merges_overlaps():
+    assert merge_intervals([(600, 660), (540, 570), (560, 600), (700, 720)]) == [(540, 660), (700, 720)]
+
+
+def test_merge_intervals_joins_touching_and_duplicate_intervals():
+    assert merge_intervals([(540, 600), (600, 660), (540, 600)]) == [(540, 660)]
+
+
+def test_merge_intervals_keeps_contained_interval_inside():
+    assert merge_intervals([(540, 720), (600, 630)]) == [(540, 720)]
+
+
+# ---- compute_free_slots ---------------------------------------------------
+
+
+def test_free_slots_without_windows_or_bookings():
+    assert compute_free_slots([], [], 30) == []
+    assert _starts(compute_free_slots([(540, 660)], [], 60)) == ["09:00", "09:30", "10:00"]
+
+
+def test_free_slots_skip_overlapping_bookings_and_buffers():
+    slots = compute_free_slots([(540, 720)], [(600, 660)], 30, buffer_before=0, buffer_after=30)
+    # 09:30 would end at 10:00 but its 30 minute buffer runs into the booking
+    assert _starts(slots) == ["09:00", "11:00", "11:30"]
+
+
+def test_free_slots_with_duplicate_bookings():
+    once = compute_free_slots([(540, 720)], [(600, 660)], 30)
+    assert compute_free_slots([(540, 720)], [(600, 660), (600, 660)], 30) == once
+
+
+def test_free_slots_drop_starts_at_or_before_cutoff():
+    assert _starts(compute_free_slots([(540, 660)], [], 30, not_after_minute=570)) == ["10:00", "10:30"]
+
+
+def test_free_slots_up_to_midnight():
+    slots = compute_free_slots([(1380, 1440)], [], 30)
+    assert [(s["startTime"], s["endTime"]) for s in slots] == [("23:00", "23:30"), ("23:30", "24:00")]
+    assert slots[-1]["displayTime"] == "11:30 PM"
+
+
+def test_free_slots_from_midnight():
+    slots = compute_free_slots([(0, 60)], [], 60)
+    assert slots == [{"startTime": "00:00", "endTime": "01:00", "displayTime": "12:00 AM"}]
+
+
+def test_format_minutes_bounds():
+    assert format_minutes(0) == "00:00"
+    assert format_minutes(1440) == "24:00"
+    with pytest.raises(ValueError):
+        format_minutes(1441)
+
+
+def test_rows_to_windows_skips_unavailable_rows():
+    rows = [
+        {"start_time": "09:00:00", "end_time": "12:00:00"},
+        {"start_time": None, "end_time": None},
+        {"start_time": "13:00", "end_time": "24:00:00"},
+    ]
+    assert rows_to_windows(rows) == [(540, 720), (780, 1440)]
+
+
+# ---- compute_range_slots --------------------------------------------------
+
+
+def _range(start, end, now, weekly=None, overrides=None, bookings=(), booking_buffer_hours=0, max_per_day=None):
+    return compute_range_slots(
+        start, end,
+        weekly_windows=weekly if weekly is not None else {day: [(540, 600)] for day in range(7)},
+        override_windows=overrides or {},
+        bookings=list(bookings),
+        event_type_id=EVENT_TYPE_ID,
+        duration=30,
+        buffer_before=0,
+        buffer_after=0,
+        max_per_day=max_per_day,
+        booking_buffer_hours=booking_buffer_hours,
+        now=now,
+    )
+
+
+def test_range_returns_one_entry_per_day_even_when_empty():
+    days = _range(date(2026, 10, 19), date(2026, 10, 21), datetime(2026, 10, 1), weekly={})
+    assert [d["date"] for d in days] == ["2026-10-19", "2026-10-20", "2026-10-21"]
+    assert all(d["availableSlots"] == [] and d["message"] for d in days)
+
+
+def test_range_with_end_before_start_is_empty():
+    assert _range(date(2026, 10, 21), date(2026, 10, 19), datetime(2026, 10, 1)) == []
+
+
+def test_range_override_replaces_weekly_and_empty_override_closes_day():
+    days = _range(
+        date(2026, 10, 19), date(2026, 10, 20), datetime(2026, 10, 1),
+        overrides={"2026-10-19": [(780, 840)], "2026-10-20": []},
+    )
+    assert _starts(days[0]["availableSlots"]) == ["13:00", "13:30"]
+    assert days[1]["availableSlots"] == []
+    assert days[1]["message"] == "Counselor is not available on this date"
+
+
+def test_range_weekly_windows_use_sunday_zero():
+    # 2026-10-18 is a Sunday
+    days = _range(date(2026, 10, 18), date(2026, 10, 19), datetime(2026, 10, 1), weekly={0: [(540, 570)]})
+    assert _starts(days[0]["availableSlots"]) == ["09:00"]
+    assert days[1]["availableSlots"] == []
+
+
+def test_range_bookings_and_daily_limit():
+    bookings = [
+        {"scheduled_date": "2026-10-19", "start_time": "09:00:00", "end_time": "09:30:00", "event_type_id": EVENT_TYPE_ID},
+        {"scheduled_date": "2026-10-20", "start_time": "09:30:00", "end_time": "10:00:00", "event_type_id": "other"},
+    ]
+    days = _range(date(2026, 10, 19), date(2026, 10, 20), datetime(2026, 10, 1), bookings=bookings, max_per_day=1)
+    assert days[0]["availableSlots"] == []
+    assert days[0]["message"] == "Maximum bookings reached for this event type today"
+    assert _starts(days[1]["availableSlots"]) == ["09:00"]
+
+
+def test_range_booking_buffer_crossing_midnight():
+    # 22:15 + 12h notice -> nothing before 10:15 the next day
+    days = _range(
+        date(2026, 10, 18), date(2026, 10, 20), datetime(2026, 10, 18, 22, 15),
+        weekly={day: [(540, 720)] for day in range(7)}, booking_buffer_hours=12,
+    )
+    assert days[0]["availableSlots"] == []
+    assert "12 hours" in days[0]["message"]
+    assert _starts(days[1]["availableSlots"]) == ["10:30", "11:00", "11:30"]
+    assert len(days[2]["availableSlots"]) == 6
+
+
+def test_range_cutoff_exactly_at_midnight_keeps_whole_next_day():
+    days = _range(
+        date(2026, 10, 18), date(2026, 10, 19), datetime(2026, 10, 18, 0, 0),
+        weekly={day: [(0, 60)] for day in range(7)}, booking_buffer_hours=24,
+    )
+    assert days[0]["availableSlots"] == []
+    # the cutoff minute itself is excluded, 00:30 onwards stays bookable
+    assert _starts(days[1]["availableSlots"]) == ["00:30"]
+
+
+@pytest.fixture
+def new_york_time():
+    """Run in a zone with DST transitions; slots are wall-clock and must not shift"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available on this platform")
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = "America/New_York"
+    time.tzset()
+    yield
+    if previous is None:
+        os.environ.pop("TZ", None)
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+
+@pytest.mark.parametrize("start, end", [
+    (date(2026, 3, 7), date(2026, 3, 9)),    # clocks go forward on 2026-03-08
+    (date(2026, 10, 31), date(2026, 11, 2)),  # and back on 2026-11-01
+])
+def test_range_across_dst_transition(new_york_time, start, end):
+    days = _range(start, end, datetime(2026, 1, 1), weekly={day: [(60, 240)] for day in range(7)})
+    assert len(days) == 3
+    # the 02:00-03:00 wall-clock hour is still offered on the transition day
+    assert all(_starts(d["availableSlots"]) == ["01:00", "01:30", "02:00", "02:30", "03:00", "03:30"] for d in days)
+
+
+def test_range_booking_buffer_across_dst_is_wall_clock(new_york_time):
+    # 24h notice from 10:00 the day before clocks go forward is 10:00 on the day
+    days = _range(
+        date(2026, 3, 7), date(2026, 3, 8), datetime(2026, 3, 7, 10, 0),
+        weekly={day: [(540, 660)] for day in range(7)}, booking_buffer_hours=24,
+    )
+    assert _starts(days[1]["availableSlots"]) == ["10:30"]